@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+import time
+import atexit
+import threading
+from collections import deque
+
+import backend
+import config
+
+
+class ActionLogger:
+    # 사용자 행동 로그를 메모리 큐에 쌓아두고 백그라운드 스레드에서 묶어서 적재
+
+    def __init__(self, batch_size=50, flush_interval=5.0, coalesce_seconds=600, max_queue=1000, overflow='drop_oldest'):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.coalesce_seconds = coalesce_seconds
+        self.max_queue = max_queue
+        self.overflow = overflow  # 'drop_oldest' 또는 'drop_newest'
+
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._last_seen = {}  # (dataset_id, table_id, username, action) -> 마지막 적재 요청 시각
+        self._stopped = False
+        self._worker = None
+
+        self.stats = {
+            'enqueued': 0,
+            'coalesced': 0,
+            'dropped': 0,
+            'flushed': 0,
+            'failed': 0,
+        }
+
+    def start(self):
+        with self._condition:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='action-logger', daemon=True)
+                self._worker.start()
+
+    def log(self, username, action, dataset_id, table_id, timestamp, coalesce=False):
+        # UI 스레드는 큐에 넣기만 하고 바로 반환
+        now = time.monotonic()
+        key = (dataset_id, table_id, username, action)
+
+        with self._condition:
+            if coalesce:
+                last_seen = self._last_seen.get(key)
+                if last_seen is not None and now - last_seen < self.coalesce_seconds:
+                    self.stats['coalesced'] += 1
+                    return False
+                self._last_seen[key] = now
+
+            if len(self._queue) >= self.max_queue:
+                self.stats['dropped'] += 1
+                if self.overflow == 'drop_newest':
+                    return False
+                self._queue.popleft()
+
+            self._queue.append((dataset_id, table_id, {
+                "username": username,
+                "timestamp": timestamp,
+                "action": action
+            }))
+            self.stats['enqueued'] += 1
+
+            if len(self._queue) >= self.batch_size:
+                self._condition.notify()
+
+        return True
+
+    def _take_batch(self):
+        batch = []
+        while self._queue and len(batch) < self.batch_size:
+            batch.append(self._queue.popleft())
+        return batch
+
+    def _write(self, batch):
+        # 같은 테이블로 가는 행끼리 모아서 한 번에 적재
+        rows_by_table = {}
+        for dataset_id, table_id, row in batch:
+            rows_by_table.setdefault((dataset_id, table_id), []).append(row)
+
+        for (dataset_id, table_id), rows in rows_by_table.items():
+            try:
+                errors = backend.get_backend().insert_rows(dataset_id, table_id, rows)
+            except Exception as e:
+                errors = [str(e)]
+
+            with self._condition:
+                if errors == []:
+                    self.stats['flushed'] += len(rows)
+                else:
+                    self.stats['failed'] += len(rows)
+
+            if errors != []:
+                print("Encountered errors while inserting rows: {}".format(errors))
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._stopped and len(self._queue) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+
+                batch = self._take_batch()
+                stopped = self._stopped and not self._queue
+
+                # 오래된 중복 제거 기록 정리
+                if self._last_seen:
+                    now = time.monotonic()
+                    self._last_seen = {key: seen for key, seen in self._last_seen.items() if now - seen < self.coalesce_seconds}
+
+            if batch:
+                self._write(batch)
+
+            if stopped:
+                return
+
+    def flush(self):
+        # 큐에 남은 로그를 호출한 스레드에서 즉시 적재
+        while True:
+            with self._condition:
+                batch = self._take_batch()
+            if not batch:
+                return
+            self._write(batch)
+
+    def shutdown(self, timeout=10.0):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+        self.flush()
+
+    def snapshot(self):
+        with self._condition:
+            stats = dict(self.stats)
+            stats['queued'] = len(self._queue)
+
+        return stats
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def get_logger():
+    global _logger
+
+    with _logger_lock:
+        if _logger is None:
+            _logger = ActionLogger(
+                batch_size=config.get_setting('action_log', 'batch_size', 50),
+                flush_interval=config.get_setting('action_log', 'flush_interval', 5.0),
+                coalesce_seconds=config.get_setting('action_log', 'coalesce_seconds', 600),
+                max_queue=config.get_setting('action_log', 'max_queue', 1000),
+                overflow=config.get_setting('action_log', 'overflow', 'drop_oldest'),
+            )
+            _logger.start()
+
+            # 프로세스 종료 시 남은 로그 적재
+            atexit.register(_logger.shutdown)
+
+    return _logger
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import json
+from datetime import datetime
+
+import streamlit as st
+
+import config
+import utils
+import profiler
+import schema
+import warmup
+import loader_stats
+import client_pool
+import action_logger
+import derived_index
+
+
+def is_admin(username):
+    return username in config.get_setting('admin', 'users', [])
+
+
+@profiler.profiled()
+def admin_app():
+    st.header("로더 캐시 현황")
+    st.markdown("---")
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        if st.button("새로 고침", key='admin_refresh'):
+            st.rerun()
+
+    dump = {
+        'generated_at': datetime.now().isoformat(),
+        'loaders': loader_stats.snapshot(),
+        'g2b_sync': utils.g2b_sync.snapshot(),
+        'warmup': warmup.get_warmer().snapshot(),
+        'bigquery_clients': client_pool.get_stats(),
+        'action_log': action_logger.get_logger().snapshot(),
+        'memory': schema.memory_report(),
+        'derived_indexes': derived_index.snapshot(),
+    }
+
+    with col2:
+        st.download_button("JSON 내려받기",
+                           data=json.dumps(dump, ensure_ascii=False, indent=2, default=str),
+                           file_name=f"loader_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                           mime='application/json')
+
+    # 로더별 적중/미스, 단계별 시간(query/download/normalize), 행 수와 크기, 마지막 갱신 시각
+    loaders = loader_stats.to_frame()
+    if loaders.empty:
+        st.write("아직 호출된 로더가 없습니다.")
+    else:
+        st.dataframe(loaders, hide_index=True)
+
+    st.markdown("---")
+
+    for title, key in [("g2b 증분 동기화", 'g2b_sync'), ("캐시 예열", 'warmup'), ("BigQuery 클라이언트", 'bigquery_clients'),
+                       ("행동 로그", 'action_log'), ("메모리 절약", 'memory'), ("검색/패싯 색인", 'derived_indexes')]:
+        with st.expander(title):
+            st.json(json.loads(json.dumps(dump[key], default=str)))
+
+    st.markdown("---")
+    st.subheader("느린 rerun")
+
+    # 최근 rerun의 구간별 실행 시간 분포 (app.main -> 페이지 -> 로더/구간)
+    sections = profiler.section_stats()
+    if sections.empty:
+        st.write("아직 기록된 rerun이 없습니다.")
+        return
+
+    pages = sorted(page for page in sections['page'].dropna().unique())
+    page = st.selectbox("페이지", ["전체"] + pages, key='admin_profile_page')
+    if page != "전체":
+        sections = sections[sections['page'] == page]
+
+    st.dataframe(sections, hide_index=True)
+
+    threshold = config.get_setting('profiler', 'slow_seconds', 2.0)
+    for record in profiler.slow_reruns(threshold):
+        if page != "전체" and record.get('page') != page:
+            continue
+        started = datetime.fromtimestamp(record['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+        with st.expander(f"{started} {record.get('page')} {record.get('user')} - {record['total_seconds']:.2f}초"):
+            st.dataframe(record['spans'], hide_index=True)
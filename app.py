@@ -3,6 +3,9 @@ import streamlit as st
 from streamlit_option_menu import option_menu
 
 import utils
+import auth
+import profiler
+import warmup
 import home_app
 import list_up_app
 import budget_app
@@ -11,39 +14,28 @@ import info21C_app
 import g2b_app
 import news_app
 import stat_app
+import admin_app
 
 import time
 import warnings
 warnings.filterwarnings("ignore")
 
-def load_users_data():
-    users_data = utils.load_users_data()
-    return users_data
-
-
 def login(username, password):
-    users_data = load_users_data()
-    users = {row['employeeName']: {'jobTitle': row['jobTitle'], 'password': row['password']} for _, row in users_data.iterrows()}
-
-    if username in users:
-        stored_password_plain = users[username]['password']
-        if password == stored_password_plain:
-            st.session_state['logged_in'] = True
-            st.session_state['username'] = username
-            st.session_state['jobTitle'] = users[username]['jobTitle']
-
-            utils.log_user_action(username, "login", "SERVICE_DATA", "logs")
-            return True
+    if auth.login(username, password):
+        utils.log_user_action(username, "login", "SERVICE_DATA", "logs")
+
+        # 로그인 후 이동할 화면의 데이터를 백그라운드에서 미리 불러옴
+        warmup.warm_up('login')
+        return True
     return False
 
 
 def logout():
     utils.log_user_action(st.session_state['username'], "logout", "SERVICE_DATA", "logs")
-    st.session_state['logged_in'] = False
-    st.session_state['username'] = None
-    st.session_state['jobTitle'] = None
+    auth.logout()
 
 
+@profiler.rerun()
 def main():
 
     st.set_page_config(page_title="Mido_Plus",
@@ -52,6 +44,8 @@ def main():
                        initial_sidebar_state="auto",
                        menu_items=None)
 
+    warmup.warm_up_on_startup()
+
     st.markdown("""
         <style>
         .username-jobTitle {
@@ -62,11 +56,9 @@ def main():
         """, unsafe_allow_html=True)
 
     if 'logged_in' not in st.session_state:
-        st.session_state['logged_in'] = False
-        st.session_state['username'] = None
-        st.session_state['jobTitle'] = None
+        auth.logout()
 
-    if st.session_state['logged_in']:
+    if auth.check_session():
         with st.sidebar:
 
             col1, col2 = st.columns([1, 1])
@@ -96,8 +88,16 @@ def main():
                 "nav-link-selected": {"background-color": "#02ab21", "color": "#fff"},
             }
 
-            selected = option_menu("Mido Plus", ["납품 현황", "사업 현황", "지자체 예산서", "교육청 예산서", "인포21C", "종합쇼핑몰 납품상세 내역", "뉴스", "STAT"],
-                                   icons=["graph-up-arrow", "list-check", "building", "building", "info-square", "cart4", "pencil-square", "clipboard-data"],
+            menu = ["납품 현황", "사업 현황", "지자체 예산서", "교육청 예산서", "인포21C", "종합쇼핑몰 납품상세 내역", "뉴스", "STAT"]
+            icons = ["graph-up-arrow", "list-check", "building", "building", "info-square", "cart4", "pencil-square", "clipboard-data"]
+
+            # 관리자에게만 로더 캐시 현황 메뉴 표시
+            if admin_app.is_admin(st.session_state['username']):
+                menu.append("관리자")
+                icons.append("speedometer2")
+
+            selected = option_menu("Mido Plus", menu,
+                                   icons=icons,
                                    menu_icon="cast",
                                    default_index=0,
                                    orientation="vertical",
@@ -105,32 +105,37 @@ def main():
                                    styles=styles,
                                    )
 
+        profiler.tag(user=st.session_state['username'], page=selected)
+
         if selected == "납품 현황":
-            utils.log_user_action(st.session_state['username'], "viewed HOME", "SERVICE_DATA", "logs")
+            utils.log_user_action(st.session_state['username'], "viewed HOME", "SERVICE_DATA", "logs", coalesce=True)
             home_app.home_app()
         elif selected == "사업 현황":
-            utils.log_user_action(st.session_state['username'], "viewed list", "SERVICE_DATA", "logs")
+            utils.log_user_action(st.session_state['username'], "viewed list", "SERVICE_DATA", "logs", coalesce=True)
             list_up_app.list_up_app()
         elif selected == "지자체 예산서":
-            utils.log_user_action(st.session_state['username'], "viewed 지자체 예산서", "SERVICE_DATA", "logs")
+            utils.log_user_action(st.session_state['username'], "viewed 지자체 예산서", "SERVICE_DATA", "logs", coalesce=True)
             budget_app.budget_app()
         elif selected == "교육청 예산서":
-            utils.log_user_action(st.session_state['username'], "viewed 교육청 예산서", "SERVICE_DATA", "logs")
+            utils.log_user_action(st.session_state['username'], "viewed 교육청 예산서", "SERVICE_DATA", "logs", coalesce=True)
             edu_budget_app.edu_budget_app()
         elif selected == "인포21C":
-            utils.log_user_action(st.session_state['username'], "viewed 인포21C", "SERVICE_DATA", "logs")
+            utils.log_user_action(st.session_state['username'], "viewed 인포21C", "SERVICE_DATA", "logs", coalesce=True)
             info21C_app.info21C_app()
         elif selected == "종합쇼핑몰 납품상세 내역":
-            utils.log_user_action(st.session_state['username'], "viewed 종합쇼핑몰 납품상세 내역", "SERVICE_DATA", "logs")
+            utils.log_user_action(st.session_state['username'], "viewed 종합쇼핑몰 납품상세 내역", "SERVICE_DATA", "logs", coalesce=True)
             g2b_app.g2b_app()
         elif selected == "뉴스":
-            utils.log_user_action(st.session_state['username'], "viewed 뉴스", "SERVICE_DATA", "logs")
+            utils.log_user_action(st.session_state['username'], "viewed 뉴스", "SERVICE_DATA", "logs", coalesce=True)
             news_app.news_app()
         elif selected == "STAT":
-            utils.log_user_action(st.session_state['username'], "viewed STAT", "SERVICE_DATA", "logs")
+            utils.log_user_action(st.session_state['username'], "viewed STAT", "SERVICE_DATA", "logs", coalesce=True)
             stat_app.stat_app()
+        elif selected == "관리자" and admin_app.is_admin(st.session_state['username']):
+            admin_app.admin_app()
 
     else:
+        profiler.tag(page="로그인")
         st.write("계속하시려면 로그인하세요.")
         with st.form(key='login_form'):
             username = st.text_input("이름")
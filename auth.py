@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+import hmac
+import time
+import hashlib
+import secrets
+import functools
+import argparse
+import itertools
+
+import streamlit as st
+
+import config
+import backend
+import swr_cache
+import loader_stats
+import utils
+
+# 비밀번호는 'pbkdf2_sha256$<반복 횟수>$<salt>$<hash>' 형식으로 저장
+HASH_ALGORITHM = 'pbkdf2_sha256'
+
+_versions = itertools.count(1)
+
+
+def hash_password(password, salt=None, iterations=None):
+    if iterations is None:
+        iterations = config.get_setting('auth', 'iterations', 200000)
+    if salt is None:
+        salt = secrets.token_hex(16)
+
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), iterations).hex()
+
+    return f"{HASH_ALGORITHM}${iterations}${salt}${digest}"
+
+
+def is_hashed(value):
+    return isinstance(value, str) and value.startswith(f"{HASH_ALGORITHM}$")
+
+
+def verify_password(password, stored):
+    try:
+        _, iterations, salt, digest = stored.split('$')
+        expected = hash_password(password, salt, int(iterations)).rsplit('$', 1)[1]
+    except (AttributeError, ValueError):
+        return False
+
+    return hmac.compare_digest(expected, digest)
+
+
+def check_password(password, stored):
+    # 해시로 저장된 비밀번호는 PBKDF2로, 아직 마이그레이션하지 않은 평문은 상수 시간 비교로 확인
+    if is_hashed(stored):
+        return verify_password(password, stored)
+
+    return hmac.compare_digest(str(password).encode('utf-8'), str(stored).encode('utf-8'))
+
+
+class UserDirectory:
+    # 이름 -> 사용자 정보 딕셔너리 (버전마다 새로 만들고 통째로 교체하므로 만든 뒤에는 변경하지 않음)
+
+    def __init__(self, users):
+        self.version = next(_versions)
+        self.loaded_at = time.time()
+
+        # 평문 비밀번호는 불러올 때 해시로 바꾸지 않음 (사용자마다 PBKDF2를 계산하면 디렉터리를 만들 때마다 수 초가 걸림)
+        # 로그인할 때 평문끼리 상수 시간으로 비교하고, 해시로 바꾸는 것은 `python auth.py --migrate`에서만 함
+        passwords = ['' if password is None else str(password) for password in users['password'].tolist()]
+
+        legacy = sum(not is_hashed(password) for password in passwords)
+        if legacy:
+            print(f"{legacy} users still have plaintext passwords; run `python auth.py --migrate`")
+
+        # 같은 이름이 여러 번 나오면 사번 순서상 마지막 행을 사용
+        self._users = {
+            name: {'jobTitle': job_title, 'password': password}
+            for name, job_title, password in zip(users['employeeName'].tolist(), users['jobTitle'].tolist(), passwords)
+        }
+
+    def __len__(self):
+        return len(self._users)
+
+    def get(self, username):
+        return self._users.get(username)
+
+    def authenticate(self, username, password):
+        user = self._users.get(username)
+        # 없는 이름으로 로그인해도 응답 시간이 같도록 비교용 해시로 확인
+        stored = user['password'] if user is not None else _dummy_hash()
+
+        if check_password(password, stored) and user is not None:
+            return user
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _dummy_hash():
+    return hash_password(secrets.token_hex(8))
+
+
+@loader_stats.observe
+@swr_cache.stale_while_revalidate(ttl=config.get_setting('auth', 'refresh_seconds', 300))
+@loader_stats.measure
+def load_user_directory():
+    # 새로 등록한 직원도 재시작 없이 로그인할 수 있도록 주기적으로 백그라운드에서 다시 만듦
+    users = utils.get_dataframe_from_bigquery('SERVICE_DATA', 'users', columns=['employeeNumber', 'employeeName', 'jobTitle', 'password'])
+    users = users.sort_values(by='employeeNumber').reset_index(drop=True)
+
+    return UserDirectory(users)
+
+
+def login(username, password):
+    user = load_user_directory().authenticate(username, password)
+    if user is None:
+        return False
+
+    st.session_state['logged_in'] = True
+    st.session_state['username'] = username
+    st.session_state['jobTitle'] = user['jobTitle']
+    st.session_state['auth_version'] = load_user_directory().version
+
+    return True
+
+
+def logout():
+    st.session_state['logged_in'] = False
+    st.session_state['username'] = None
+    st.session_state['jobTitle'] = None
+    st.session_state['auth_version'] = None
+
+
+def check_session():
+    # rerun마다 호출: 로그인 이후 사용자 목록이 바뀐 경우에만 메모리의 디렉터리에서 다시 확인 (BigQuery 조회 없음)
+    if not st.session_state.get('logged_in'):
+        return False
+
+    directory = load_user_directory()
+    if st.session_state.get('auth_version') == directory.version:
+        return True
+
+    user = directory.get(st.session_state['username'])
+    if user is None:
+        # 퇴사 등으로 사용자 목록에서 빠진 경우
+        logout()
+        return False
+
+    st.session_state['jobTitle'] = user['jobTitle']
+    st.session_state['auth_version'] = directory.version
+
+    return True
+
+
+def migrate_passwords(dataset_id='SERVICE_DATA', table_id='users'):
+    # 평문 비밀번호를 해시로 바꿔서 사용자 테이블을 다시 저장
+    source = backend.get_backend()
+    users = source.read_table(dataset_id, table_id)
+
+    plaintext = ~users['password'].map(is_hashed)
+    users.loc[plaintext, 'password'] = users.loc[plaintext, 'password'].map(
+        lambda password: hash_password('' if password is None else str(password)))
+
+    if plaintext.any():
+        source.write_table(users, dataset_id, table_id)
+
+    print(f"Hashed {int(plaintext.sum())} of {len(users)} passwords in {dataset_id}.{table_id}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="사용자 비밀번호 관리")
+    parser.add_argument('--migrate', action='store_true', help="사용자 테이블의 평문 비밀번호를 해시로 변환")
+    parser.add_argument('--hash', help="입력한 비밀번호의 해시를 출력")
+    args = parser.parse_args()
+
+    if args.migrate:
+        migrate_passwords()
+    if args.hash:
+        print(hash_password(args.hash))
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import argparse
+
+import streamlit as st
+import pandas as pd
+from google.cloud import bigquery
+from google.oauth2 import service_account
+
+import config
+import client_pool
+import loader_stats
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# 로컬 미러로 동기화할 테이블 목록 (dataset_id, table_id)
+MIRROR_TABLES = [
+    ('SERVICE_DATA', 'users'),
+    ('RAW_DATA', 'budget_link'),
+    ('DATA_MARTS', 'list_up_budget_data'),
+    ('DATA_MARTS', 'list_up_edu_budget_data'),
+    ('DATA_MARTS', 'new_budget_data'),
+    ('DATA_MARTS', 'latest_budget_data'),
+    ('DATA_MARTS', 'bid_con_data'),
+    ('DATA_MARTS', 'bid_ser_data'),
+    ('DATA_MARTS', 'bid_pur_data'),
+    ('DATA_MARTS', 'news_data'),
+    ('DATA_WAREHOUSE', 'budget_data'),
+    ('DATA_WAREHOUSE', 'edu_budget_data'),
+    ('DATA_WAREHOUSE', 'g2b_data'),
+]
+
+
+class BigQueryBackend:
+    name = 'bigquery'
+
+    def __init__(self, dtype_backend='numpy'):
+        self._credentials = None
+        self.dtype_backend = dtype_backend  # 'pyarrow'면 Arrow 기반 pandas 타입으로 반환
+
+    @property
+    def credentials(self):
+        # 서비스 계정 정보는 실제로 BigQuery를 사용할 때만 읽음
+        if self._credentials is None:
+            self._credentials = service_account.Credentials.from_service_account_info(st.secrets["gcp_service_account"])
+        return self._credentials
+
+    def client(self):
+        # 프로세스 공용 레지스트리에서 인증된 클라이언트를 빌려옴
+        return client_pool.get_registry(self.credentials).client()
+
+    def read_table(self, dataset_id, table_id, columns=None, filters=None):
+        with self.client() as client:
+            table_ref = client.dataset(dataset_id).table(table_id)
+
+            if not filters:
+                # 조건이 없으면 쿼리 비용 없이 필요한 열만 읽음
+                with loader_stats.phase('query'):
+                    selected_fields = None
+                    if columns:
+                        schema = client.get_table(table_ref).schema
+                        selected_fields = [field for field in schema if field.name in columns]
+
+                    rows = client.list_rows(table_ref, selected_fields=selected_fields)
+
+                return self._to_dataframe(rows)
+
+            where, values = build_where(filters, 'bigquery')
+            query = f"""
+            SELECT {select_list(columns, 'bigquery')}
+            FROM `{dataset_id}.{table_id}`
+            WHERE {where}
+            """
+
+            job_config = bigquery.QueryJobConfig(query_parameters=[_query_parameter(value) for value in values])
+
+            with loader_stats.phase('query'):
+                rows = client.query(query, job_config=job_config).result()
+
+            return self._to_dataframe(rows)
+
+    def _to_dataframe(self, rows):
+        with loader_stats.phase('download'):
+            # Arrow 모드에서는 Arrow 테이블을 그대로 pandas ArrowDtype으로 감싸서 파이썬 객체 변환을 생략
+            if self.dtype_backend == 'pyarrow':
+                table = rows.to_arrow()
+                df = table.to_pandas(types_mapper=pd.ArrowDtype)
+                loader_stats.add_result(df, table.nbytes)
+                return df
+
+            df = rows.to_dataframe()
+
+        loader_stats.add_result(df)
+
+        return df
+
+    def write_table(self, df, dataset_id, table_id):
+        job_config = bigquery.LoadJobConfig()
+        job_config.write_disposition = "WRITE_TRUNCATE"  # 기존 테이블 내용 삭제 후 삽입
+
+        with self.client() as client:
+            table_ref = client.dataset(dataset_id).table(table_id)
+
+            job = client.load_table_from_dataframe(df, table_ref, job_config=job_config)
+            job.result()  # 작업 완료 대기
+
+    def insert_rows(self, dataset_id, table_id, rows):
+        with self.client() as client:
+            table_ref = f"{client.project}.{dataset_id}.{table_id}"
+
+            return client.insert_rows_json(table_ref, rows)
+
+
+class LocalMirrorBackend:
+    # <root>/<dataset_id>/<table_id>.parquet 형태로 동기화된 로컬 컬럼형 사본
+    name = 'local'
+
+    def __init__(self, root, dtype_backend='numpy'):
+        self.root = root
+        self.dtype_backend = dtype_backend
+
+    def table_path(self, dataset_id, table_id):
+        return os.path.join(self.root, dataset_id, f"{table_id}.parquet")
+
+    def read_table(self, dataset_id, table_id, columns=None, filters=None):
+        path = self.table_path(dataset_id, table_id)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Table {dataset_id}.{table_id} is not mirrored at {path}")
+
+        if not filters:
+            return self._read_parquet(path, columns)
+
+        if duckdb is not None:
+            where, values = build_where(filters, 'duckdb')
+            escaped_path = path.replace("'", "''")
+            query = f"""
+            SELECT {select_list(columns, 'duckdb')}
+            FROM read_parquet('{escaped_path}')
+            WHERE {where}
+            """
+            with duckdb.connect() as con:
+                with loader_stats.phase('query'):
+                    result = con.execute(query, values)
+                with loader_stats.phase('download'):
+                    if self.dtype_backend == 'pyarrow':
+                        df = result.arrow().to_pandas(types_mapper=pd.ArrowDtype)
+                    else:
+                        df = result.df()
+
+            loader_stats.add_result(df)
+
+            return df
+
+        # duckdb가 없으면 필요한 열만 읽어서 pandas로 필터링
+        read_columns = None
+        if columns:
+            read_columns = list(dict.fromkeys(list(columns) + [column for column, _, _ in filters]))
+
+        df = self._read_parquet(path, read_columns)
+        df = df[filter_mask(df, filters)]
+
+        return df[columns] if columns else df
+
+    def _read_parquet(self, path, columns):
+        with loader_stats.phase('download'):
+            if self.dtype_backend == 'pyarrow':
+                df = pd.read_parquet(path, columns=columns, dtype_backend='pyarrow')
+            else:
+                df = pd.read_parquet(path, columns=columns)
+
+        loader_stats.add_result(df)
+
+        return df
+
+    def write_table(self, df, dataset_id, table_id):
+        path = self.table_path(dataset_id, table_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # 쓰는 도중 다른 세션이 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def insert_rows(self, dataset_id, table_id, rows):
+        path = os.path.join(self.root, dataset_id, f"{table_id}.jsonl")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'a', encoding='utf-8') as file:
+            for row in rows:
+                file.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+        return []
+
+
+# 조건 연산자: '=', '!=', '>', '>=', '<', '<=', 'in', 'between'
+# 'date>=', 'date<=', 'date_between'은 열을 날짜로 변환한 뒤 비교 (문자열/날짜/시각 열 모두 지원)
+COMPARISON_OPS = ['=', '!=', '>', '>=', '<', '<=']
+
+
+# SQL 방언별 식별자 인용 부호, 문자열 타입, 실패 시 NULL을 돌려주는 형변환 함수
+SQL_DIALECTS = {
+    'bigquery': {'quote': '`', 'string': 'STRING', 'safe_cast': 'SAFE_CAST'},
+    'duckdb': {'quote': '"', 'string': 'VARCHAR', 'safe_cast': 'TRY_CAST'},
+}
+
+
+def select_list(columns, dialect):
+    quote = SQL_DIALECTS[dialect]['quote']
+    if not columns:
+        return '*'
+    return ', '.join(f"{quote}{column}{quote}" for column in columns)
+
+
+def build_where(filters, dialect):
+    # 값은 '?' 위치 파라미터로 넘겨서 쿼리 문자열에 직접 넣지 않음
+    quote = SQL_DIALECTS[dialect]['quote']
+    string_type = SQL_DIALECTS[dialect]['string']
+    safe_cast = SQL_DIALECTS[dialect]['safe_cast']
+    placeholder = '?'
+
+    clauses = []
+    values = []
+
+    for column, op, value in filters:
+        name = f"{quote}{column}{quote}"
+        # 날짜/시각/'YYYY-MM-DD...' 문자열 열을 모두 날짜로 비교하기 위해 앞 10자리만 사용
+        date_expr = f"{safe_cast}(SUBSTR(CAST({name} AS {string_type}), 1, 10) AS DATE)"
+
+        if op in COMPARISON_OPS:
+            clauses.append(f"{name} {op} {placeholder}")
+            values.append(value)
+        elif op == 'in':
+            value = list(value)
+            if not value:
+                clauses.append("FALSE")
+                continue
+            clauses.append(f"{name} IN ({', '.join([placeholder] * len(value))})")
+            values.extend(value)
+        elif op == 'between':
+            clauses.append(f"{name} BETWEEN {placeholder} AND {placeholder}")
+            values.extend(value)
+        elif op in ('date>=', 'date<='):
+            clauses.append(f"{date_expr} {op[4:]} CAST({placeholder} AS DATE)")
+            values.append(_date_string(value))
+        elif op == 'date_between':
+            clauses.append(f"{date_expr} BETWEEN CAST({placeholder} AS DATE) AND CAST({placeholder} AS DATE)")
+            values.extend(_date_string(item) for item in value)
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+
+    return ' AND '.join(clauses), values
+
+
+def filter_mask(df, filters):
+    # build_where와 같은 조건을 pandas DataFrame에 적용
+    mask = pd.Series(True, index=df.index)
+
+    for column, op, value in filters:
+        series = df[column]
+
+        if op.startswith('date'):
+            series = _date_series(series)
+            if op == 'date_between':
+                value = tuple(pd.to_datetime(_date_string(item)) for item in value)
+            else:
+                value = pd.to_datetime(_date_string(value))
+            op = {'date>=': '>=', 'date<=': '<=', 'date_between': 'between'}[op]
+
+        if op == '=':
+            mask &= series == value
+        elif op == '!=':
+            # SQL처럼 결측값은 != 조건에도 맞지 않음
+            mask &= (series != value) & series.notna()
+        elif op == '>':
+            mask &= series > value
+        elif op == '>=':
+            mask &= series >= value
+        elif op == '<':
+            mask &= series < value
+        elif op == '<=':
+            mask &= series <= value
+        elif op == 'in':
+            mask &= series.isin(list(value))
+        elif op == 'between':
+            mask &= (series >= value[0]) & (series <= value[1])
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+
+    return mask.fillna(False).astype(bool)
+
+
+def _date_series(series):
+    # build_where의 date_expr와 같이 날짜/시각은 날짜 부분만, 문자열은 앞 10자리만 날짜로 변환
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.normalize()
+    return pd.to_datetime(series.astype('string').str[:10], format='%Y-%m-%d', errors='coerce')
+
+
+def _date_string(value):
+    return pd.to_datetime(value).strftime('%Y-%m-%d')
+
+
+def _query_parameter(value):
+    # 파이썬 값의 타입에 맞는 BigQuery 쿼리 파라미터 생성
+    if isinstance(value, bool):
+        return bigquery.ScalarQueryParameter(None, 'BOOL', value)
+    if isinstance(value, int):
+        return bigquery.ScalarQueryParameter(None, 'INT64', value)
+    if isinstance(value, float):
+        return bigquery.ScalarQueryParameter(None, 'FLOAT64', value)
+    return bigquery.ScalarQueryParameter(None, 'STRING', str(value))
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+
+    if _backend is None:
+        backend_type = config.get_setting('data_backend', 'type', 'bigquery')
+        dtype_backend = config.get_setting('data_backend', 'dtype_backend', 'numpy')
+
+        if backend_type == 'bigquery':
+            _backend = BigQueryBackend(dtype_backend)
+        elif backend_type == 'local':
+            _backend = LocalMirrorBackend(config.get_setting('data_backend', 'local_path', 'data_mirror'), dtype_backend)
+        else:
+            raise ValueError(f"Unknown data backend: {backend_type}")
+
+    return _backend
+
+
+def sync_mirror(source, mirror, tables=None):
+    # source 백엔드의 테이블을 로컬 미러로 복사
+    for dataset_id, table_id in tables or MIRROR_TABLES:
+        df = source.read_table(dataset_id, table_id)
+        mirror.write_table(df, dataset_id, table_id)
+        print(f"Mirrored {dataset_id}.{table_id} ({len(df)} rows)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BigQuery 테이블을 로컬 Parquet 미러로 동기화")
+    parser.add_argument('--path', default=config.get_setting('data_backend', 'local_path', 'data_mirror'))
+    parser.add_argument('--table', action='append', help="DATASET.TABLE (생략 시 전체)")
+    args = parser.parse_args()
+
+    tables = [tuple(table.split('.', 1)) for table in args.table] if args.table else None
+    sync_mirror(BigQueryBackend(), LocalMirrorBackend(args.path), tables)
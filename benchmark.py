@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import json
+import time
+import inspect
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# 가상 데이터(synthetic_data)로 만든 로컬 미러를 대상으로 로더 정규화, 페이지 계산 경로, AppTest 전체 rerun 시간을 측정
+#
+#   python benchmark.py --rows 10000 100000 1000000 --repeat 3
+#
+# 결과는 JSON으로 저장 (--output, 기본값 .cache/benchmarks/benchmark_<시각>.json)
+
+# 로더 본문(쿼리 + 정규화)만 측정할 로더 (캐시 계층은 거치지 않음)
+LOADERS = [
+    'load_budget_data', 'load_latest_budget_data', 'load_budget_link_data', 'load_edu_budget_data',
+    'load_info_con_data', 'load_info_ser_data', 'load_info_pur_data', 'load_news_data', 'load_list_up_data',
+]
+
+# AppTest로 rerun할 메뉴 (app.main의 option_menu 항목)
+PAGES = ["납품 현황", "종합쇼핑몰 납품상세 내역", "STAT", "지자체 예산서", "인포21C"]
+
+OUR_COMPANIES = '미도플러스|에코그라운드'
+
+# synthetic_data.generate_users가 만드는 사용자 (목록에 없는 이름이면 auth.check_session이 로그아웃시킴)
+USERNAME = '사용자000'
+
+
+def configure(path, dtype_backend):
+    # 앱 모듈을 불러오기 전에 로컬 미러를 쓰도록 설정하고, 측정에 방해되는 디스크 캐시/예열/프로파일러는 끔
+    os.environ['MIDO_DATA_BACKEND_TYPE'] = 'local'
+    os.environ['MIDO_DATA_BACKEND_LOCAL_PATH'] = path
+    os.environ['MIDO_DATA_BACKEND_DTYPE_BACKEND'] = dtype_backend
+    os.environ['MIDO_DISK_CACHE_ENABLED'] = 'false'
+    os.environ['MIDO_WARMUP_ENABLED'] = 'false'
+    os.environ['MIDO_PROFILER_ENABLED'] = 'false'
+
+    import backend
+    backend._backend = None
+
+
+def measure(func, repeat):
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - started)
+
+    return {
+        'repeat': repeat,
+        'min': round(min(runs), 5),
+        'median': round(statistics.median(runs), 5),
+        'mean': round(statistics.mean(runs), 5),
+        'runs': [round(run, 5) for run in runs],
+    }
+
+
+def home_path(g2b_df):
+    # home_app: 올해 데이터, 어제/오늘 누적, 자사 필터, KPI, 업체별 금액
+    import date_index
+
+    current_year = datetime.now().year
+    current_year_data = date_index.year(date_index.rows(g2b_df, start=pd.Timestamp(current_year, 1, 1)), current_year)
+
+    today = datetime.now().date()
+    yesterday = today - timedelta(days=2)
+    yesterday_data = date_index.rows(current_year_data, end=yesterday)
+    today_data = date_index.rows(current_year_data, end=today)
+
+    yesterday_filtered = yesterday_data[yesterday_data['업체명'].str.contains(OUR_COMPANIES)]
+    today_filtered = today_data[today_data['업체명'].str.contains(OUR_COMPANIES)]
+
+    kpis = [frame[column].agg(func) for frame in (today_filtered, yesterday_filtered, today_data, yesterday_data)
+            for column, func in (('수량', 'count'), ('금액', 'sum'), ('수량', 'sum'))]
+
+    company_amounts = current_year_data.groupby('업체명', observed=True)['금액'].sum().reset_index()
+
+    return kpis, company_amounts
+
+
+def g2b_path(g2b_df):
+    # g2b_app: 전체 이력의 어제/오늘 누적, KPI, 표 정렬
+    import date_index
+
+    today = datetime.now().date()
+    yesterday = today - timedelta(days=2)
+    yesterday_data = date_index.rows(g2b_df, end=yesterday)
+    today_data = date_index.rows(g2b_df, end=today)
+
+    today_filtered = today_data[today_data['업체명'].str.contains(OUR_COMPANIES)]
+    kpis = [today_data['수량'].count(), today_data['금액'].sum(), yesterday_data['금액'].sum(), today_filtered['금액'].sum()]
+
+    table = today_data[['납품요구접수일자', '수요기관명', '납품요구건명', '업체명', '금액']].sort_values(by='납품요구접수일자', ascending=False)
+
+    return kpis, table
+
+
+def stat_path(g2b_df):
+    # stat_app: 기본 선택값(우수제품여부 해제, 전체 업체/지역/연도, 전체 기간과 범위)으로 FilterPlan 조건 -> KPI -> 업체별 집계 -> 상위 10개 -> 지도 데이터
+    # 세션 메모 없이 매번 새로 계산하는 첫 rerun 기준
+    import filter_plan
+    import stat_app
+
+    plan = filter_plan.FilterPlan(g2b_df)
+    overall = stat_app.summarize(g2b_df)
+
+    plan.select('업체명', plan.options('업체명'))
+    plan.select('도광역시', plan.options('도광역시'))
+    plan.select('연도', plan.options('연도', values=stat_app.receipt_years), values=stat_app.receipt_years)
+
+    min_date, max_date = plan.date_bounds('납품요구접수일자')
+    min_date = min_date if not pd.isna(min_date) else pd.to_datetime('2000-01-01')
+    max_date = max_date if not pd.isna(max_date) else pd.to_datetime('2100-12-31')
+    plan.date_between('납품요구접수일자', min_date.date(), max_date.date())
+
+    if plan.count():
+        ranges = {column: filter_plan.slider_range(plan.column(column))[2] for column in ('단가', '수량', '금액')}
+        for column, (low, high) in ranges.items():
+            plan.between(column, low, high)
+
+    filtered = plan.result()
+    summary = stat_app.summarize(filtered)
+
+    totals = filtered.groupby('업체명', observed=True)['금액'].sum().reset_index()
+    top = totals.nlargest(10, '금액')
+    map_data = filtered[filtered['업체명'].isin(top['업체명'])].dropna(subset=['위도', '경도'])
+
+    return (overall, summary), top, map_data
+
+
+def run_loaders(repeat):
+    import utils
+    import loader_stats
+
+    results = []
+    for name in LOADERS + ['fetch_g2b_data']:
+        # 캐시 계층을 모두 벗겨낸 본문을 측정하고, loader_stats로 쿼리/다운로드/정규화 시간을 나눔
+        func = loader_stats.measure(inspect.unwrap(getattr(utils, name)))
+        result = measure(func, repeat)
+        result['phases'] = loader_stats.snapshot()[name]['last_load']
+        results.append(dict(benchmark=f'loader.{name}', **result))
+
+    return results
+
+
+def run_page_paths(g2b_df, repeat):
+    return [
+        dict(benchmark='page.home', **measure(lambda: home_path(g2b_df), repeat)),
+        dict(benchmark='page.g2b', **measure(lambda: g2b_path(g2b_df), repeat)),
+        dict(benchmark='page.stat', **measure(lambda: stat_path(g2b_df), repeat)),
+    ]
+
+
+def run_apptest(repeat, timeout):
+    # app.main 전체 rerun (로그인된 세션으로 시작, 메뉴는 option_menu의 key로 지정)
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    for page in PAGES:
+        at = AppTest.from_file('app.py', default_timeout=timeout)
+        at.session_state['logged_in'] = True
+        at.session_state['username'] = USERNAME
+        at.session_state['jobTitle'] = ''
+        at.session_state['main_option'] = page
+
+        # 첫 rerun은 캐시가 비어 있을 수 있으므로 따로 기록
+        started = time.perf_counter()
+        at.run()
+        first = time.perf_counter() - started
+
+        result = measure(at.run, repeat)
+        result['first_run'] = round(first, 5)
+        result['exceptions'] = [str(exception.value) for exception in at.exception]
+        if not at.session_state['logged_in']:
+            # 로그인 화면을 측정한 결과는 의미가 없으므로 표시
+            result['exceptions'].append('logged out during the run')
+        results.append(dict(benchmark=f'apptest.{page}', **result))
+
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 데이터로 로더/페이지 성능 측정")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000], help="측정할 데이터 크기 (10000 ~ 5000000)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data', default=os.path.join('.cache', 'benchmarks', 'data'), help="가상 데이터를 저장할 경로")
+    parser.add_argument('--dtype-backend', default='numpy', choices=['numpy', 'pyarrow'])
+    parser.add_argument('--skip', action='append', default=[], choices=['loaders', 'pages', 'apptest'])
+    parser.add_argument('--apptest-timeout', type=float, default=600)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    import synthetic_data
+
+    report = {'environment': environment(), 'dtype_backend': args.dtype_backend, 'results': []}
+
+    for rows in args.rows:
+        path = os.path.join(args.data, str(rows))
+        if not os.path.exists(os.path.join(path, 'DATA_WAREHOUSE', 'g2b_data.parquet')):
+            synthetic_data.write_mirror(path, rows, args.seed)
+
+        configure(path, args.dtype_backend)
+
+        import utils
+
+        results = []
+        if 'loaders' not in args.skip:
+            results += run_loaders(args.repeat)
+
+        if 'pages' not in args.skip:
+            g2b_df = utils.fetch_g2b_data()
+            results += run_page_paths(g2b_df, args.repeat)
+
+        if 'apptest' not in args.skip:
+            # 이전 크기의 데이터가 캐시에 남지 않도록 비움
+            utils.st.cache_data.clear()
+            utils.load_g2b_data.clear()
+            utils.load_list_up_data.clear()
+            utils.g2b_sync.frame = None
+            results += run_apptest(args.repeat, args.apptest_timeout)
+
+        for result in results:
+            result['rows'] = rows
+            print(f"{rows:>9,} {result['benchmark']:<40} median {result['median']:.4f}s  min {result['min']:.4f}s")
+
+        report['results'] += results
+
+    output = args.output or os.path.join('.cache', 'benchmarks', f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2, default=str)
+
+    print(f"Saved results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,10 @@ import pandas as pd
 from datetime import datetime, timedelta
 
 import utils
+import profiler
+import parallel_loader
+import search_index
+import filter_plan
 
 def filter_data(df, key_prefix):
     key_column_index = df.columns.get_loc('세부사업명')
@@ -15,10 +19,10 @@ def filter_data(df, key_prefix):
         key=f'selectbox_{key_prefix}'
     )
 
+    plan = filter_plan.FilterPlan(df)
+
     if pd.api.types.is_numeric_dtype(df[key_column]):
-        min_value = float(df[key_column].min()) if not df[key_column].isna().all() else 0.0
-        max_value = float(df[key_column].max()) if not df[key_column].isna().all() else 0.0
-        value_range = (min_value, max_value) if min_value < max_value else (0.0, max_value)
+        min_value, max_value, value_range = filter_plan.slider_range(df[key_column])
 
         min_value, max_value = st.slider(f'{key_column}에서 검색할 범위 선택',
                                 min_value=min_value,
@@ -26,22 +30,26 @@ def filter_data(df, key_prefix):
                                 value=value_range,
                                 key=f'slider_{key_prefix}')
 
-        filtered_df = df[(df[key_column] >= min_value) & (df[key_column] <= max_value)]
+        plan.between(key_column, min_value, max_value)
 
     else:
         search_term = st.text_input(f'{key_column}에서 검색할 내용 입력', key=f'text_input_{key_prefix}')
         if search_term:
-            filtered_df = df[df[key_column].str.contains(search_term, case=False, na=False)]
-        else:
-            filtered_df = df
+            plan.search(key_column, search_term)
+
+    filtered_df = plan.result()
 
     st.write(f"{len(filtered_df)} 건")
-    st.dataframe(filtered_df, hide_index=True)
+    st.dataframe(utils.to_display(filtered_df), hide_index=True)
 
+@profiler.profiled()
 def budget_app():
-    budget_df = utils.load_budget_data()
-    new_budget_df, latest_budget_df = utils.load_latest_budget_data()
-    budget_link = utils.load_budget_link_data()
+    # 세 데이터를 동시에 불러오고, 실패한 데이터는 해당 탭에만 오류를 표시
+    data, errors = parallel_loader.load_concurrently({
+        'budget': utils.load_budget_data,
+        'latest_budget': utils.load_latest_budget_data,
+        'budget_link': utils.load_budget_link_data,
+    })
 
     today = datetime.now().date()
     date_range = today - timedelta(days=30)
@@ -52,24 +60,37 @@ def budget_app():
     tab1, tab2, tab3 = st.tabs(["최근 등록된 지자체 예산서", "전체 지자체 예산서", "지자체 예산서 링크"])
 
     with tab1:
-        st.markdown("---")
-        st.subheader(f"금일 지자체 예산서 ({today})")
-        st.markdown("---")
-        filter_data(new_budget_df, 'new_budget_df')
+        if 'latest_budget' in errors:
+            st.error(f"데이터를 불러오지 못했습니다: {errors['latest_budget']}")
+        else:
+            new_budget_df, latest_budget_df = data['latest_budget']
 
-        st.markdown("---")
-        st.subheader(f"최근 등록된 지자체 예산서 ({date_range} ~ {today})")
-        st.markdown("---")
-        filter_data(latest_budget_df, 'latest_budget_df')
+            st.markdown("---")
+            st.subheader(f"금일 지자체 예산서 ({today})")
+            st.markdown("---")
+            filter_data(new_budget_df, 'new_budget_df')
+
+            st.markdown("---")
+            st.subheader(f"최근 등록된 지자체 예산서 ({date_range} ~ {today})")
+            st.markdown("---")
+            filter_data(latest_budget_df, 'latest_budget_df')
 
 
     with tab2:
-        st.markdown("---")
-        st.subheader("전체 지자체 예산서")
-        st.markdown("---")
-        filter_data(budget_df, 'budget_df')
+        if 'budget' in errors:
+            st.error(f"데이터를 불러오지 못했습니다: {errors['budget']}")
+        else:
+            st.markdown("---")
+            st.subheader("전체 지자체 예산서")
+            st.markdown("---")
+            filter_data(data['budget'], 'budget_df')
 
     with tab3:
+        if 'budget_link' in errors:
+            st.error(f"데이터를 불러오지 못했습니다: {errors['budget_link']}")
+            return
+        budget_link = data['budget_link']
+
         st.markdown("---")
         st.subheader("지자체 예산서 링크")
         st.markdown("---")
@@ -84,12 +105,12 @@ def budget_app():
         search_term = st.text_input(f'{key_column}에서 검색할 내용 입력', key='search_term')
 
         if search_term:
-            budget_link = budget_link[budget_link[key_column].str.contains(search_term, case=False, na=False)]
+            budget_link = search_index.search(budget_link, key_column, search_term)
         else:
             budget_link = budget_link
 
         st.data_editor(
-            budget_link,
+            utils.to_display(budget_link),
             column_config={
                 "URL": st.column_config.LinkColumn(
                     "URL",
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+import time
+import threading
+from contextlib import contextmanager
+
+import requests
+from google.auth.exceptions import TransportError
+from google.auth.transport.requests import AuthorizedSession
+from google.api_core.exceptions import GoogleAPIError
+from google.cloud import bigquery
+
+import config
+
+
+class ClientRegistry:
+    # 프로세스 전체에서 인증된 BigQuery 클라이언트와 HTTP 커넥션 풀을 재사용
+
+    def __init__(self, credentials, pool_size=4, http_pool_maxsize=10, max_idle_seconds=300, health_check_seconds=60):
+        self.credentials = credentials
+        self.pool_size = pool_size
+        self.http_pool_maxsize = http_pool_maxsize
+        self.max_idle_seconds = max_idle_seconds
+        self.health_check_seconds = health_check_seconds
+
+        self._idle = []  # (client, 반환 시각)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+        self.stats = {
+            'clients_created': 0,
+            'clients_reused': 0,
+            'sessions_created': 0,
+            'clients_discarded': 0,
+            'health_check_failures': 0,
+        }
+
+    def _new_client(self):
+        # 토큰 갱신은 AuthorizedSession이 처리하고, 커넥션은 어댑터 풀에서 재사용
+        session = AuthorizedSession(self.credentials)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.http_pool_maxsize,
+                                                pool_maxsize=self.http_pool_maxsize)
+        session.mount('https://', adapter)
+
+        client = bigquery.Client(credentials=self.credentials,
+                                 project=self.credentials.project_id,
+                                 _http=session)
+
+        with self._lock:
+            self.stats['sessions_created'] += 1
+            self.stats['clients_created'] += 1
+
+        return client
+
+    def _is_healthy(self, client, released_at):
+        idle_seconds = time.monotonic() - released_at
+
+        # 오래 쉬었던 클라이언트는 끊긴 커넥션을 들고 있을 수 있으므로 폐기
+        if idle_seconds > self.max_idle_seconds:
+            return False
+
+        # 잠시 쉬었던 클라이언트는 가벼운 요청으로 연결 상태 확인
+        if idle_seconds > self.health_check_seconds:
+            try:
+                list(client.list_datasets(max_results=1))
+            except (GoogleAPIError, TransportError, requests.exceptions.RequestException):
+                return False
+
+        return True
+
+    def _discard(self, client):
+        try:
+            client.close()
+        except Exception:
+            pass
+
+        with self._lock:
+            self.stats['clients_discarded'] += 1
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                client, released_at = self._idle.pop()
+
+            if self._is_healthy(client, released_at):
+                with self._lock:
+                    self.stats['clients_reused'] += 1
+                return client
+
+            with self._lock:
+                self.stats['health_check_failures'] += 1
+            self._discard(client)
+
+        return self._new_client()
+
+    @contextmanager
+    def client(self):
+        # 동시에 사용할 수 있는 클라이언트 수는 pool_size로 제한
+        self._slots.acquire()
+        client = None
+        try:
+            client = self._checkout()
+            yield client
+        except (GoogleAPIError, TransportError, requests.exceptions.RequestException):
+            # 통신 오류가 난 클라이언트는 재사용하지 않음
+            if client is not None:
+                self._discard(client)
+                client = None
+            raise
+        finally:
+            if client is not None:
+                with self._lock:
+                    self._idle.append((client, time.monotonic()))
+            self._slots.release()
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['idle_clients'] = len(self._idle)
+        stats['pool_size'] = self.pool_size
+
+        return stats
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for client, _ in idle:
+            self._discard(client)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry(credentials):
+    global _registry
+
+    with _registry_lock:
+        if _registry is None:
+            _registry = ClientRegistry(
+                credentials,
+                pool_size=config.get_setting('bigquery', 'pool_size', 4),
+                http_pool_maxsize=config.get_setting('bigquery', 'http_pool_maxsize', 10),
+                max_idle_seconds=config.get_setting('bigquery', 'max_idle_seconds', 300),
+                health_check_seconds=config.get_setting('bigquery', 'health_check_seconds', 60),
+            )
+
+    return _registry
+
+
+def get_stats():
+    # 레지스트리가 아직 생성되지 않았으면 빈 통계를 반환
+    if _registry is None:
+        return {}
+
+    return _registry.snapshot()
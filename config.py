@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import os
+
+import streamlit as st
+
+
+def get_setting(section, key, default=None):
+    # 환경변수(MIDO_<SECTION>_<KEY>)가 st.secrets 설정보다 우선
+    env_value = os.environ.get(f"MIDO_{section.upper()}_{key.upper()}")
+    if env_value is not None:
+        return _cast(env_value, default)
+
+    # secrets.toml이 없을 때 st.secrets에 접근하면 화면에 오류 요소가 출력되어 st.set_page_config보다 먼저 그려지므로 파일부터 확인
+    if not _has_secrets():
+        return default
+
+    try:
+        return st.secrets[section][key]
+    except (KeyError, FileNotFoundError):
+        return default
+
+
+def _has_secrets():
+    try:
+        return st.secrets.load_if_toml_exists()
+    except Exception:
+        return False
+
+
+def _cast(value, default):
+    # 환경변수는 문자열이므로 기본값의 타입에 맞춰 변환
+    if isinstance(default, bool):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    if isinstance(default, int):
+        return int(value)
+    if isinstance(default, float):
+        return float(value)
+    if isinstance(default, (list, tuple)):
+        return [item.strip() for item in value.split(',') if item.strip()]
+    return value
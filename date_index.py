@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import derived_index
+
+# 날짜 순으로 정렬된 데이터(g2b는 납품요구접수일자 내림차순)의 날짜 구간 조회
+#
+# 정렬된 날짜를 int64 배열로 한 번만 만들어 두고 searchsorted로 구간의 시작/끝 위치를 찾아 iloc 슬라이스로 반환 (복사 없음)
+# 결과는 캐시된 원본을 공유하는 뷰이므로 수정하지 말고, 수정이 필요하면 필요한 열만 복사해서 사용
+#
+#   date_index.rows(g2b_data, end=today)             # today까지 (해당 날짜 포함)
+#   date_index.rows(g2b_data, start=start, end=end)  # start ~ end (양 끝 날짜 포함)
+#   date_index.year(g2b_data, 2024)
+#
+# 날짜 순으로 정렬되어 있지 않거나 시간대가 있는 열은 기존처럼 비교 연산으로 거름
+
+DATE_COLUMN = '납품요구접수일자'
+
+NAT = np.iinfo(np.int64).min
+ONE_DAY = pd.Timedelta(days=1)
+
+
+class DateIndex:
+    def __init__(self, keys, descending):
+        self.keys = keys              # 오름차순 int64 (결측값은 맨 앞)
+        self.descending = descending  # 원본이 내림차순이면 keys는 원본을 뒤집은 순서
+        self.missing = int(np.searchsorted(keys, NAT, side='right'))
+
+    @classmethod
+    def build(cls, dates):
+        # Arrow 모드(timestamp[ns][pyarrow])의 시간대 없는 날짜는 색인을 만들 때 한 번만 datetime64로 변환
+        if isinstance(dates.dtype, pd.ArrowDtype) and pa.types.is_timestamp(dates.dtype.pyarrow_dtype) \
+                and dates.dtype.pyarrow_dtype.tz is None:
+            dates = dates.astype('datetime64[ns]')
+
+        if not pd.api.types.is_datetime64_dtype(dates):
+            return None
+
+        values = dates.to_numpy(dtype='datetime64[ns]').view('int64')
+
+        # 내림차순 정렬(결측값은 맨 뒤)이면 뒤집었을 때 오름차순
+        reversed_values = values[::-1]
+        if _ascending(reversed_values):
+            return cls(reversed_values, descending=True)
+        if _ascending(values):
+            return cls(values, descending=False)
+
+        return None
+
+    def positions(self, start=None, end=None):
+        # [start, end) 구간(start, end는 Timestamp, 생략하면 끝까지)의 원본 위치 범위
+        low = self.missing if start is None else max(self.missing, int(np.searchsorted(self.keys, start.value, side='left')))
+        high = len(self.keys) if end is None else int(np.searchsorted(self.keys, end.value, side='left'))
+        high = max(low, high)
+
+        if self.descending:
+            return len(self.keys) - high, len(self.keys) - low
+        return low, high
+
+    def bounds(self, mask):
+        # mask에 해당하는 행의 가장 이른 날짜와 늦은 날짜 (정렬되어 있으므로 양 끝 행만 확인)
+        valid = np.flatnonzero(mask[:len(self.keys) - self.missing] if self.descending else mask[self.missing:])
+        if not len(valid):
+            return pd.NaT, pd.NaT
+
+        first, last = valid[0], valid[-1]
+        if self.descending:
+            return pd.Timestamp(self.keys[-1 - last]), pd.Timestamp(self.keys[-1 - first])
+        return pd.Timestamp(self.keys[self.missing + first]), pd.Timestamp(self.keys[self.missing + last])
+
+
+def _ascending(values):
+    # 결측값(int64 최솟값)과 날짜의 차이는 int64 범위를 넘으므로 np.diff 대신 이웃끼리 직접 비교
+    return bool((values[1:] >= values[:-1]).all())
+
+
+def get(frame, column=DATE_COLUMN):
+    def build(frame):
+        return DateIndex.build(frame[column])
+
+    if column not in frame.columns:
+        return None
+
+    index = derived_index.get(frame, f'date:{column}', build)
+    if index is None and frame.attrs.get('data_version') is None:
+        # 버전이 없는 데이터는 이번 호출에서만 사용
+        index = build(frame)
+
+    return index
+
+
+def _day_range(start, end):
+    # 날짜 단위로 양 끝을 포함하는 [start, end + 1일) 구간
+    start = None if start is None else pd.Timestamp(start).normalize()
+    end = None if end is None else pd.Timestamp(end).normalize() + ONE_DAY
+    return start, end
+
+
+def mask(frame, start=None, end=None, column=DATE_COLUMN):
+    # rows()와 같은 조건의 불리언 마스크 (FilterPlan 등에서 다른 조건과 합칠 때 사용)
+    start, end = _day_range(start, end)
+
+    index = get(frame, column)
+    if index is not None:
+        low, high = index.positions(start, end)
+        result = np.zeros(len(frame), dtype=bool)
+        result[low:high] = True
+        return result
+
+    dates = pd.to_datetime(frame[column], errors='coerce')
+    result = dates.notna()
+    if start is not None:
+        result &= dates >= start
+    if end is not None:
+        result &= dates < end
+    return result.to_numpy()
+
+
+def rows(frame, start=None, end=None, column=DATE_COLUMN):
+    index = get(frame, column)
+    if index is None:
+        return frame[mask(frame, start, end, column)]
+
+    low, high = index.positions(*_day_range(start, end))
+    return frame.iloc[low:high]
+
+
+def year(frame, year, column=DATE_COLUMN):
+    return rows(frame, pd.Timestamp(year, 1, 1), pd.Timestamp(year, 12, 31), column)
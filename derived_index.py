@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import threading
+import weakref
+
+import pandas as pd
+
+# 캐시된 데이터에서 파생된 색인(검색 색인, 패싯 색인 등)을 데이터 버전별로 한 번만 만들어서 모든 세션이 공유
+#
+# 키는 (attrs['data_version'], 색인 이름, 행 수와 행 이름 해시)이고, 같은 데이터의 새 버전 색인이 만들어지면 이전 버전 색인은 버림
+# 같은 데이터에서 잘라낸 슬라이스(올해 데이터 등)는 행 이름 전체의 해시로 구분해서 따로 색인함
+# (행 수와 첫/마지막 행 이름만 보면 중간 행이 다른 부분집합끼리 색인이 섞일 수 있음)
+# 버전이 없는 데이터는 내용이 바뀌었는지 알 수 없으므로 색인하지 않음 (None 반환)
+
+_lock = threading.Lock()
+_entries = {}   # (data_version, name, extent) -> 색인 (만들지 않기로 한 경우 None)
+_building = {}  # 같은 키의 색인을 여러 스레드가 동시에 만들지 않도록 키별 잠금
+_digests = {}   # id(행 이름) -> (weakref, 해시), 같은 데이터프레임으로 다시 호출될 때 해시를 다시 계산하지 않음
+
+
+def _namespace(version):
+    return version.split(':', 1)[0]
+
+
+def _digest(index):
+    # 행 이름 전체의 해시 (RangeIndex는 범위만으로 정확히 구분됨)
+    if isinstance(index, pd.RangeIndex):
+        return ('range', index.start, index.stop, index.step)
+
+    key = id(index)
+    with _lock:
+        cached = _digests.get(key)
+        if cached is not None and cached[0]() is index:
+            return cached[1]
+
+    hashed = pd.util.hash_pandas_object(index, index=False).to_numpy()
+    digest = ('hash', hashlib.sha1(hashed.tobytes()).hexdigest())
+
+    # 데이터프레임이 사라지면 해시도 버림 (GC 중에 호출될 수 있으므로 잠금 없이 제거)
+    with _lock:
+        _digests[key] = (weakref.ref(index, lambda _, key=key: _digests.pop(key, None)), digest)
+    return digest
+
+
+def _extent(frame):
+    return (len(frame), _digest(frame.index))
+
+
+def get(frame, name, build):
+    version = frame.attrs.get('data_version')
+    if version is None:
+        return None
+
+    key = (version, name, _extent(frame))
+
+    with _lock:
+        if key in _entries:
+            return _entries[key]
+        building = _building.setdefault(key, threading.Lock())
+
+    with building:
+        with _lock:
+            if key in _entries:
+                return _entries[key]
+
+        try:
+            entry = build(frame)
+        finally:
+            with _lock:
+                _building.pop(key, None)
+
+        with _lock:
+            for old_key in [old_key for old_key in _entries
+                            if _namespace(old_key[0]) == _namespace(version) and old_key[0] != version]:
+                del _entries[old_key]
+            _entries[key] = entry
+
+    return entry
+
+
+def snapshot():
+    with _lock:
+        return [{'data_version': version, 'name': name, 'rows': extent[0], 'built': entry is not None}
+                for (version, name, extent), entry in _entries.items()]
+
+
+def clear():
+    with _lock:
+        _entries.clear()
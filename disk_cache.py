@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import inspect
+import functools
+import threading
+
+import pandas as pd
+
+import config
+import loader_stats
+
+# 저장 형식이나 정규화 로직이 바뀌면 올려서 기존 디스크 캐시를 무효화
+CACHE_FORMAT_VERSION = 1
+
+_lock = threading.Lock()
+
+
+def cache_root():
+    return config.get_setting('disk_cache', 'path', os.path.join('.cache', 'loaders'))
+
+
+def is_enabled():
+    return config.get_setting('disk_cache', 'enabled', True)
+
+
+def _entry_dir(namespace):
+    return os.path.join(cache_root(), namespace)
+
+
+def _meta_path(namespace, key):
+    return os.path.join(_entry_dir(namespace), f"{key}.meta.json")
+
+
+def _part_path(namespace, key, token, i):
+    return os.path.join(_entry_dir(namespace), f"{key}.{token}.{i}.parquet")
+
+
+def make_key(*parts):
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def settings_key():
+    # 저장되는 데이터의 형태(타입)를 바꾸는 설정 (바뀌면 이전에 저장한 항목은 쓰지 않음)
+    return (CACHE_FORMAT_VERSION, config.get_setting('disk_cache', 'version', 0),
+            config.get_setting('memory', 'compact', False), config.get_setting('data_backend', 'dtype_backend', 'numpy'))
+
+
+def source_hash(*objects):
+    # 함수/모듈의 소스 코드 해시 (코드가 바뀌면 키가 바뀌도록 사용)
+    sources = []
+    for obj in objects:
+        try:
+            sources.append(inspect.getsource(obj))
+        except (OSError, TypeError):
+            sources.append('')
+
+    return hashlib.sha1('\n'.join(sources).encode('utf-8')).hexdigest()
+
+
+def save(namespace, key, value, meta=None):
+    # DataFrame 또는 DataFrame 튜플만 저장하고 저장된 항목의 토큰을 반환 (그 외 값은 저장하지 않고 None)
+    if isinstance(value, pd.DataFrame):
+        frames, kind = [value], 'frame'
+    elif isinstance(value, (tuple, list)) and value and all(isinstance(item, pd.DataFrame) for item in value):
+        frames, kind = list(value), 'tuple'
+    else:
+        return None
+
+    os.makedirs(_entry_dir(namespace), exist_ok=True)
+
+    # 읽는 쪽이 쓰다 만 파일을 보지 않도록 새 토큰으로 파일을 쓰고 메타 파일을 마지막에 교체
+    token = uuid.uuid4().hex[:12]
+    for i, frame in enumerate(frames):
+        path = _part_path(namespace, key, token, i)
+        frame.to_parquet(f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+    previous = _read_meta(namespace, key)
+
+    entry = {
+        'kind': kind,
+        'parts': len(frames),
+        'token': token,
+        'created': time.time(),
+        'bytes': sum(os.path.getsize(_part_path(namespace, key, token, i)) for i in range(len(frames))),
+        'meta': meta or {},
+    }
+
+    meta_path = _meta_path(namespace, key)
+    with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as file:
+        json.dump(entry, file, ensure_ascii=False)
+    os.replace(f"{meta_path}.tmp", meta_path)
+
+    if previous is not None:
+        _remove_parts(namespace, key, previous)
+
+    evict()
+
+    return token
+
+
+def load(namespace, key, max_age=None):
+    # (값, 메타 정보)를 반환하고, 없거나 max_age(초)보다 오래됐으면 None
+    entry = _read_meta(namespace, key)
+    if entry is None:
+        return None
+
+    if max_age is not None and time.time() - entry['created'] > max_age:
+        return None
+
+    try:
+        frames = [pd.read_parquet(_part_path(namespace, key, entry['token'], i)) for i in range(entry['parts'])]
+    except (OSError, ValueError):
+        # 다른 프로세스가 교체하면서 지운 파일이면 캐시 미스로 처리
+        return None
+
+    # LRU 정리를 위해 마지막 사용 시각 갱신
+    try:
+        os.utime(_meta_path(namespace, key))
+    except OSError:
+        pass
+
+    value = frames[0] if entry['kind'] == 'frame' else tuple(frames)
+
+    return value, entry
+
+
+def evict():
+    # 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    max_bytes = config.get_setting('disk_cache', 'max_bytes', 2 * 1024 ** 3)
+    root = cache_root()
+    if not os.path.isdir(root):
+        return
+
+    with _lock:
+        entries = []
+        for namespace in os.listdir(root):
+            directory = os.path.join(root, namespace)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if not name.endswith('.meta.json'):
+                    continue
+                key = name[:-len('.meta.json')]
+                entry = _read_meta(namespace, key)
+                if entry is None:
+                    continue
+                last_used = os.path.getmtime(os.path.join(directory, name))
+                entries.append((last_used, namespace, key, entry))
+
+        total = sum(entry['bytes'] for _, _, _, entry in entries)
+        for _, namespace, key, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= max_bytes:
+                break
+            _remove_parts(namespace, key, entry)
+            try:
+                os.remove(_meta_path(namespace, key))
+            except OSError:
+                pass
+            total -= entry['bytes']
+
+
+def clear(namespace=None):
+    path = cache_root() if namespace is None else _entry_dir(namespace)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def persistent(ttl=3600, name=None):
+    # st.cache_data 아래에 두는 디스크 캐시 계층
+    # 재시작 후 첫 요청도 BigQuery 대신 로컬 Parquet 파일에서 바로 읽음
+    def decorator(func):
+        namespace = name or func.__name__
+
+        # 로더 코드가 바뀌면 키가 바뀌도록 소스 코드를 키에 포함
+        func_hash = source_hash(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                # 디스크 캐시를 끈 경우에도 불러올 때마다 새 버전을 기록해서 파생 인덱스를 재사용할 수 있게 함
+                return _with_version(func(*args, **kwargs), f"{namespace}:{uuid.uuid4().hex[:12]}")
+
+            key = make_key(settings_key(), func_hash, args, sorted(kwargs.items()))
+
+            cached = load(namespace, key, max_age=ttl)
+            if cached is not None:
+                value, entry = cached
+                loader_stats.mark_disk_hit(func.__name__)
+                return _with_version(value, f"{namespace}:{key[:12]}:{entry['token']}")
+
+            value = func(*args, **kwargs)
+
+            try:
+                token = save(namespace, key, value)
+                if token is not None:
+                    value = _with_version(value, f"{namespace}:{key[:12]}:{token}")
+            except (OSError, ValueError, TypeError) as e:
+                # Parquet로 저장할 수 없는 값이면 디스크 캐시 없이 반환
+                print(f"Failed to write disk cache for {namespace}: {e}")
+
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _with_version(value, version):
+    # 같은 데이터에서 파생된 인덱스를 재사용할 수 있도록 데이터 버전을 attrs에 기록
+    frames = [value] if isinstance(value, pd.DataFrame) else value
+    if not isinstance(frames, (list, tuple)):
+        return value
+
+    for frame in frames:
+        if isinstance(frame, pd.DataFrame):
+            frame.attrs['data_version'] = version
+
+    return value
+
+
+def _read_meta(namespace, key):
+    try:
+        with open(_meta_path(namespace, key), 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove_parts(namespace, key, entry):
+    for i in range(entry['parts']):
+        try:
+            os.remove(_part_path(namespace, key, entry['token'], i))
+        except OSError:
+            pass
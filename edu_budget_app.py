@@ -4,7 +4,10 @@ import streamlit as st
 import pandas as pd
 
 import utils
+import profiler
+import filter_plan
 
+@profiler.profiled()
 def edu_budget_app():
     edu_budget_df = utils.load_edu_budget_data()
 
@@ -18,25 +21,26 @@ def edu_budget_app():
         edu_budget_df.columns,
         index=key_column_index
     )
+    plan = filter_plan.FilterPlan(edu_budget_df)
+
     if pd.api.types.is_numeric_dtype(edu_budget_df[key_column]):
-        min_value = float(edu_budget_df[key_column].min())
-        max_value = float(edu_budget_df[key_column].max())
+        min_value, max_value, value_range = filter_plan.slider_range(edu_budget_df[key_column])
         value_range = st.slider(f'{key_column}에서 검색할 범위 선택',
                                   min_value=min_value,
                                   max_value=max_value,
-                                  value=(min_value, max_value),
+                                  value=value_range,
                                   key='value_range')
-        edu_budget_filtered_df = edu_budget_df[(edu_budget_df[key_column] >= value_range[0]) & (edu_budget_df[key_column] <= value_range[1])]
+        plan.between(key_column, value_range[0], value_range[1])
 
     else:
         search_term = st.text_input(f'{key_column}에서 검색할 내용 입력', key='search_term')
         if search_term:
-            edu_budget_filtered_df = edu_budget_df[edu_budget_df[key_column].str.contains(search_term, case=False, na=False)]
-        else:
-            edu_budget_filtered_df = edu_budget_df
+            plan.search(key_column, search_term)
+
+    edu_budget_filtered_df = plan.result()
 
     st.write(f"{len(edu_budget_filtered_df)} 건")
     st.dataframe(
-        edu_budget_filtered_df,
+        utils.to_display(edu_budget_filtered_df),
         hide_index=True
     )
\ No newline at end of file
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+
+import derived_index
+
+# 멀티셀렉트용 패싯 색인 (업체명, 도광역시, 연도 등)
+#
+# 열을 정렬된 고유값 번호(codes)로 바꾸고, 값마다 해당 행 번호를 오름차순으로 모아 둠 (order[offsets[i]:offsets[i + 1]])
+# 선택값이 전체이면 계산 없이 통과시키고, 선택한 값의 행이 적으면 행 번호 배열을 합치고, 많으면 codes로 한 번에 마스크를 만듦
+# 현재 조건을 통과한 행의 값별 건수(facet counts)는 bincount 한 번으로 구해서 다음 멀티셀렉트의 선택지로 사용
+#
+# 결측값은 선택지에 나오지 않고, 선택값으로 거를 때도 제외됨
+
+
+class FacetIndex:
+    def __init__(self, values):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # 범주 순서가 아니라 값 순서로 정렬
+            values = values.astype(object)
+
+        codes, uniques = pd.factorize(values, sort=True)
+
+        self.codes = codes.astype(np.int32)
+        self.values = list(uniques.tolist() if hasattr(uniques, 'tolist') else uniques)
+        self.ids = {value: i for i, value in enumerate(self.values)}
+
+        self.counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.values))
+        self.offsets = np.concatenate([[0], np.cumsum(self.counts)])
+
+        # 결측값(-1)은 정렬하면 앞에 오므로 잘라냄
+        order = np.argsort(self.codes, kind='stable')
+        self.order = order[len(order) - int(self.counts.sum()):].astype(np.int32)
+
+    def rows(self, value_id):
+        return self.order[self.offsets[value_id]:self.offsets[value_id + 1]]
+
+    def mask(self, selected):
+        ids = sorted({self.ids[value] for value in selected if value in self.ids})
+
+        if len(ids) == len(self.values):
+            return self.codes >= 0
+
+        if self.counts[ids].sum() * 8 < len(self.codes):
+            # 선택한 값의 행이 적으면 행 번호 배열만 합침
+            mask = np.zeros(len(self.codes), dtype=bool)
+            if ids:
+                mask[np.concatenate([self.rows(value_id) for value_id in ids])] = True
+            return mask
+
+        hits = np.zeros(len(self.values) + 1, dtype=bool)  # 마지막 칸은 결측값(-1 코드)용
+        hits[ids] = True
+        return hits[self.codes]
+
+    def facet_counts(self, mask=None):
+        # 조건을 통과한 행의 값별 건수
+        if mask is None or mask.all():
+            return self.counts
+
+        codes = self.codes[mask]
+        return np.bincount(codes[codes >= 0], minlength=len(self.values))
+
+    def options(self, mask=None):
+        # 정렬된 선택지 중 조건을 통과한 행이 하나라도 있는 값
+        return [value for value, count in zip(self.values, self.facet_counts(mask)) if count]
+
+
+def get(df, name, values=None):
+    # values: 열 대신 색인할 값을 만드는 함수 (예: 날짜 열의 연도)
+    def build(frame):
+        return FacetIndex(frame[name] if values is None else values(frame))
+
+    index = derived_index.get(df, f'facet:{name}', build)
+    if index is None:
+        # 버전이 없는 데이터는 이번 rerun에서만 사용
+        index = build(df)
+
+    return index
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+
+import search_index
+import facet_index
+import date_index
+import session_memo
+
+# 위젯에서 고른 조건을 하나의 불리언 마스크로 모았다가 마지막에 한 번만 잘라내는 필터
+#
+#   plan = filter_plan.FilterPlan(g2b_data)
+#   plan.select('업체명', selected_companies)
+#   plan.between('금액', low, high)
+#   filtered_data = plan.result()
+#
+# 조건마다 데이터프레임 전체를 복사하지 않고, 다음 위젯의 선택지는 plan.options()(패싯 색인)나 plan.column()으로 만듦
+# 날짜 열은 plan.dates()에서 한 번만 변환해서 재사용
+#
+# memo(session_memo.get_memo())를 넘기면 같은 데이터 버전에서 같은 조건을 다시 고른 경우 마스크와
+# plan.cached()로 계산한 집계 결과를 다시 계산하지 않음
+
+
+def _as_mask(values):
+    # 결측값(pd.NA)이 섞인 비교 결과는 False로 처리
+    if hasattr(values, 'to_numpy'):
+        return values.to_numpy(dtype=bool, na_value=False)
+    return np.asarray(values, dtype=bool)
+
+
+def slider_range(values):
+    # 슬라이더의 최솟값, 최댓값, 기본 선택 범위 (값이 모두 결측이면 0)
+    if values.isna().all():
+        min_value = max_value = 0.0
+    else:
+        min_value, max_value = float(values.min()), float(values.max())
+
+    return min_value, max_value, ((min_value, max_value) if min_value < max_value else (0.0, max_value))
+
+
+class FilterPlan:
+    def __init__(self, df, base=None, memo=None):
+        self.df = df
+        self.base = base  # 검색 색인을 만들 캐시 데이터 (df가 캐시 데이터에서 잘려 나온 경우)
+        self.mask = np.ones(len(df), dtype=bool)
+        self._dates = {}
+
+        # 세션 메모(session_memo)가 있으면 지금까지의 조건(state)으로 마스크와 집계 결과를 재사용
+        self.version = df.attrs.get('data_version')
+        self.memo = memo if self.version is not None else None
+        self.state = ()
+        if self.memo is not None:
+            self.memo.use_version(self.version)
+
+    def _apply(self, key, compute):
+        # key: 조건을 나타내는 값 (None이면 메모할 수 없는 조건이므로 이후로는 메모를 쓰지 않음)
+        self.state = self.state + (key,) if self.state is not None and key is not None else None
+
+        if self.memo is None or self.state is None:
+            self.mask &= _as_mask(compute())
+            return self
+
+        memo_key = (self.version, self.state, 'mask')
+        packed = self.memo.get(memo_key)
+        if packed is not None:
+            self.mask = np.unpackbits(packed, count=len(self.mask)).astype(bool)
+            return self
+
+        self.mask &= _as_mask(compute())
+        self.memo.put(memo_key, np.packbits(self.mask))
+        return self
+
+    def where(self, mask, key=None):
+        # mask는 배열이나 배열을 만드는 함수 (함수이면 메모에 있을 때는 호출하지 않음)
+        return self._apply(key, mask if callable(mask) else lambda: mask)
+
+    def isin(self, column, values):
+        return self._apply(('isin', column, session_memo.normalize(values)), lambda: self.df[column].isin(values))
+
+    def select(self, column, selected, values=None):
+        # 멀티셀렉트 선택값으로 거름 (패싯 색인 사용, values는 facet_index.get 참고)
+        return self._apply(('select', column, session_memo.normalize(selected)),
+                           lambda: facet_index.get(self.df, column, values).mask(selected))
+
+    def options(self, column, values=None):
+        # 지금까지의 조건을 통과한 행에 있는 값 (정렬됨, 결측값 제외)
+        return self.cached(('options', column), lambda: facet_index.get(self.df, column, values).options(self.mask))
+
+    def between(self, column, low, high):
+        def compute():
+            values = self.df[column]
+            return (values >= low) & (values <= high)
+
+        return self._apply(('between', column, session_memo.normalize((low, high))), compute)
+
+    def date_between(self, column, start, end):
+        # 양 끝 날짜 포함 (날짜순으로 정렬된 데이터는 date_index로 위치 범위만 찾음)
+        return self._apply(('date_between', column, session_memo.normalize((start, end))),
+                           lambda: date_index.mask(self.df, start, end, column))
+
+    def date_bounds(self, column):
+        # 지금까지의 조건을 통과한 행의 가장 이른 날짜와 늦은 날짜
+        def compute():
+            index = date_index.get(self.df, column)
+            if index is not None:
+                return index.bounds(self.mask)
+
+            dates = self.dates(column)[self.mask]
+            return dates.min(), dates.max()
+
+        return self.cached(('date_bounds', column), compute)
+
+    def search(self, column, query):
+        return self._apply(('search', column, query), lambda: search_index.mask(self.df, column, query, base=self.base))
+
+    def cached(self, name, compute):
+        # 현재 조건에서 계산한 값 (집계 결과 등)을 세션 메모에 저장
+        if self.memo is None or self.state is None:
+            return compute()
+
+        return self.memo.get_or_compute((self.version, self.state, name), compute)
+
+    def dates(self, column):
+        # 이미 datetime인 열은 그대로 사용
+        if column not in self._dates:
+            values = self.df[column]
+            if not pd.api.types.is_datetime64_any_dtype(values):
+                values = pd.to_datetime(values, errors='coerce')
+            self._dates[column] = values
+
+        return self._dates[column]
+
+    def column(self, column):
+        # 지금까지의 조건을 통과한 행의 값 (열 하나만 잘라냄)
+        return self.df[column][self.mask]
+
+    def count(self):
+        return int(self.mask.sum())
+
+    def result(self):
+        # 조건이 없으면 복사하지 않고 원본을 그대로 반환하므로 결과를 수정하면 안 됨
+        if self.mask.all():
+            return self.df
+        return self.df[self.mask]
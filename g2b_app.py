@@ -5,7 +5,11 @@ import pandas as pd
 from datetime import datetime, timedelta
 
 import utils
+import profiler
+import search_index
+import date_index
 
+@profiler.profiled()
 def g2b_app():
     g2b_data = utils.load_g2b_data()
 
@@ -43,11 +47,13 @@ def g2b_app():
     yesterday = datetime.strptime(yesterday_str, '%Y%m%d').date()
 
     st.header(f"종합쇼핑몰 납품상세 내역 ({g2b_data['납품요구접수일자'].min().strftime('%Y-%m-%d')} ~ {today})")
+    utils.show_data_age(utils.load_g2b_data)
 
     st.markdown("---")
 
-    yesterday_data = g2b_data[g2b_data['납품요구접수일자'].dt.date <= yesterday]
-    today_data = g2b_data[g2b_data['납품요구접수일자'].dt.date <= today]
+    # 날짜 구간은 정렬된 날짜 색인으로 잘라냄 (복사 없는 슬라이스이므로 수정하지 않음)
+    yesterday_data = date_index.rows(g2b_data, end=yesterday)
+    today_data = date_index.rows(g2b_data, end=today)
 
     def format_delta(delta, decimal_points=2):
         if delta > 0:
@@ -161,12 +167,14 @@ def g2b_app():
 
     st.markdown("---")
 
-    today_data['납품요구접수일자'] = pd.to_datetime(today_data['납품요구접수일자']).dt.strftime('%Y-%m-%d')
-
     view_columns = [
         '납품요구접수일자', '수요기관명', '납품요구건명', '업체명', '금액', '수량', '단위', '단가', '품목',
     ]
 
+    # 표에 필요한 열만 복사해서 날짜를 문자열로 바꿈
+    table_data = today_data[view_columns].copy()
+    table_data['납품요구접수일자'] = pd.to_datetime(table_data['납품요구접수일자']).dt.strftime('%Y-%m-%d')
+
     key_column = st.selectbox(
         '필터링할 열 선택',
         ['납품요구접수일자', '수요기관명', '납품요구건명', '업체명'],
@@ -176,9 +184,10 @@ def g2b_app():
     search_term = st.text_input(f'{key_column}에서 검색할 내용 입력', key='search_term')
 
     if search_term:
-        today_data = today_data[today_data[key_column].str.contains(search_term, case=False, na=False)]
+        # 색인은 캐시된 전체 이력 기준으로 한 번만 만들고 재사용
+        table_data = search_index.search(table_data, key_column, search_term, base=g2b_data)
 
     st.dataframe(
-        today_data[view_columns].sort_values(by='납품요구접수일자', ascending=False),
+        utils.to_display(table_data.sort_values(by='납품요구접수일자', ascending=False)),
         hide_index=True
     )
\ No newline at end of file
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+REGION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'region.json')
+
+# 행정구역 명칭 변경 (이전 명칭 -> 현재 명칭)
+REGION_ALIASES = {'강원도': '강원특별자치도', '전라북도': '전북특별자치도'}
+
+
+@lru_cache(maxsize=None)
+def load_region_table(path=REGION_FILE):
+    # region.json("도광역시/시군구" -> 위도/경도)을 한 번만 읽어서 조회용 딕셔너리로 변환
+    with open(path, 'r', encoding='utf-8') as file:
+        regions = json.load(file)
+
+    return {key: (float(value['lat']), float(value['long'])) for key, value in regions.items()}
+
+
+def resolve_region_name(name):
+    for old_name, new_name in REGION_ALIASES.items():
+        name = name.replace(old_name, new_name)
+    return name
+
+
+def geocode_regions(region_names):
+    # 수요기관지역명 열 전체를 한 번에 처리
+    # 행마다 계산하지 않고 고유값에 대해서만 계산한 뒤 코드로 펼침
+    codes, uniques = pd.factorize(region_names)
+    regions = load_region_table()
+
+    size = len(uniques) + 1  # 마지막 칸은 결측값(-1 코드)용
+    names = np.full(size, None, dtype=object)
+    provinces = np.full(size, None, dtype=object)
+    districts = np.full(size, None, dtype=object)
+    latitudes = np.full(size, np.nan)
+    longitudes = np.full(size, np.nan)
+
+    for i, name in enumerate(uniques):
+        name = resolve_region_name(name)
+        parts = name.split(' ')
+
+        names[i] = name
+        provinces[i] = parts[0]
+        districts[i] = parts[1] if len(parts) > 1 else None
+
+        region_key = f"{provinces[i]}/{districts[i] or ''}"
+        if region_key in regions:
+            latitudes[i], longitudes[i] = regions[region_key]
+
+    codes = np.where(codes < 0, size - 1, codes)
+
+    return pd.DataFrame({
+        '수요기관지역명': names.take(codes),
+        '도광역시': provinces.take(codes),
+        '시군구': districts.take(codes),
+        '위도': latitudes.take(codes),
+        '경도': longitudes.take(codes),
+    }, index=region_names.index)
@@ -8,14 +8,20 @@ import plotly.express as px
 import plotly.graph_objects as go
 
 import utils
+import profiler
+import search_index
+import date_index
 
+@profiler.profiled()
 def home_app():
     g2b_data = utils.load_current_year_g2b_data()
 
     current_year = datetime.now().year
     st.header(f"{current_year} 년 납품 현황 (미도플러스/에코그라운드)")
+    utils.show_data_age(utils.load_g2b_data)
 
-    current_year_data = g2b_data[g2b_data['납품요구접수일자'].dt.year == current_year]
+    # 날짜 구간은 정렬된 날짜 색인으로 잘라냄 (복사 없는 슬라이스이므로 수정하지 않음)
+    current_year_data = date_index.year(g2b_data, current_year)
 
     st.markdown("---")
 
@@ -52,8 +58,8 @@ def home_app():
     today = datetime.strptime(today_str, '%Y%m%d').date()
     yesterday = datetime.strptime(yesterday_str, '%Y%m%d').date()
 
-    yesterday_data = current_year_data[current_year_data['납품요구접수일자'].dt.date <= yesterday]
-    today_data = current_year_data[current_year_data['납품요구접수일자'].dt.date <= today]
+    yesterday_data = date_index.rows(current_year_data, end=yesterday)
+    today_data = date_index.rows(current_year_data, end=today)
 
     yesterday_data_filtered = yesterday_data[yesterday_data['업체명'].str.contains('미도플러스|에코그라운드')]
     today_data_filtered = today_data[today_data['업체명'].str.contains('미도플러스|에코그라운드')]
@@ -181,10 +187,11 @@ def home_app():
     search_term = st.text_input(f'{key_column}에서 검색할 내용 입력', key='search_term')
 
     if search_term:
-        today_data_filtered = today_data_filtered[today_data_filtered[key_column].str.contains(search_term, case=False, na=False)]
+        # 색인은 캐시된 올해 데이터 기준으로 한 번만 만들고 재사용
+        today_data_filtered = search_index.search(today_data_filtered, key_column, search_term, base=g2b_data)
 
     st.dataframe(
-        today_data_filtered[view_columns].sort_values(by='납품요구접수일자', ascending=False),
+        utils.to_display(today_data_filtered[view_columns].sort_values(by='납품요구접수일자', ascending=False)),
         hide_index=True
     )
 
@@ -257,7 +264,7 @@ def home_app():
         #
         # st.plotly_chart(fig, use_container_width=True)
 
-        company_amounts = current_year_data.groupby('업체명')['금액'].sum().reset_index()
+        company_amounts = current_year_data.groupby('업체명', observed=True)['금액'].sum().reset_index()
 
         fig_amounts = go.Figure(data=[go.Pie(labels=company_amounts['업체명'],
                                              values=company_amounts['금액'],
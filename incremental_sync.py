@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+import time
+import uuid
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+import disk_cache
+
+
+class IncrementalSync:
+    # 정규화가 끝난 데이터프레임을 보관하고, 워터마크 이후의 행만 다시 받아서 갱신
+    #
+    # fetch(filters)는 filters 조건에 맞는 행을 받아 정규화한 DataFrame을 반환해야 하며,
+    # 보관 중인 데이터는 date_column 기준 내림차순으로 정렬되어 있다고 가정
+
+    def __init__(self, fetch, date_column, key_columns, lookback_days=7, full_refresh_hours=24,
+                 snapshot_name=None, snapshot_max_age=3600, snapshot_sources=()):
+        self.fetch = fetch
+        self.date_column = date_column
+        self.key_columns = key_columns
+        self.lookback_days = lookback_days
+        self.full_refresh_hours = full_refresh_hours
+
+        # snapshot_name을 지정하면 갱신할 때마다 디스크에 저장하고, 재시작 후 이어서 사용
+        self.snapshot_name = snapshot_name
+        self.snapshot_max_age = snapshot_max_age
+        # fetch 외에 저장되는 데이터의 형태를 정하는 함수/모듈 (코드가 바뀌면 스냅샷을 버림)
+        self.snapshot_sources = snapshot_sources
+
+        self.frame = None
+        self.watermark = None
+        self.version = 0
+        self.last_full_refresh = None
+        self.last_delta_rows = 0
+
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        with self._lock:
+            # 재시작 직후에는 디스크 스냅샷을 먼저 복원하고, 충분히 최근이면 그대로 사용
+            if self.frame is None and self._restore():
+                return self.frame
+
+            now = datetime.now()
+            full_refresh_due = (self.last_full_refresh is None or
+                                now - self.last_full_refresh >= timedelta(hours=self.full_refresh_hours))
+
+            if self.frame is None or self.watermark is None or full_refresh_due:
+                frame = self.fetch(None).reset_index(drop=True)
+                self.last_full_refresh = now
+                self.last_delta_rows = len(frame)
+            else:
+                frame = self._apply_delta()
+
+            self.frame = frame
+            watermark = frame[self.date_column].max()
+            self.watermark = watermark if pd.notna(watermark) else None
+            self._stamp()
+
+            self._persist()
+
+            return frame
+
+    def _stamp(self):
+        # 파생 인덱스가 데이터 버전별로 재사용될 수 있도록 프로세스 간에도 겹치지 않는 버전을 기록
+        self.version += 1
+        self.frame.attrs['data_version'] = f"{self.snapshot_name or 'sync'}:{self.version}:{uuid.uuid4().hex[:8]}"
+
+    def _restore(self):
+        if self.snapshot_name is None or not disk_cache.is_enabled():
+            return False
+
+        cached = disk_cache.load('incremental_sync', self.snapshot_name)
+        if cached is None:
+            return False
+
+        frame, entry = cached
+        meta = entry['meta']
+
+        # 정규화 코드나 타입 설정(memory.compact, dtype_backend 등)이 바뀐 뒤에는 이전 형태의 스냅샷을 쓰지 않음
+        if meta.get('snapshot_version') != self._snapshot_version():
+            print(f"Discarding snapshot for {self.snapshot_name}: saved with different code or settings")
+            return False
+
+        self.frame = frame
+        self.watermark = pd.Timestamp(meta['watermark']) if meta.get('watermark') else None
+        self.last_full_refresh = datetime.fromisoformat(meta['last_full_refresh']) if meta.get('last_full_refresh') else None
+        self._stamp()
+
+        return time.time() - entry['created'] <= self.snapshot_max_age
+
+    def _snapshot_version(self):
+        return disk_cache.make_key(disk_cache.settings_key(), disk_cache.source_hash(self.fetch, *self.snapshot_sources))
+
+    def _persist(self):
+        if self.snapshot_name is None or not disk_cache.is_enabled():
+            return
+
+        meta = {
+            'snapshot_version': self._snapshot_version(),
+            'watermark': None if self.watermark is None else self.watermark.isoformat(),
+            'last_full_refresh': None if self.last_full_refresh is None else self.last_full_refresh.isoformat(),
+        }
+
+        try:
+            disk_cache.save('incremental_sync', self.snapshot_name, self.frame, meta)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Failed to write snapshot for {self.snapshot_name}: {e}")
+
+    def _apply_delta(self):
+        # 늦게 들어오는 변경분을 위해 워터마크보다 lookback_days 만큼 앞에서부터 다시 받음
+        since = (self.watermark - timedelta(days=self.lookback_days)).normalize()
+
+        delta = self.fetch([(self.date_column, 'date>=', since.date())])
+        delta = delta.sort_values(by=self.date_column, ascending=False)
+        self.last_delta_rows = len(delta)
+
+        # 다시 받은 구간은 통째로 교체하고, 그 이전 구간에서는 키가 정확히 같은 행(날짜가 바뀌어 구간 안으로 옮겨 온 행의
+        # 이전 사본)만 제거. 키에 변경차수가 포함되므로 다른 차수의 행은 전체 조회 결과와 마찬가지로 그대로 남음
+        # 접수일자가 since보다 이전인 행이 늦게 추가/변경되면 delta에 들어오지 않으므로 다음 전체 조회(full_refresh_hours)에서 반영됨
+        kept = self.frame[~(self.frame[self.date_column] >= since)]
+        if not delta.empty:
+            delta_keys = pd.MultiIndex.from_frame(delta[self.key_columns])
+            kept = kept[~pd.MultiIndex.from_frame(kept[self.key_columns]).isin(delta_keys)]
+
+        # delta는 모두 since 이후, kept는 모두 since 이전(또는 날짜 없음)이므로 이어 붙여도 정렬이 유지됨
+        return _concat([delta, kept])
+
+    def snapshot(self):
+        return {
+            'version': self.version,
+            'rows': 0 if self.frame is None else len(self.frame),
+            'watermark': None if self.watermark is None else str(self.watermark),
+            'last_full_refresh': None if self.last_full_refresh is None else self.last_full_refresh.isoformat(),
+            'last_delta_rows': self.last_delta_rows,
+        }
+
+
+def _concat(frames):
+    # category 열은 범주를 합친 뒤 이어 붙여야 object 타입으로 풀리지 않음
+    # 메모리 절약 모드에서 행이 적은 delta는 고유값 비율 때문에 category로 바뀌지 않는 경우가 많으므로,
+    # 한 쪽이라도 category이면 나머지도 category로 바꿔서 합침
+    frames = [frame.copy(deep=False) for frame in frames]
+
+    for column in frames[0].columns:
+        if not any(isinstance(frame[column].dtype, pd.CategoricalDtype) for frame in frames):
+            continue
+
+        values = [_as_category(frame[column]) for frame in frames]
+        categories = union_categoricals(values).categories
+        for frame, column_values in zip(frames, values):
+            frame[column] = column_values.cat.set_categories(categories)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def _as_category(values):
+    # 범주 타입(object, string[pyarrow] 등)이 다르면 합칠 수 없으므로 범주는 object로 맞춤
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object).astype('category')
+    if values.cat.categories.dtype != object:
+        values = values.cat.rename_categories(values.cat.categories.astype(object))
+    return values
@@ -4,6 +4,9 @@ import streamlit as st
 import pandas as pd
 
 import utils
+import profiler
+import parallel_loader
+import filter_plan
 
 def filter_data(df, key_prefix):
     key_column_index = df.columns.get_loc('공고명')
@@ -14,10 +17,10 @@ def filter_data(df, key_prefix):
         key=f'selectbox_{key_prefix}'
     )
 
+    plan = filter_plan.FilterPlan(df)
+
     if pd.api.types.is_numeric_dtype(df[key_column]):
-        min_value = float(df[key_column].min()) if not df[key_column].isna().all() else 0.0
-        max_value = float(df[key_column].max()) if not df[key_column].isna().all() else 0.0
-        value_range = (min_value, max_value) if min_value < max_value else (0.0, max_value)
+        min_value, max_value, value_range = filter_plan.slider_range(df[key_column])
 
         min_value, max_value = st.slider(f'{key_column}에서 검색할 범위 선택',
                                 min_value=min_value,
@@ -25,23 +28,27 @@ def filter_data(df, key_prefix):
                                 value=value_range,
                                 key=f'slider_{key_prefix}')
 
-        filtered_df = df[(df[key_column] >= min_value) & (df[key_column] <= max_value)]
+        plan.between(key_column, min_value, max_value)
 
     else:
         search_term = st.text_input(f'{key_column}에서 검색할 내용 입력', key=f'text_input_{key_prefix}')
         if search_term:
-            filtered_df = df[df[key_column].str.contains(search_term, case=False, na=False)]
-        else:
-            filtered_df = df
+            plan.search(key_column, search_term)
+
+    filtered_df = plan.result()
 
     st.write(f"{len(filtered_df)} 건")
-    st.dataframe(filtered_df, hide_index=True)
+    st.dataframe(utils.to_display(filtered_df), hide_index=True)
 
+@profiler.profiled()
 def info21C_app():
     try:
-        info_con_df = utils.load_info_con_data()
-        info_ser_df = utils.load_info_ser_data()
-        info_pur_df = utils.load_info_pur_data()
+        # 세 데이터를 동시에 불러오고, 실패한 데이터는 해당 탭에만 오류를 표시
+        data, errors = parallel_loader.load_concurrently({
+            'info_con_df': utils.load_info_con_data,
+            'info_ser_df': utils.load_info_ser_data,
+            'info_pur_df': utils.load_info_pur_data,
+        })
 
         st.header(f"인포 21C")
         st.markdown("---")
@@ -53,21 +60,30 @@ def info21C_app():
             st.subheader(f"공사입찰")
             st.markdown("---")
 
-            filter_data(info_con_df, 'info_con_df')
+            if 'info_con_df' in errors:
+                st.error(f"데이터를 불러오지 못했습니다: {errors['info_con_df']}")
+            else:
+                filter_data(data['info_con_df'], 'info_con_df')
 
         with tab2:
             st.markdown("---")
             st.subheader(f"용역입찰")
             st.markdown("---")
 
-            filter_data(info_ser_df, 'info_ser_df')
+            if 'info_ser_df' in errors:
+                st.error(f"데이터를 불러오지 못했습니다: {errors['info_ser_df']}")
+            else:
+                filter_data(data['info_ser_df'], 'info_ser_df')
 
         with tab3:
             st.markdown("---")
             st.subheader(f"구매입찰")
             st.markdown("---")
 
-            filter_data(info_pur_df, 'info_pur_df')
+            if 'info_pur_df' in errors:
+                st.error(f"데이터를 불러오지 못했습니다: {errors['info_pur_df']}")
+            else:
+                filter_data(data['info_pur_df'], 'info_pur_df')
 
     except Exception as e:
         st.error(f"An error occurred: {e}")
@@ -1,18 +1,22 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
 
-import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
 import utils
+import profiler
+import schema
+import search_index
 
+@profiler.profiled()
 def list_up_app():
     today = datetime.now().strftime('%Y%m%d_%H%M%S')
 
     list_up_budget_data, list_up_edu_budget_data = utils.load_list_up_data()
 
     st.header("예산 사업 현황")
+    utils.show_data_age(utils.load_list_up_data)
     st.markdown("---")
 
     tab1, tab2 = st.tabs(["지자체 예산 현황", "교육청 예산 현황"])
@@ -42,9 +46,7 @@ def list_up_app():
 
         numeric_columns = ['예산현액', '국비', '시도비', '시군구비', '기타', '지출액', '편성액']
 
-        for column in numeric_columns:
-            list_up_budget_data[column] = list_up_budget_data[column].replace('None', np.nan)
-            list_up_budget_data[column] = pd.to_numeric(list_up_budget_data[column].astype(str).str.replace(',', ''), errors='coerce')
+        list_up_budget_data = schema.coerce(list_up_budget_data, 'list_up_budget')
 
         key_column = st.selectbox('필터링할 열 선택', list_up_budget_data.columns, index=list_up_budget_data.columns.get_loc('세부사업명'), key='list_up_budget_data_key_column')
 
@@ -61,7 +63,7 @@ def list_up_app():
         else:
             search_term = st.text_input(f'{key_column}에서 검색할 내용 입력', key='list_up_budget_data_search_term')
             if search_term:
-                list_up_budget_data_filtered = list_up_budget_data[list_up_budget_data[key_column].str.contains(search_term, case=False, na=False)]
+                list_up_budget_data_filtered = search_index.search(list_up_budget_data, key_column, search_term)
             else:
                 list_up_budget_data_filtered = list_up_budget_data
 
@@ -109,9 +111,7 @@ def list_up_app():
 
         numeric_columns = ['금액', '면적']
 
-        for column in numeric_columns:
-            list_up_edu_budget_data[column] = list_up_edu_budget_data[column].replace('None', np.nan)
-            list_up_edu_budget_data[column] = pd.to_numeric(list_up_edu_budget_data[column].astype(str).str.replace(',', ''), errors='coerce')
+        list_up_edu_budget_data = schema.coerce(list_up_edu_budget_data, 'list_up_edu_budget')
 
         key_column = st.selectbox('필터링할 열 선택', list_up_edu_budget_data.columns, index=list_up_edu_budget_data.columns.get_loc('과업명'), key='list_up_edu_budget_data_key_column')
 
@@ -128,7 +128,7 @@ def list_up_app():
         else:
             search_term = st.text_input(f'{key_column}에서 검색할 내용 입력', key='list_up_edu_budget_data_search_term')
             if search_term:
-                list_up_edu_budget_data_filtered = list_up_edu_budget_data[list_up_edu_budget_data[key_column].str.contains(search_term, case=False, na=False)]
+                list_up_edu_budget_data_filtered = search_index.search(list_up_edu_budget_data, key_column, search_term)
             else:
                 list_up_edu_budget_data_filtered = list_up_edu_budget_data
 
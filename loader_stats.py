@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+import functools
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+import profiler
+
+# 로더별 호출/적중 통계
+#
+#   @loader_stats.observe                 <- 캐시 바깥: 호출 수, 메모리/디스크 적중, 미스, 응답 시간
+#   @st.cache_data(ttl=...)
+#   @disk_cache.persistent(ttl=...)
+#   @loader_stats.measure                 <- 캐시 안쪽: 실제로 불러올 때의 단계별 시간, 행 수, 크기
+#   def load_...():
+#
+# 불러오는 시간은 query(쿼리 실행), download(결과 수신 및 DataFrame 변환), normalize(나머지 전부)로 나눔
+# query/download는 backend에서 phase()로 기록
+
+# observe로 감싼 로더에서도 호출할 수 있어야 하는 캐시 계층의 메서드
+CACHE_API = ('clear', 'age', 'is_refreshing')
+
+_lock = threading.Lock()
+_stats = {}
+_local = threading.local()
+
+
+def _loader(name):
+    # _lock 안에서만 호출
+    if name not in _stats:
+        _stats[name] = {
+            'calls': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'errors': 0,
+            'call_seconds_total': 0.0,
+            'last_call_seconds': None,
+            'loads': 0,
+            'load_seconds_total': 0.0,
+            'last_load': None,
+            'last_refresh': None,
+        }
+    return _stats[name]
+
+
+def _calls():
+    # 현재 스레드에서 진행 중인 observe 호출 (중첩 호출을 위해 스택으로 관리)
+    if not hasattr(_local, 'calls'):
+        _local.calls = []
+    return _local.calls
+
+
+def current_record():
+    return getattr(_local, 'record', None)
+
+
+def bind(record, func):
+    # 다른 스레드에서 실행되는 함수도 같은 로더의 단계별 시간에 합산되도록 기록 대상을 넘겨줌
+    if record is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = current_record()
+        _local.record = record
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.record = previous
+
+    return wrapper
+
+
+def observe(func):
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        call = {'name': name, 'source': 'memory'}
+        _calls().append(call)
+        started = time.perf_counter()
+
+        try:
+            with profiler.span(name):
+                return func(*args, **kwargs)
+        except Exception:
+            call['source'] = 'error'
+            raise
+        finally:
+            _calls().pop()
+            elapsed = time.perf_counter() - started
+
+            with _lock:
+                stats = _loader(name)
+                stats['calls'] += 1
+                stats['call_seconds_total'] += elapsed
+                stats['last_call_seconds'] = round(elapsed, 4)
+                key = {'memory': 'memory_hits', 'disk': 'disk_hits', 'miss': 'misses', 'error': 'errors'}[call['source']]
+                stats[key] += 1
+
+    # functools.wraps는 메서드를 옮기지 않으므로 캐시 계층의 API(st.cache_data의 clear, swr_cache의 age 등)를 그대로 노출
+    for attr in CACHE_API:
+        if hasattr(func, attr):
+            setattr(wrapper, attr, getattr(func, attr))
+
+    return wrapper
+
+
+def _mark(name, source):
+    # 같은 스레드에서 진행 중인 observe 호출에 적중 위치를 표시 (백그라운드 갱신은 해당 없음)
+    for call in reversed(_calls()):
+        if call['name'] == name:
+            call['source'] = source
+            return
+
+
+def mark_disk_hit(name):
+    _mark(name, 'disk')
+
+
+def measure(func):
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _mark(name, 'miss')
+
+        record = {'query': 0.0, 'download': 0.0, 'rows': 0, 'bytes': 0}
+        previous = current_record()
+        _local.record = record
+        started = time.perf_counter()
+
+        try:
+            value = func(*args, **kwargs)
+        finally:
+            _local.record = previous
+
+        total = time.perf_counter() - started
+        frames = _frames(value)
+
+        load = {
+            'total_seconds': round(total, 4),
+            'query_seconds': round(record['query'], 4),
+            'download_seconds': round(record['download'], 4),
+            'normalize_seconds': round(max(0.0, total - record['query'] - record['download']), 4),
+            'rows_fetched': record['rows'],
+            'bytes_fetched': record['bytes'],
+            'rows': sum(len(frame) for frame in frames),
+            'memory_bytes': sum(int(frame.memory_usage(index=True, deep=True).sum()) for frame in frames),
+        }
+
+        with _lock:
+            stats = _loader(name)
+            stats['loads'] += 1
+            stats['load_seconds_total'] += total
+            stats['last_load'] = load
+            stats['last_refresh'] = time.time()
+
+        return value
+
+    return wrapper
+
+
+def _frames(value):
+    if isinstance(value, pd.DataFrame):
+        return [value]
+    if isinstance(value, tuple):
+        return [item for item in value if isinstance(item, pd.DataFrame)]
+    return []
+
+
+@contextmanager
+def phase(name):
+    # name: 'query' 또는 'download'
+    record = current_record()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if record is not None:
+            elapsed = time.perf_counter() - started
+            with _lock:
+                record[name] += elapsed
+
+
+def add_result(df, nbytes=None):
+    # 백엔드에서 받은 결과의 행 수와 크기 기록 (nbytes를 모르면 DataFrame 크기로 대신함)
+    record = current_record()
+    if record is None:
+        return
+
+    if nbytes is None:
+        nbytes = int(df.memory_usage(index=False, deep=True).sum())
+
+    with _lock:
+        record['rows'] += len(df)
+        record['bytes'] += int(nbytes)
+
+
+def snapshot():
+    with _lock:
+        result = {}
+        for name, stats in _stats.items():
+            stats = dict(stats)
+            hits = stats['memory_hits'] + stats['disk_hits']
+            stats['hit_ratio'] = round(hits / stats['calls'], 4) if stats['calls'] else None
+            stats['avg_call_seconds'] = round(stats['call_seconds_total'] / stats['calls'], 4) if stats['calls'] else None
+            stats['avg_load_seconds'] = round(stats['load_seconds_total'] / stats['loads'], 4) if stats['loads'] else None
+            stats['last_load'] = dict(stats['last_load']) if stats['last_load'] else None
+            result[name] = stats
+        return result
+
+
+def to_frame():
+    # 관리자 화면 표시용 (로더당 한 행)
+    rows = []
+    for name, stats in snapshot().items():
+        row = {key: value for key, value in stats.items() if key != 'last_load'}
+        row.update(stats['last_load'] or {})
+        row['last_refresh'] = pd.Timestamp(stats['last_refresh'], unit='s', tz='UTC').tz_convert('Asia/Seoul') if stats['last_refresh'] else None
+        rows.append(dict(loader=name, **row))
+
+    return pd.DataFrame(rows)
+
+
+def to_json():
+    return json.dumps(snapshot(), ensure_ascii=False, indent=2)
+
+
+def reset():
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import threading
+import statistics
+from datetime import datetime
+
+import benchmark
+
+# 여러 사용자가 동시에 app.main을 사용하는 상황을 Streamlit AppTest 세션으로 흉내 내는 부하 테스트
+#
+#   python synthetic_data.py --path .cache/loadtest/data --rows 100000
+#   python loadtest.py --data .cache/loadtest/data --sessions 1 5 10 20 --iterations 3
+#   python loadtest.py ... --compare .cache/loadtest/loadtest_<이전 실행>.json
+#
+# 세션마다 로그인 -> 메뉴 이동 -> STAT 화면의 멀티셀렉트/슬라이더/검색 조작을 반복하고,
+# 동시 세션 수별로 rerun 지연 시간 분포, 처리량, CPU 사용 시간, RSS 증가량을 기록
+# 모든 세션은 한 프로세스의 캐시를 공유하므로 Streamlit 서버 한 대와 같은 조건
+
+USERNAME = '사용자000'
+PASSWORD = 'password000'
+
+MENU = ["납품 현황", "종합쇼핑몰 납품상세 내역", "STAT", "지자체 예산서", "인포21C"]
+
+
+def rss_bytes():
+    # 현재 RSS (리눅스가 아니면 최대 RSS로 대신함)
+    try:
+        with open('/proc/self/status', 'r') as file:
+            for line in file:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _widget(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    return None
+
+
+class Session:
+    # 사용자 한 명의 브라우저 세션
+    def __init__(self, index, timeout, think_time, seed):
+        self.index = index
+        self.timeout = timeout
+        self.think_time = think_time
+        self.random = random.Random(seed + index)
+        self.latencies = []
+        self.errors = []
+        self.at = None
+
+    def _run(self, step, action):
+        started = time.perf_counter()
+        try:
+            action()
+        except Exception as e:
+            self.errors.append(f"{step}: {e}")
+            return
+        finally:
+            self.latencies.append((step, time.perf_counter() - started))
+
+        self.errors += [f"{step}: {exception.value}" for exception in self.at.exception]
+
+        if self.think_time:
+            time.sleep(self.random.uniform(0, self.think_time))
+
+    def login(self):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file('app.py', default_timeout=self.timeout)
+        self._run('open', self.at.run)
+
+        def submit():
+            self.at.text_input[0].input(USERNAME)
+            self.at.text_input[1].input(PASSWORD)
+            self.at.button[0].click().run()
+
+        self._run('login', submit)
+
+    def open_page(self, page):
+        def switch():
+            # option_menu는 컴포넌트라서 클릭 대신 위젯 key로 선택값을 지정
+            self.at.session_state['main_option'] = page
+            self.at.run()
+
+        self._run(f'menu:{page}', switch)
+
+    def interact_stat(self):
+        companies = _widget(self.at.multiselect, "업체명 선택:")
+        if companies is not None and companies.options:
+            chosen = self.random.sample(list(companies.options), min(5, len(companies.options)))
+            self._run('stat:companies', lambda: companies.set_value(chosen).run())
+
+        slider = _widget(self.at.slider, "금액 범위 선택:")
+        if slider is not None:
+            low, high = slider.value
+            self._run('stat:slider', lambda: slider.set_range(low, low + (high - low) / 2).run())
+
+        search = _widget(self.at.text_input, "납품요구건명에서 검색할 내용 입력")
+        if search is not None:
+            term = self.random.choice(['인조잔디', '체육공원', '조성', '학교'])
+            self._run('stat:search', lambda: search.input(term).run())
+
+    def scenario(self, iterations):
+        self.login()
+        for _ in range(iterations):
+            for page in self.random.sample(MENU, len(MENU)):
+                self.open_page(page)
+                if page == "STAT":
+                    self.interact_stat()
+
+
+def share_test_runtime():
+    # AppTest는 실행할 때마다 전역 Runtime을 새로 설정하고 끝나면 None으로 지우므로, 세션을 동시에 실행하면
+    # 먼저 끝난 세션이 아직 실행 중인 세션의 Runtime을 지워서 스크립트 스레드가 중단됨
+    # Runtime이 지워진 동안에는 마지막으로 설정된 Runtime을 계속 사용하도록 함 (부하 테스트 프로세스에서만 적용)
+    from streamlit.runtime.runtime import Runtime
+
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last['runtime'] = cls._instance
+            return cls._instance
+        if 'runtime' in last:
+            return last['runtime']
+        raise RuntimeError("Runtime hasn't been created!")
+
+    Runtime.instance = classmethod(instance)
+
+
+def percentiles(values):
+    if not values:
+        return {}
+    values = sorted(values)
+
+    def pick(q):
+        return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+    return {
+        'count': len(values),
+        'mean': round(statistics.mean(values), 4),
+        'p50': round(pick(0.50), 4),
+        'p90': round(pick(0.90), 4),
+        'p95': round(pick(0.95), 4),
+        'p99': round(pick(0.99), 4),
+        'max': round(values[-1], 4),
+    }
+
+
+def run_level(sessions, iterations, timeout, think_time, seed):
+    rss_before = rss_bytes()
+    cpu_before = cpu_seconds()
+    started = time.perf_counter()
+
+    workers = [Session(i, timeout, think_time, seed) for i in range(sessions)]
+    threads = [threading.Thread(target=worker.scenario, args=(iterations,), name=f'session-{i}') for i, worker in enumerate(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - started
+    latencies = [seconds for worker in workers for _, seconds in worker.latencies]
+
+    by_step = {}
+    for worker in workers:
+        for step, seconds in worker.latencies:
+            by_step.setdefault(step, []).append(seconds)
+
+    rss_after = rss_bytes()
+
+    return {
+        'sessions': sessions,
+        'elapsed_seconds': round(elapsed, 3),
+        'reruns': len(latencies),
+        'throughput': round(len(latencies) / elapsed, 3) if elapsed else None,
+        'latency': percentiles(latencies),
+        'latency_by_step': {step: percentiles(values) for step, values in sorted(by_step.items())},
+        'cpu_seconds': round(cpu_seconds() - cpu_before, 3),
+        'cpu_utilization': round((cpu_seconds() - cpu_before) / elapsed, 3) if elapsed else None,
+        'rss_before': rss_before,
+        'rss_after': rss_after,
+        'rss_growth_per_session': int((rss_after - rss_before) / sessions),
+        'errors': [error for worker in workers for error in worker.errors][:50],
+        'error_count': sum(len(worker.errors) for worker in workers),
+    }
+
+
+def compare(current, baseline):
+    # 같은 동시 세션 수끼리 p95 지연 시간과 처리량 비교
+    previous = {level['sessions']: level for level in baseline['levels']}
+
+    print(f"{'sessions':>8} {'p95':>10} {'base p95':>10} {'change':>8} {'rps':>8} {'base rps':>8}")
+    for level in current['levels']:
+        base = previous.get(level['sessions'])
+        if base is None:
+            continue
+        p95, base_p95 = level['latency'].get('p95'), base['latency'].get('p95')
+        change = f"{(p95 / base_p95 - 1) * 100:+.1f}%" if p95 and base_p95 else '-'
+        print(f"{level['sessions']:>8} {p95:>10} {base_p95:>10} {change:>8} {level['throughput']:>8} {base['throughput']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 사용자 부하 테스트")
+    parser.add_argument('--data', default=os.path.join('.cache', 'loadtest', 'data'), help="synthetic_data로 만든 로컬 미러 경로")
+    parser.add_argument('--rows', type=int, default=100000, help="--data에 미러가 없을 때 생성할 행 수")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10])
+    parser.add_argument('--iterations', type=int, default=2, help="세션마다 메뉴 전체를 도는 횟수")
+    parser.add_argument('--think-time', type=float, default=0.0, help="조작 사이 최대 대기 시간(초)")
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dtype-backend', default='numpy', choices=['numpy', 'pyarrow'])
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--compare', default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.data, 'DATA_WAREHOUSE', 'g2b_data.parquet')):
+        import synthetic_data
+        synthetic_data.write_mirror(args.data, args.rows, args.seed)
+
+    benchmark.configure(args.data, args.dtype_backend)
+    share_test_runtime()
+
+    report = {
+        'environment': benchmark.environment(),
+        'data': args.data,
+        'iterations': args.iterations,
+        'think_time': args.think_time,
+        'levels': [],
+    }
+
+    # 첫 번째 단계가 빈 캐시를 채우는 비용을 떠안지 않도록 한 세션으로 미리 한 바퀴 실행
+    Session(-1, args.timeout, 0, args.seed).scenario(1)
+
+    for sessions in args.sessions:
+        level = run_level(sessions, args.iterations, args.timeout, args.think_time, args.seed)
+        report['levels'].append(level)
+        latency = level['latency']
+        print(f"{sessions:>3} sessions: {level['reruns']} reruns, {level['throughput']} rerun/s, "
+              f"p50 {latency.get('p50')}s p95 {latency.get('p95')}s, cpu {level['cpu_utilization']}, "
+              f"rss +{level['rss_growth_per_session'] / 1024 ** 2:.1f}MB/session, errors {level['error_count']}")
+
+    output = args.output or os.path.join('.cache', 'loadtest', f"loadtest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2, default=str)
+    print(f"Saved results to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            compare(report, json.load(file))
+
+    # 오류 화면의 지연 시간은 의미가 없으므로 오류가 하나라도 있으면 실패로 종료
+    error_count = sum(level['error_count'] for level in report['levels'])
+    if error_count:
+        for error in report['levels'][-1]['errors'][:5]:
+            print(f"  {error}")
+        sys.exit(f"{error_count} errors during the load test")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,14 @@ import pandas as pd
 from datetime import datetime, timedelta
 
 import utils
+import profiler
+import search_index
 
 
 def make_clickable(val):
     return f'<a target="_blank" href="{val}">{val}</a>'
 
+@profiler.profiled()
 def news_app():
     news_df = utils.load_news_data()
 
@@ -28,7 +31,7 @@ def news_app():
     search_term = st.text_input(f'{key_column}에서 검색할 내용 입력', key='search_term')
 
     if search_term:
-        filtered_data = news_df[news_df[key_column].str.contains(search_term, case=False, na=False)]
+        filtered_data = search_index.search(news_df, key_column, search_term)
     else:
         filtered_data = news_df
 
@@ -36,7 +39,7 @@ def news_app():
     news_df['기사날짜'] = pd.to_datetime(news_df['기사날짜']).dt.strftime('%Y-%m-%d')
 
     st.data_editor(
-        filtered_data,
+        utils.to_display(filtered_data),
         column_config={
             "URL": st.column_config.LinkColumn(
                 "URL",
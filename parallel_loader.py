@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import config
+import loader_stats
+import profiler
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    # 쿼리 대기 시간이 대부분인 작업이므로 프로세스 전체에서 스레드 풀 하나를 공유
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=config.get_setting('parallel_load', 'max_workers', 8),
+                thread_name_prefix='loader',
+            )
+
+    return _executor
+
+
+@profiler.profiled()
+def load_concurrently(loaders, timeout=None, timeouts=None):
+    # loaders: 이름 -> 인자 없는 함수
+    # 모든 로더를 동시에 실행하고 (결과, 오류)를 이름별 딕셔너리로 반환
+    # 한 로더가 실패하거나 시간을 넘겨도 나머지 결과는 그대로 반환하며, 실패한 로더는 오류에만 담김
+    # 시간을 넘긴 로더는 중단되지 않고 백그라운드에서 끝까지 실행되어 캐시를 채움
+    #
+    # 풀 안에서 실행 중인 로더가 다시 load_concurrently를 호출해 기다리면 풀이 막힐 수 있으므로 중첩해서 쓰지 않음
+    if timeout is None:
+        timeout = config.get_setting('parallel_load', 'timeout', 120.0)
+    timeouts = timeouts or {}
+
+    started = time.monotonic()
+    executor = get_executor()
+    # 로더 안에서 호출된 경우 풀 스레드의 쿼리/다운로드 시간도 그 로더의 통계에 합산
+    record = loader_stats.current_record()
+    futures = {name: executor.submit(loader_stats.bind(record, loader)) for name, loader in loaders.items()}
+
+    results = {}
+    errors = {}
+    for name, future in futures.items():
+        # 로더마다 시작 시각부터 자기 제한 시간까지만 기다림
+        remaining = max(0.0, timeouts.get(name, timeout) - (time.monotonic() - started))
+        try:
+            results[name] = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            errors[name] = TimeoutError(f"{name} did not finish within {timeouts.get(name, timeout)} seconds")
+        except Exception as e:
+            errors[name] = e
+
+    for name, error in errors.items():
+        print(f"Failed to load {name}: {error}")
+
+    return results, errors
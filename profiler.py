@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+import logging
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+import pandas as pd
+
+import config
+
+# rerun 한 번 동안의 구간별 실행 시간 기록
+#
+#   with profiler.rerun():                  <- app.main 한 번 실행 (user/page 태그는 profiler.tag로 지정)
+#       with profiler.span('stat_app'):     <- 구간 (중첩 가능, @profiler.profiled()로도 사용)
+#           ...
+#           profiler.checkpoint('filters')  <- 이전 checkpoint(또는 구간 시작)부터 여기까지를 'filters'로 기록
+#
+# 끝난 rerun은 최근 목록(관리자 화면용)에 보관하고 JSON 한 줄로 회전 로그 파일에 남김
+# rerun 밖이나 다른 스레드에서 호출되면 아무것도 기록하지 않음
+
+_local = threading.local()
+_lock = threading.Lock()
+_recent = None
+_file_logger = None
+
+
+def is_enabled():
+    return config.get_setting('profiler', 'enabled', True)
+
+
+def _current():
+    return getattr(_local, 'rerun', None)
+
+
+@contextmanager
+def rerun(**tags):
+    if not is_enabled() or _current() is not None:
+        yield
+        return
+
+    state = {
+        'tags': dict(tags),
+        'started': time.time(),
+        'spans': [],
+        'stack': [],
+        'marks': [time.perf_counter()],
+    }
+    _local.rerun = state
+    started = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        # st.stop()이나 st.experimental_rerun()으로 중단된 rerun도 기록
+        _local.rerun = None
+        _finish(state, time.perf_counter() - started)
+
+
+def tag(**tags):
+    state = _current()
+    if state is not None:
+        state['tags'].update(tags)
+
+
+@contextmanager
+def span(name):
+    state = _current()
+    if state is None:
+        yield
+        return
+
+    state['stack'].append(name)
+    path = '/'.join(state['stack'])
+    state['marks'].append(time.perf_counter())
+    started = state['marks'][-1]
+
+    try:
+        yield
+    finally:
+        state['spans'].append((path, time.perf_counter() - started))
+        state['stack'].pop()
+        state['marks'].pop()
+
+
+def checkpoint(name):
+    state = _current()
+    if state is None:
+        return
+
+    now = time.perf_counter()
+    path = '/'.join(state['stack'] + [name])
+    state['spans'].append((path, now - state['marks'][-1]))
+    state['marks'][-1] = now
+
+
+def profiled(name=None):
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _finish(state, total):
+    record = {
+        'timestamp': state['started'],
+        'total_seconds': round(total, 4),
+        'spans': [{'name': path, 'seconds': round(seconds, 4)} for path, seconds in state['spans']],
+    }
+    record.update(state['tags'])
+
+    with _lock:
+        _recent_reruns().append(record)
+
+    try:
+        _get_file_logger().info(json.dumps(record, ensure_ascii=False, default=str))
+    except OSError as e:
+        print(f"Failed to write profile: {e}")
+
+
+def _recent_reruns():
+    # _lock 안에서만 호출
+    global _recent
+
+    if _recent is None:
+        _recent = deque(maxlen=config.get_setting('profiler', 'keep', 2000))
+    return _recent
+
+
+def _get_file_logger():
+    global _file_logger
+
+    with _lock:
+        if _file_logger is None:
+            path = config.get_setting('profiler', 'path', os.path.join('.cache', 'profile', 'reruns.jsonl'))
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+            handler = RotatingFileHandler(path,
+                                          maxBytes=config.get_setting('profiler', 'max_bytes', 5 * 1024 ** 2),
+                                          backupCount=config.get_setting('profiler', 'backup_count', 3),
+                                          encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+
+            logger = logging.getLogger('mido_sales.profiler')
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+
+            _file_logger = logger
+
+    return _file_logger
+
+
+def recent_reruns():
+    with _lock:
+        return list(_recent_reruns())
+
+
+def section_stats(page=None):
+    # 구간별 p50/p95 (rerun 전체는 '(rerun)' 행으로 표시)
+    rows = []
+    for record in recent_reruns():
+        if page is not None and record.get('page') != page:
+            continue
+        rows.append((record.get('page'), '(rerun)', record['total_seconds']))
+        rows.extend((record.get('page'), item['name'], item['seconds']) for item in record['spans'])
+
+    if not rows:
+        return pd.DataFrame(columns=['page', 'section', 'count', 'p50', 'p95', 'max'])
+
+    df = pd.DataFrame(rows, columns=['page', 'section', 'seconds'])
+    grouped = df.groupby(['page', 'section'], dropna=False)['seconds']
+
+    stats = pd.DataFrame({
+        'count': grouped.size(),
+        'p50': grouped.median(),
+        'p95': grouped.quantile(0.95),
+        'max': grouped.max(),
+    }).reset_index()
+
+    return stats.sort_values(by='p95', ascending=False).round(4)
+
+
+def slow_reruns(threshold=None, limit=20):
+    if threshold is None:
+        threshold = config.get_setting('profiler', 'slow_seconds', 2.0)
+
+    reruns = [record for record in recent_reruns() if record['total_seconds'] >= threshold]
+    reruns.sort(key=lambda record: record['total_seconds'], reverse=True)
+
+    return reruns[:limit]
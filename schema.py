@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import numpy as np
+import pandas as pd
+
+# 테이블별 열 타입 정의
+#   type: 'float' | 'int' | 'date' | 'string'
+#   thousands: 숫자에서 제거할 천 단위 구분자
+#   format: 날짜 형식 (pd.to_datetime의 format, 'ISO8601'이면 ISO 형식 전체 허용)
+#   output_format: 지정하면 날짜를 파싱한 뒤 해당 형식의 문자열로 저장
+#   nullable: False면 결측값도 파싱 실패로 보고
+#   compact: 메모리 절약 모드에서 'category'(반복되는 문자열) 또는 'flag'(Y/N -> bool)로 변환
+BUDGET_COLUMNS = {
+    '지역명': {'type': 'string', 'compact': 'category'},
+    '자치단체명': {'type': 'string', 'compact': 'category'},
+    '예산현액': {'type': 'float', 'thousands': ','},
+    '국비': {'type': 'float', 'thousands': ','},
+    '시도비': {'type': 'float', 'thousands': ','},
+    '시군구비': {'type': 'float', 'thousands': ','},
+    '기타': {'type': 'float', 'thousands': ','},
+    '지출액': {'type': 'float', 'thousands': ','},
+    '편성액': {'type': 'float', 'thousands': ','},
+}
+
+EDU_BUDGET_COLUMNS = {
+    '도광역시': {'type': 'string', 'compact': 'category'},
+    '시군구': {'type': 'string', 'compact': 'category'},
+    '구분': {'type': 'string', 'compact': 'category'},
+    '금액': {'type': 'float', 'thousands': ','},
+    '면적': {'type': 'float', 'thousands': ','},
+}
+
+BID_COLUMNS = {
+    '입력일': {'type': 'date', 'format': 'ISO8601', 'output_format': '%Y-%m-%d'},
+    '참가마감': {'type': 'date', 'format': 'ISO8601', 'output_format': '%Y-%m-%d'},
+    '투찰마감': {'type': 'date', 'format': 'ISO8601', 'output_format': '%Y-%m-%d'},
+    '개찰일': {'type': 'date', 'format': 'ISO8601', 'output_format': '%Y-%m-%d'},
+    '추정가격': {'type': 'float', 'thousands': ','},
+    '기초금액': {'type': 'float', 'thousands': ','},
+    '발주기관': {'type': 'string', 'compact': 'category'},
+    '업종': {'type': 'string', 'compact': 'category'},
+    '지역': {'type': 'string', 'compact': 'category'},
+    '분류': {'type': 'string', 'compact': 'category'},
+}
+
+SCHEMAS = {
+    'budget': BUDGET_COLUMNS,
+    'edu_budget': EDU_BUDGET_COLUMNS,
+    'bid': BID_COLUMNS,
+    'g2b': {
+        '납품요구접수일자': {'type': 'date', 'format': 'ISO8601', 'nullable': False},
+        '단가': {'type': 'float'},
+        '수량': {'type': 'float'},
+        '금액': {'type': 'float'},
+        '품명': {'type': 'string', 'compact': 'category'},
+        '세부품명': {'type': 'string', 'compact': 'category'},
+        '품목': {'type': 'string', 'compact': 'category'},
+        '단위': {'type': 'string', 'compact': 'category'},
+        '계약구분': {'type': 'string', 'compact': 'category'},
+        '옵션구분': {'type': 'string', 'compact': 'category'},
+        '수요기관명': {'type': 'string', 'compact': 'category'},
+        '수요기관구분': {'type': 'string', 'compact': 'category'},
+        '수요기관지역명': {'type': 'string', 'compact': 'category'},
+        '업체명': {'type': 'string', 'compact': 'category'},
+        '업체기업구분명': {'type': 'string', 'compact': 'category'},
+        '납품요구지청명': {'type': 'string', 'compact': 'category'},
+        '도광역시': {'type': 'string', 'compact': 'category'},
+        '시군구': {'type': 'string', 'compact': 'category'},
+        '우수제품여부': {'type': 'string', 'compact': 'flag'},
+        '최종납품요구여부': {'type': 'string', 'compact': 'flag'},
+        '다수공급자계약여부': {'type': 'string', 'compact': 'flag'},
+        '공사용자재직접구매대상여부': {'type': 'string', 'compact': 'flag'},
+        '중소기업자간경쟁제품여부': {'type': 'string', 'compact': 'flag'},
+    },
+    'news': {
+        '기사날짜': {'type': 'date', 'format': 'ISO8601'},
+    },
+    # 사업 현황은 문자열로 저장되고 화면에서 편집되므로 숫자 열만 변환하고 'None', 'nan' 같은 값도 결측값으로 처리
+    'list_up_budget': {column: dict(spec, null_values=['None', 'nan', '']) for column, spec in BUDGET_COLUMNS.items() if spec['type'] != 'string'},
+    'list_up_edu_budget': {column: dict(spec, null_values=['None', 'nan', '']) for column, spec in EDU_BUDGET_COLUMNS.items() if spec['type'] != 'string'},
+}
+
+# 고유값 비율이 이 값보다 높은 열은 category로 바꿔도 메모리가 줄지 않으므로 그대로 둠
+MAX_CATEGORY_RATIO = 0.5
+
+FLAG_VALUES = {'Y': True, 'N': False}
+
+_reports = {}
+_memory_reports = {}
+_reports_lock = threading.Lock()
+
+
+def coerce(df, table):
+    # 스키마에 정의된 열만 열 단위로 한 번씩 변환하고, 파싱 실패 내역을 기록
+    report = {}
+
+    for column, spec in SCHEMAS[table].items():
+        if column not in df.columns:
+            continue
+
+        values, failed = _coerce_column(df[column], spec)
+        df[column] = values
+
+        if failed.any():
+            report[column] = {
+                'failed_rows': int(failed.sum()),
+                'samples': df.index[failed.to_numpy()][:5].tolist(),
+            }
+
+    with _reports_lock:
+        _reports[table] = report
+
+    if report:
+        print(f"Failed to parse some values in {table}: {report}")
+
+    return df
+
+
+def compact(df, table, name=None):
+    # 반복되는 문자열은 category, Y/N 플래그는 bool로 변환하고 열별 메모리 변화를 name(기본값 table)으로 기록
+    report = {}
+
+    for column, spec in SCHEMAS[table].items():
+        if column not in df.columns or 'compact' not in spec:
+            continue
+
+        before = int(df[column].memory_usage(index=False, deep=True))
+
+        if spec['compact'] == 'category':
+            values = _to_category(df[column])
+        else:
+            values = _to_flag(df[column])
+
+        if values is None:
+            continue
+
+        df[column] = values
+        report[column] = {'before': before, 'after': int(values.memory_usage(index=False, deep=True))}
+
+    with _reports_lock:
+        _memory_reports[name or table] = {
+            'columns': report,
+            'before': sum(item['before'] for item in report.values()),
+            'after': sum(item['after'] for item in report.values()),
+            'total': int(df.memory_usage(index=True, deep=True).sum()),
+        }
+
+    return df
+
+
+def is_true(series):
+    # 'Y'/'N' 문자열과 compact 모드의 bool 플래그를 모두 지원
+    if pd.api.types.is_bool_dtype(series):
+        return series.fillna(False).astype(bool)
+    return series == 'Y'
+
+
+def memory_report(table=None):
+    with _reports_lock:
+        if table is None:
+            return dict(_memory_reports)
+        return _memory_reports.get(table, {})
+
+
+def last_report(table=None):
+    with _reports_lock:
+        if table is None:
+            return dict(_reports)
+        return _reports.get(table, {})
+
+
+def _coerce_column(series, spec):
+    column_type = spec['type']
+
+    if column_type == 'string':
+        return series, _null_violations(series, spec)
+
+    if column_type == 'date':
+        # 이미 날짜 타입이면 다시 파싱하지 않음
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = series
+            failed = pd.Series(False, index=series.index)
+        else:
+            values = pd.to_datetime(series, format=spec.get('format'), errors='coerce')
+            failed = values.isna() & series.notna()
+
+        failed |= _null_violations(values, spec)
+
+        if 'output_format' in spec:
+            values = values.dt.strftime(spec['output_format'])
+
+        return values, failed
+
+    # 숫자 열
+    if pd.api.types.is_numeric_dtype(series):
+        values = series
+        failed = pd.Series(False, index=series.index)
+    else:
+        text = series.astype('string')
+        if 'thousands' in spec:
+            text = text.str.replace(spec['thousands'], '', regex=False)
+        if 'null_values' in spec:
+            text = text.mask(text.isin(spec['null_values']))
+
+        values = pd.to_numeric(text, errors='coerce').astype('float64')
+        failed = values.isna() & text.notna()
+
+    if column_type == 'int' and not values.isna().any():
+        values = values.astype(np.int64)
+
+    failed |= _null_violations(values, spec)
+
+    return values, failed
+
+
+def _to_category(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return None
+
+    non_null = series.notna().sum()
+    if non_null and series.nunique() / non_null > MAX_CATEGORY_RATIO:
+        return None
+
+    return series.astype('category')
+
+
+def _to_flag(series):
+    if pd.api.types.is_bool_dtype(series):
+        return None
+
+    # Y/N 이외의 값이 섞여 있으면 원래 값을 잃지 않도록 변환하지 않음
+    if not series.dropna().isin(list(FLAG_VALUES)).all():
+        return None
+
+    if series.isna().any():
+        return series.map(FLAG_VALUES).astype('boolean')
+
+    return series == 'Y'
+
+
+def _null_violations(values, spec):
+    if spec.get('nullable', True):
+        return pd.Series(False, index=values.index)
+    return values.isna()
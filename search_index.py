@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+import itertools
+
+import numpy as np
+import pandas as pd
+
+import config
+import derived_index
+import session_memo
+
+# 검색창용 2글자(bigram) 역색인
+#
+# 캐시된 데이터(attrs['data_version'])의 열마다 한 번만 만들고, 검색어의 bigram이 모두 들어 있는 값만 후보로 골라
+# 후보에 대해서만 실제 포함 여부를 확인함. 같은 값이 반복되는 열이 많으므로 색인은 고유값 단위로 만들고 행으로 펼침
+#
+# 검색어를 공백으로 나누면 모든 단어를 포함하는 행만 찾음 (AND)
+# 새 검색어가 이전 검색어를 포함하면(예: '인조' -> '인조잔디') 이전 결과 안에서만 찾음
+# (st.text_input은 입력을 마쳤을 때만 rerun하므로 검색어마다 바로 결과를 계산하고 디바운스하지 않음)
+# 정규식 문자가 들어 있는 검색어, 버전이 없는 데이터, 문자열이 아닌 열은 기존처럼 str.contains로 처리
+
+REGEX_CHARS = set('.^$*+?{}[]\\|()')
+
+
+_tokens = itertools.count(1)
+
+
+class SubstringIndex:
+    def __init__(self, series):
+        # 세션 메모에는 색인 객체 대신 이 번호를 저장 (메모가 이전 색인을 붙잡고 있지 않도록)
+        self.token = next(_tokens)
+        self.index = series.index
+        self.codes, uniques = pd.factorize(series)
+
+        # 대소문자 구분 없이 검색하므로 소문자로 색인
+        self.values = np.array([str(value).lower() for value in uniques], dtype=object)
+
+        postings = {}
+        for value_id, text in enumerate(self.values):
+            for gram in {text[i:i + 2] for i in range(len(text) - 1)}:
+                postings.setdefault(gram, []).append(value_id)
+
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def match_values(self, terms, within=None):
+        # 모든 검색어를 포함하는 고유값 번호 (within: 이 고유값들 안에서만 찾음)
+        matched = within
+
+        for term in terms:
+            term = term.lower()
+            grams = {term[i:i + 2] for i in range(len(term) - 1)}
+
+            if within is not None:
+                # 이전 결과 안에서 좁히는 경우에는 후보를 직접 확인
+                candidates = matched
+            elif grams:
+                lists = [self.postings.get(gram) for gram in grams]
+                if any(ids is None for ids in lists):
+                    return np.array([], dtype=np.int32)
+
+                # 짧은 목록부터 교집합
+                lists.sort(key=len)
+                candidates = lists[0]
+                for ids in lists[1:]:
+                    candidates = np.intersect1d(candidates, ids, assume_unique=True)
+                    if not len(candidates):
+                        return candidates
+            else:
+                # 한 글자 검색어는 bigram이 없으므로 고유값 전체가 후보
+                candidates = np.arange(len(self.values), dtype=np.int32)
+
+            if matched is not None and within is None:
+                candidates = np.intersect1d(candidates, matched, assume_unique=True)
+
+            # bigram이 모두 있어도 순서가 다를 수 있으므로 후보만 실제로 확인
+            found = pd.Series(self.values[candidates], dtype=object).str.contains(term, regex=False).to_numpy()
+            matched = candidates[found]
+
+            if not len(matched):
+                break
+
+        return matched
+
+    def row_mask(self, value_ids):
+        hits = np.zeros(len(self.values) + 1, dtype=bool)  # 마지막 칸은 결측값(-1 코드)용
+        hits[value_ids] = True
+        return hits[self.codes]
+
+    def positions(self, df):
+        # df의 각 행이 색인을 만든 원본 데이터의 몇 번째 행인지 (원본에 없는 행이 있으면 None)
+        if len(df) == len(self.index) and df.index.equals(self.index):
+            return slice(None)
+
+        positions = self.index.get_indexer(df.index)
+        if (positions < 0).any():
+            return None
+        return positions
+
+
+def _searchable(series):
+    return (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+            or isinstance(series.dtype, pd.CategoricalDtype))
+
+
+def _build(column):
+    def build(base):
+        # 고유값이 너무 많은 열은 색인하지 않고 기존 방식으로 검색 (None을 기록해서 매번 다시 세지 않음)
+        if base[column].nunique() > config.get_setting('search_index', 'max_unique', 2000000):
+            return None
+        return SubstringIndex(base[column])
+
+    return build
+
+
+def get_index(base, column):
+    if column not in base.columns or not _searchable(base[column]) or not base.index.is_unique:
+        return None
+
+    return derived_index.get(base, f'search:{column}', _build(column))
+
+
+def _terms(query):
+    return [term for term in str(query).split() if term]
+
+
+def _scan(df, column, terms):
+    mask = pd.Series(True, index=df.index)
+    for term in terms:
+        mask &= df[column].str.contains(term, case=False, na=False)
+    return mask.to_numpy()
+
+
+def _match(index, base, column, terms):
+    # 세션별로 열마다 마지막 검색 결과(고유값 번호)를 기억해 두고, 새 검색어가 이전 검색어를 포함하면 그 안에서만 찾음
+    memo = session_memo.get_memo()
+    if memo is None:
+        return index.match_values(terms)
+
+    version = base.attrs['data_version']
+    memo.use_version(version)
+
+    key = (version, ('search', column), 'last')
+    query = ' '.join(terms).lower()
+    last = memo.get(key)
+
+    within = None
+    if last is not None and last['token'] == index.token:
+        if last['query'] == query:
+            return last['values']
+        if last['query'] in query:
+            within = last['values']
+
+    values = index.match_values(terms, within)
+    memo.put(key, {'token': index.token, 'query': query, 'values': values})
+
+    return values
+
+
+def mask(df, column, query, base=None):
+    # df[column]이 검색어의 모든 단어를 포함하는 행 (base: df가 잘려 나온 캐시 데이터 전체, 생략하면 df)
+    terms = _terms(query)
+    if not terms:
+        return np.ones(len(df), dtype=bool)
+
+    base = df if base is None else base
+
+    if not any(char in REGEX_CHARS for term in terms for char in term):
+        index = get_index(base, column)
+        if index is not None:
+            positions = index.positions(df)
+            if positions is not None:
+                return index.row_mask(_match(index, base, column, terms))[positions]
+
+    return _scan(df, column, terms)
+
+
+def search(df, column, query, base=None):
+    return df[mask(df, column, query, base)]
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import config
+
+# 세션별 필터/집계 결과 메모 (바이트 기준 LRU)
+#
+# 키는 (데이터 버전, 정규화한 필터 상태, 이름)이고, 필터를 거친 행 집합(비트맵)과 집계 결과를 저장함
+# 라디오/체크박스를 바꿨다가 되돌리거나 슬라이더를 이전 위치로 옮기면 다시 계산하지 않고 메모에서 꺼냄
+# 같은 데이터의 새 버전을 쓰기 시작하면 이전 버전 항목은 모두 버림
+#
+# 세션마다 하나씩 st.session_state에 두므로 세션이 끝나면 함께 사라짐
+
+SESSION_KEY = '_session_memo'
+
+
+def _sizeof(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def normalize(value):
+    # 위젯 값을 키로 쓸 수 있게 변환 (멀티셀렉트 목록은 선택 순서와 무관하게 정렬)
+    if isinstance(value, (list, set, frozenset, np.ndarray, pd.Index)):
+        return tuple(sorted((normalize(item) for item in value), key=repr))
+    if isinstance(value, tuple):
+        return tuple(normalize(item) for item in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+class SessionMemo:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, 키와 값의 nbytes)
+        self._versions = {}            # 데이터 이름 -> 마지막으로 사용한 버전
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def use_version(self, version):
+        # 같은 데이터의 버전이 바뀌면(새로 고침) 이전 버전 항목을 버림
+        namespace = version.split(':', 1)[0]
+
+        with self._lock:
+            previous = self._versions.get(namespace)
+            if previous == version:
+                return
+
+            self._versions[namespace] = version
+            if previous is not None:
+                for key in [key for key in self._entries if key[0] == previous]:
+                    self.bytes -= self._entries.pop(key)[1]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        # 키에도 정규화한 필터 상태(선택한 업체명 목록 등)가 들어 있으므로 값과 함께 크기에 포함
+        nbytes = _sizeof(key) + _sizeof(value)
+        if nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (value, nbytes)
+            self.bytes += nbytes
+
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.bytes = 0
+
+    def snapshot(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+def get_memo():
+    # 현재 세션의 메모 (세션 밖에서 호출되면 None)
+    try:
+        if SESSION_KEY not in st.session_state:
+            st.session_state[SESSION_KEY] = SessionMemo(config.get_setting('session_memo', 'max_bytes', 32 * 1024 ** 2))
+        return st.session_state[SESSION_KEY]
+    except Exception:
+        return None
@@ -6,9 +6,28 @@ import pandas as pd
 import plotly.express as px
 
 import utils
-
+import profiler
+import schema
+import search_index
+import filter_plan
+import session_memo
+
+def summarize(frame):
+    # KPI에 쓰는 평균/합계/건수
+    columns = ['단가', '수량', '금액']
+    return {
+        'mean': frame[columns].mean().to_dict(),
+        'sum': frame[columns].sum().to_dict(),
+        'count': int(frame['단가'].count()),
+    }
+
+def receipt_years(frame):
+    return pd.to_datetime(frame['납품요구접수일자'], errors='coerce').dt.year.astype('Int64')
+
+@profiler.profiled()
 def stat_app():
     g2b_data = utils.load_g2b_data()
+    profiler.checkpoint('load')
 
     # CSS 스타일링
     st.markdown("""
@@ -24,51 +43,48 @@ def stat_app():
     """, unsafe_allow_html=True)
 
     st.header("종합쇼핑몰 납품요구 상세내역 통계")
+    utils.show_data_age(utils.load_g2b_data)
     st.markdown("---")
 
+    # 위젯 조건은 하나의 마스크로 모으고 마지막에 한 번만 잘라냄
+    # 이전에 고른 조건으로 돌아가면 세션 메모에 저장된 마스크와 집계 결과를 재사용
+    plan = filter_plan.FilterPlan(g2b_data, memo=session_memo.get_memo())
+    overall = plan.cached('summary', lambda: summarize(g2b_data))
+
     # 체크박스: 우수제품여부
     excellent_products = st.checkbox("우수제품여부", value=False)
 
     if excellent_products:
-        filtered_data = g2b_data[g2b_data['우수제품여부'] == 'Y']
-    else:
-        filtered_data = g2b_data
+        plan.where(lambda: schema.is_true(g2b_data['우수제품여부']), key=('우수제품여부',))
 
     col1, space, col2 = st.columns([5, 0.1, 1])
 
     with col1:
         # 멀티셀렉트: 업체명
-        unique_companies = sorted(filtered_data['업체명'].unique())
+        unique_companies = plan.options('업체명')
         selected_companies = st.multiselect("업체명 선택:", unique_companies, default=unique_companies)
 
         if selected_companies:
-            filtered_data = filtered_data[filtered_data['업체명'].isin(selected_companies)]
-
-        else:
-            filtered_data = filtered_data
+            plan.select('업체명', selected_companies)
 
         # 멀티셀렉트: 지역명
-        unique_regions = sorted(filtered_data['도광역시'].unique())
+        unique_regions = plan.options('도광역시')
         selected_regions = st.multiselect("지역 선택:", unique_regions, default=unique_regions)
 
         if selected_companies:
-            filtered_data = filtered_data[filtered_data['도광역시'].isin(selected_regions)]
-
-        else:
-            filtered_data = filtered_data
+            plan.select('도광역시', selected_regions)
 
         date_col1, date_col2, date_col3 = st.columns([5, 1, 1])
 
         with date_col1:
-            # 멀티셀렉트: 연도
-            unique_years = pd.to_datetime(filtered_data['납품요구접수일자'], errors='coerce').dt.year.dropna().unique()
+            # 멀티셀렉트: 연도 (연도 패싯은 데이터 버전마다 한 번만 계산)
+            unique_years = plan.options('연도', values=receipt_years)
             selected_years = st.multiselect("연도 선택:", unique_years, default=unique_years)
 
             if selected_years:
-                filtered_data = filtered_data[pd.to_datetime(filtered_data['납품요구접수일자'], errors='coerce').dt.year.isin(selected_years)]
+                plan.select('연도', selected_years, values=receipt_years)
 
-            min_date = pd.to_datetime(filtered_data['납품요구접수일자'].min(), errors='coerce')
-            max_date = pd.to_datetime(filtered_data['납품요구접수일자'].max(), errors='coerce')
+            min_date, max_date = plan.date_bounds('납품요구접수일자')
 
         with date_col2:
             # 캘린더: 세부 기간
@@ -83,96 +99,90 @@ def stat_app():
             pass
 
         if start_date and end_date:
-            filtered_data = filtered_data[
-                (pd.to_datetime(filtered_data['납품요구접수일자'], errors='coerce') >= pd.to_datetime(start_date)) &
-                (pd.to_datetime(filtered_data['납품요구접수일자'], errors='coerce') <= pd.to_datetime(end_date))
-            ]
+            plan.date_between('납품요구접수일자', start_date, end_date)
 
     with col2:
         # 슬라이더 추가: 단가, 수량, 금액
-        if not filtered_data.empty:
-            min_price = float(filtered_data['단가'].min()) if not filtered_data['단가'].isna().all() else 0.0
-            max_price = float(filtered_data['단가'].max()) if not filtered_data['단가'].isna().all() else 0.0
-            price_range = (min_price, max_price) if min_price < max_price else (0.0, max_price)
-
-            min_quantity = float(filtered_data['수량'].min()) if not filtered_data['수량'].isna().all() else 0.0
-            max_quantity = float(filtered_data['수량'].max()) if not filtered_data['수량'].isna().all() else 0.0
-            quantity_range = (min_quantity, max_quantity) if min_quantity < max_quantity else (0.0, max_quantity)
-
-            min_amount = float(filtered_data['금액'].min()) if not filtered_data['금액'].isna().all() else 0.0
-            max_amount = float(filtered_data['금액'].max()) if not filtered_data['금액'].isna().all() else 0.0
-            amount_range = (min_amount, max_amount) if min_amount < max_amount else (0.0, max_amount)
+        if plan.count():
+            min_price, max_price, price_range = plan.cached(('slider_range', '단가'), lambda: filter_plan.slider_range(plan.column('단가')))
+            min_quantity, max_quantity, quantity_range = plan.cached(('slider_range', '수량'), lambda: filter_plan.slider_range(plan.column('수량')))
+            min_amount, max_amount, amount_range = plan.cached(('slider_range', '금액'), lambda: filter_plan.slider_range(plan.column('금액')))
 
             min_price, max_price = st.slider("단가 범위 선택:", min_price, max_price, price_range)
             min_quantity, max_quantity = st.slider("수량 범위 선택:", min_quantity, max_quantity, quantity_range)
             min_amount, max_amount = st.slider("금액 범위 선택:", min_amount, max_amount, amount_range)
 
-            filtered_data = filtered_data[
-                (filtered_data['단가'] >= min_price) & (filtered_data['단가'] <= max_price) &
-                (filtered_data['수량'] >= min_quantity) & (filtered_data['수량'] <= max_quantity) &
-                (filtered_data['금액'] >= min_amount) & (filtered_data['금액'] <= max_amount)
-            ]
-        else:
-            pass
+            plan.between('단가', min_price, max_price)
+            plan.between('수량', min_quantity, max_quantity)
+            plan.between('금액', min_amount, max_amount)
+
+    # 조건을 모두 적용한 결과를 한 번만 만듦 (조건이 없으면 캐시된 원본이므로 수정하지 않음)
+    filtered_data = plan.result()
+
+    profiler.checkpoint('filters')
 
     st.markdown("---")
 
     kpi1, kpi2, kpi3 = st.columns(3)
 
     if not filtered_data.empty:
-        avg_price = filtered_data['단가'].mean()
-        avg_quantity = filtered_data['수량'].mean()
-        avg_amount = filtered_data['금액'].mean()
+        summary = plan.cached('summary', lambda: summarize(filtered_data))
+
+        avg_price = summary['mean']['단가']
+        avg_quantity = summary['mean']['수량']
+        avg_amount = summary['mean']['금액']
 
         kpi1.metric(
             label="단가 평균",
             value=f"₩{round(avg_price, 2):,}" if not pd.isna(avg_price) else "데이터 없음",
-            delta=f"₩{round(g2b_data['단가'].mean(), 2):,}" if not pd.isna(g2b_data['단가'].mean()) else "데이터 없음",
-            delta_color="inverse" if avg_price < g2b_data['단가'].mean() else "normal"
+            delta=f"₩{round(overall['mean']['단가'], 2):,}" if not pd.isna(overall['mean']['단가']) else "데이터 없음",
+            delta_color="inverse" if avg_price < overall['mean']['단가'] else "normal"
         )
 
         kpi2.metric(
             label="수량 평균(m²)",
             value=f"{round(avg_quantity, 2):,}" if not pd.isna(avg_quantity) else "데이터 없음",
-            delta=f"{round(g2b_data['수량'].mean(), 2):,}" if not pd.isna(g2b_data['수량'].mean()) else "데이터 없음",
-            delta_color="inverse" if avg_quantity < g2b_data['수량'].mean() else "normal"
+            delta=f"{round(overall['mean']['수량'], 2):,}" if not pd.isna(overall['mean']['수량']) else "데이터 없음",
+            delta_color="inverse" if avg_quantity < overall['mean']['수량'] else "normal"
         )
 
         kpi3.metric(
             label="금액 평균",
             value=f"₩{round(avg_amount, 2):,}" if not pd.isna(avg_amount) else "데이터 없음",
-            delta=f"₩{round(g2b_data['금액'].mean(), 2):,}" if not pd.isna(g2b_data['금액'].mean()) else "데이터 없음",
-            delta_color="inverse" if avg_amount < g2b_data['금액'].mean() else "normal"
+            delta=f"₩{round(overall['mean']['금액'], 2):,}" if not pd.isna(overall['mean']['금액']) else "데이터 없음",
+            delta_color="inverse" if avg_amount < overall['mean']['금액'] else "normal"
         )
 
         kpi4, kpi5, kpi6 = st.columns(3)
 
         kpi4.metric(
             label="거래 건",
-            value=f"{filtered_data['단가'].count():,}",
-            delta=f"{g2b_data['단가'].count():,}",
-            delta_color="inverse" if filtered_data['단가'].count() < g2b_data['단가'].count() else "normal"
+            value=f"{summary['count']:,}",
+            delta=f"{overall['count']:,}",
+            delta_color="inverse" if summary['count'] < overall['count'] else "normal"
         )
 
         kpi5.metric(
             label="수량 합 (m²)",
-            value=f"{round(filtered_data['수량'].sum(), 2):,}" if not pd.isna(filtered_data['수량'].sum()) else "데이터 없음",
-            delta=f"{round(g2b_data['수량'].sum(), 2):,}" if not pd.isna(g2b_data['수량'].sum()) else "데이터 없음",
-            delta_color="inverse" if filtered_data['수량'].sum() < g2b_data['수량'].sum() else "normal"
+            value=f"{round(summary['sum']['수량'], 2):,}" if not pd.isna(summary['sum']['수량']) else "데이터 없음",
+            delta=f"{round(overall['sum']['수량'], 2):,}" if not pd.isna(overall['sum']['수량']) else "데이터 없음",
+            delta_color="inverse" if summary['sum']['수량'] < overall['sum']['수량'] else "normal"
         )
 
         kpi6.metric(
             label="금액 합",
-            value=f"₩{round(filtered_data['금액'].sum(), 2):,}" if not pd.isna(filtered_data['금액'].sum()) else "데이터 없음",
-            delta=f"₩{round(g2b_data['금액'].sum(), 2):,}" if not pd.isna(g2b_data['금액'].sum()) else "데이터 없음",
-            delta_color="inverse" if filtered_data['금액'].sum() < g2b_data['금액'].sum() else "normal"
+            value=f"₩{round(summary['sum']['금액'], 2):,}" if not pd.isna(summary['sum']['금액']) else "데이터 없음",
+            delta=f"₩{round(overall['sum']['금액'], 2):,}" if not pd.isna(overall['sum']['금액']) else "데이터 없음",
+            delta_color="inverse" if summary['sum']['금액'] < overall['sum']['금액'] else "normal"
         )
 
+    profiler.checkpoint('kpi')
+
     st.markdown("---")
 
     # 색상 팔레트 정의
     color_map = px.colors.qualitative.Plotly
-    unique_companies = filtered_data['업체명'].unique()
+    unique_companies = plan.cached('companies', lambda: filtered_data['업체명'].unique())
     color_discrete_map = {company: color_map[i % len(color_map)] for i, company in enumerate(unique_companies)}
 
     col3, space, col4, space = st.columns([1, 0.1, 1, 5])
@@ -183,7 +193,7 @@ def stat_app():
 
     with col4:
         # 상위 N개 선택
-        unique_companies_count = len(filtered_data['업체명'].unique())
+        unique_companies_count = len(unique_companies)
         if unique_companies_count > 1:
             top_n = st.sidebar.slider(
                 "상위 N개 업체 선택",
@@ -204,7 +214,7 @@ def stat_app():
 
         if metric_to_plot == "단가":
             # 평균 단가 계산
-            avg_price = filtered_data.groupby("업체명")["단가"].mean().reset_index()
+            avg_price = plan.cached(('by_company', '단가'), lambda: filtered_data.groupby("업체명", observed=True)["단가"].mean().reset_index())
             # 상위 N개 선택
             top_avg_price = avg_price.nlargest(top_n, '단가')
             fig = px.bar(top_avg_price, x="업체명", y="단가", title=f"상위 {top_n} 업체별 평균 단가 차트", color='업체명',
@@ -212,7 +222,7 @@ def stat_app():
             fig.update_layout(yaxis_title="단가 (원)")
         elif metric_to_plot == "수량":
             # 수량 합계 계산
-            total_quantity = filtered_data.groupby("업체명")["수량"].sum().reset_index()
+            total_quantity = plan.cached(('by_company', '수량'), lambda: filtered_data.groupby("업체명", observed=True)["수량"].sum().reset_index())
             # 상위 N개 선택
             top_total_quantity = total_quantity.nlargest(top_n, '수량')
             fig = px.bar(top_total_quantity, x="업체명", y="수량", title=f"상위 {top_n} 업체별 수량 차트", color='업체명',
@@ -220,7 +230,7 @@ def stat_app():
             fig.update_layout(yaxis_title="수량")
         else:
             # 금액 합계 계산
-            total_amount = filtered_data.groupby("업체명")["금액"].sum().reset_index()
+            total_amount = plan.cached(('by_company', '금액'), lambda: filtered_data.groupby("업체명", observed=True)["금액"].sum().reset_index())
             # 상위 N개 선택
             top_total_amount = total_amount.nlargest(top_n, '금액')
             fig = px.bar(top_total_amount, x="업체명", y="금액", title=f"상위 {top_n} 업체별 금액 차트", color='업체명',
@@ -232,6 +242,8 @@ def stat_app():
 
         st.write(fig)
 
+    profiler.checkpoint('bar_chart')
+
     # 지도에 사용할 데이터도 상위 N개의 회사로 제한
     top_companies = top_avg_price if metric_to_plot == "단가" else top_total_quantity if metric_to_plot == "수량" else top_total_amount
     top_company_names = top_companies['업체명'].tolist()
@@ -278,14 +290,18 @@ def stat_app():
         else:
             st.error("위도와 경도 데이터가 필요합니다. 데이터를 확인하세요.")
 
-    st.markdown("---")
+    profiler.checkpoint('map')
 
-    filtered_data['납품요구접수일자'] = pd.to_datetime(filtered_data['납품요구접수일자']).dt.strftime('%Y-%m-%d')
+    st.markdown("---")
 
     view_columns = [
         '납품요구접수일자', '수요기관명', '납품요구건명', '단가', '단위', '수량', '금액', '품목', '업체명'
     ]
 
+    # 표에 필요한 열만 복사해서 날짜를 문자열로 바꿈
+    table_data = filtered_data[view_columns].copy()
+    table_data['납품요구접수일자'] = pd.to_datetime(table_data['납품요구접수일자']).dt.strftime('%Y-%m-%d')
+
     key_column = st.selectbox(
         '필터링할 열 선택',
         ['납품요구접수일자', '수요기관명', '납품요구건명', '업체명'],
@@ -295,10 +311,12 @@ def stat_app():
     search_term = st.text_input(f'{key_column}에서 검색할 내용 입력', key='search_term')
 
     if search_term:
-        filtered_data = filtered_data[filtered_data[key_column].str.contains(search_term, case=False, na=False)]
+        # 색인은 캐시된 전체 이력 기준으로 한 번만 만들고 재사용
+        table_data = search_index.search(table_data, key_column, search_term, base=g2b_data)
 
     # 데이터프레임 출력
     st.dataframe(
-        filtered_data[view_columns].sort_values(by='납품요구접수일자', ascending=False),
+        utils.to_display(table_data.sort_values(by='납품요구접수일자', ascending=False)),
         hide_index=True
-    )
\ No newline at end of file
+    )
+    profiler.checkpoint('table')
\ No newline at end of file
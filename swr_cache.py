@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import time
+import functools
+import threading
+
+import pandas as pd
+
+
+class _Entry:
+    def __init__(self, value, loaded_at):
+        self.value = value
+        self.loaded_at = loaded_at
+
+
+class StaleWhileRevalidate:
+    # 만료된 값도 계속 반환하면서 키마다 백그라운드 갱신을 하나만 실행하고, 끝나면 새 값으로 교체
+    # 값이 아직 없을 때만 호출한 스레드에서 불러오며, 같은 키를 동시에 요청한 스레드는 그 결과를 함께 기다림
+
+    def __init__(self, func, ttl, copy=False):
+        self.func = func
+        self.ttl = ttl
+        self.copy = copy  # True면 st.cache_data처럼 호출할 때마다 DataFrame 복사본을 반환
+
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._inflight = {}  # 키 -> 불러오기가 끝나면 set되는 Event
+
+    def __call__(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                inflight = self._inflight.get(key)
+
+                if entry is not None:
+                    if inflight is None and time.time() - entry.loaded_at >= self.ttl:
+                        self._inflight[key] = threading.Event()
+                        threading.Thread(target=self._refresh, args=(key, args, kwargs),
+                                         name=f'swr-{self.func.__name__}', daemon=True).start()
+                    return self._output(entry.value)
+
+                if inflight is None:
+                    inflight = self._inflight[key] = threading.Event()
+                    owner = True
+                else:
+                    owner = False
+
+            if owner:
+                try:
+                    self._load(key, args, kwargs)
+                finally:
+                    self._finish(key)
+            else:
+                # 다른 스레드의 첫 불러오기가 끝나면 다시 확인 (실패했으면 이 스레드가 다시 시도)
+                inflight.wait()
+
+    def _load(self, key, args, kwargs):
+        value = self.func(*args, **kwargs)
+
+        # 새 값이 준비된 뒤에 한 번에 교체하므로 읽는 쪽은 이전 값이나 새 값 중 하나만 봄
+        with self._lock:
+            self._entries[key] = _Entry(value, time.time())
+
+    def _refresh(self, key, args, kwargs):
+        try:
+            self._load(key, args, kwargs)
+        except Exception as e:
+            # 갱신에 실패하면 이전 값을 계속 사용하고, 다음 호출에서 다시 시도
+            print(f"Failed to refresh {self.func.__name__}: {e}")
+        finally:
+            self._finish(key)
+
+    def _finish(self, key):
+        with self._lock:
+            event = self._inflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def _output(self, value):
+        if not self.copy:
+            return value
+        if isinstance(value, pd.DataFrame):
+            return value.copy()
+        if isinstance(value, tuple):
+            return tuple(item.copy() if isinstance(item, pd.DataFrame) else item for item in value)
+        return value
+
+    def age(self, *args, **kwargs):
+        # 현재 반환 중인 값이 불러와진 뒤 지난 시간(초), 아직 없으면 None
+        with self._lock:
+            entry = self._entries.get((args, tuple(sorted(kwargs.items()))))
+        return None if entry is None else time.time() - entry.loaded_at
+
+    def is_refreshing(self, *args, **kwargs):
+        with self._lock:
+            return (args, tuple(sorted(kwargs.items()))) in self._inflight
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def stale_while_revalidate(ttl, copy=False):
+    def decorator(func):
+        cache = StaleWhileRevalidate(func, ttl, copy=copy)
+        return functools.update_wrapper(cache, func)
+
+    return decorator
+
+
+def format_age(seconds):
+    if seconds is None:
+        return None
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return "방금 업데이트됨"
+    if minutes < 60:
+        return f"{minutes}분 전 업데이트"
+    return f"{minutes // 60}시간 {minutes % 60}분 전 업데이트"
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import config
+import backend
+import geocoder
+
+# 성능 측정용 가상 데이터
+# 운영 테이블과 같은 열 이름/형식(문자열 날짜, 천 단위 구분자가 있는 금액 등)으로 만들어 로컬 미러에 저장하면
+# data_backend.type = 'local'로 BigQuery 없이 앱과 벤치마크를 실행할 수 있음
+
+PRODUCTS = ['인조잔디', '탄성포장재', '고무칩', '체육시설바닥재', '조경석', '보도블록', '투수블록', '목재데크', '방음벽', '놀이시설']
+UNITS = ['m²', '개', '식', 'm', 'EA']
+CONTRACT_TYPES = ['제3자단가계약', '총액계약', '다수공급자계약']
+OPTION_TYPES = ['본품', '옵션']
+AGENCY_TYPES = ['지방자치단체', '교육기관', '공기업', '국가기관']
+AGENCY_SUFFIXES = ['청', ' 교육지원청', ' 시설관리공단', ' 체육회']
+COMPANY_TYPES = ['중소기업', '중견기업', '대기업']
+BRANCHES = ['서울지방조달청', '경기지방조달청', '부산지방조달청', '대구지방조달청', '광주지방조달청', '대전지방조달청']
+OUR_COMPANIES = ['미도플러스', '에코그라운드']
+BUDGET_WORDS = ['체육공원', '인조잔디', '운동장', '조성', '정비', '보수', '학교', '공원', '산책로', '어린이놀이터', '생활체육', '시설']
+EDU_TYPES = ['운동장', '체육관', '놀이시설', '교실']
+BID_FIELDS = ['토목', '조경', '건축', '전기', '기계', '체육시설']
+BID_CATEGORIES = ['일반', '긴급', '재공고', '협상']
+NEWS_WORDS = ['인조잔디', '예산', '추경', '체육시설', '학교', '조성', '교체', '지자체', '공사', '계획']
+
+_SYLLABLES = list('가나다라마바사아자차카타파하한대동서남북신성우주현')
+
+
+def _rng(seed):
+    return np.random.default_rng(seed)
+
+
+def _regions():
+    # region.json의 "도광역시/시군구"를 "도광역시 시군구"로 바꾸고, 일부는 변경 전 명칭으로 남김
+    names = [key.replace('/', ' ').strip() for key in geocoder.load_region_table()]
+    for old_name, new_name in geocoder.REGION_ALIASES.items():
+        names += [name.replace(new_name, old_name) for name in names if name.startswith(new_name)]
+    return np.array(names, dtype=object)
+
+
+def _companies(rng, size=300):
+    names = {''.join(rng.choice(_SYLLABLES, 3)) + suffix for suffix in rng.choice(['(주)', '산업', '건설', '스포츠', '조경'], size)}
+    return np.array(OUR_COMPANIES + sorted(names), dtype=object)
+
+
+def _pick(rng, values, rows, weights=None):
+    values = np.asarray(values, dtype=object)
+    return values.take(rng.choice(len(values), rows, p=weights))
+
+
+def _dates(rng, rows, days, end=None):
+    end = pd.Timestamp(end or datetime.now().date())
+    return end - pd.to_timedelta(rng.integers(0, days, rows), unit='D')
+
+
+def _with_thousands(values):
+    # 원본 테이블처럼 천 단위 구분자가 있는 문자열로 저장
+    return pd.Series(values).map('{:,.0f}'.format).to_numpy(dtype=object)
+
+
+def _phrases(rng, words, rows, length=3):
+    parts = [_pick(rng, words, rows) for _ in range(length)]
+    return pd.Series(parts[0]).str.cat([pd.Series(part) for part in parts[1:]], sep=' ').to_numpy(dtype=object)
+
+
+def generate_g2b(rows, seed=0, years=5):
+    rng = _rng(seed)
+    regions = _regions()
+    companies = _companies(rng)
+
+    # 자사 업체가 전체의 약 10%가 되도록 가중치 부여
+    company_weights = np.full(len(companies), 0.9 / (len(companies) - len(OUR_COMPANIES)))
+    company_weights[:len(OUR_COMPANIES)] = 0.1 / len(OUR_COMPANIES)
+
+    region_names = _pick(rng, regions, rows)
+    product = _pick(rng, PRODUCTS, rows)
+    price = np.round(rng.lognormal(10, 1.2, rows), -1)
+    quantity = np.round(rng.lognormal(4, 1.5, rows), 2)
+    received = _dates(rng, rows, 365 * years)
+
+    return pd.DataFrame({
+        '납품요구번호': pd.Series(rng.integers(10 ** 9, 10 ** 10, rows)).map('R{}'.format).to_numpy(dtype=object),
+        '납품요구변경차수': rng.choice([0, 0, 0, 1, 2], rows),
+        '납품요구접수일자': received.strftime('%Y-%m-%d'),
+        '물품순번': rng.integers(1, 6, rows),
+        '물품분류번호': _pick(rng, [f"{code:08d}" for code in range(30101500, 30101510)], rows),
+        '품명': product,
+        '세부물품분류번호': _pick(rng, [f"{code:10d}" for code in range(3010150101, 3010150121)], rows),
+        '세부품명': product + ' ' + _pick(rng, ['A형', 'B형', 'C형', '특수형'], rows),
+        '물품식별번호': rng.integers(10 ** 7, 10 ** 8, rows).astype(str).astype(object),
+        '품목': product + ', ' + _pick(rng, ['KS인증', '우수조달', '일반'], rows),
+        '단가': price,
+        '단위': _pick(rng, UNITS, rows),
+        '수량': quantity,
+        '금액': np.round(price * quantity, 0),
+        '납품기한일자': (received + pd.to_timedelta(rng.integers(10, 90, rows), unit='D')).strftime('%Y-%m-%d'),
+        '계약구분': _pick(rng, CONTRACT_TYPES, rows),
+        '우수제품여부': _pick(rng, ['Y', 'N'], rows, [0.3, 0.7]),
+        '옵션구분': _pick(rng, OPTION_TYPES, rows, [0.8, 0.2]),
+        '수요기관코드': rng.integers(10 ** 6, 10 ** 7, rows).astype(str).astype(object),
+        '수요기관명': region_names + _pick(rng, AGENCY_SUFFIXES, rows),
+        '수요기관구분': _pick(rng, AGENCY_TYPES, rows),
+        '수요기관지역명': region_names,
+        '업체명': _pick(rng, companies, rows, company_weights),
+        '최종납품요구여부': _pick(rng, ['Y', 'N'], rows, [0.9, 0.1]),
+        '증감납품요구수량': np.zeros(rows),
+        '증감납품요구금액': np.zeros(rows),
+        '업체사업자등록번호': rng.integers(10 ** 9, 10 ** 10, rows).astype(str).astype(object),
+        '납품요구건명': region_names + ' ' + _phrases(rng, BUDGET_WORDS, rows, 2) + ' ' + product + ' 구매',
+        '계약번호': pd.Series(rng.integers(10 ** 9, 10 ** 10, rows)).map('C{}'.format).to_numpy(dtype=object),
+        '계약변경차수': rng.integers(0, 3, rows),
+        '다수공급자계약여부': _pick(rng, ['Y', 'N'], rows),
+        '공사용자재직접구매대상여부': _pick(rng, ['Y', 'N'], rows, [0.2, 0.8]),
+        '최초납품요구접수일자': received.strftime('%Y-%m-%d'),
+        '납품요구수량': quantity,
+        '납품요구금액': np.round(price * quantity, 0),
+        '중소기업자간경쟁제품여부': _pick(rng, ['Y', 'N'], rows, [0.6, 0.4]),
+        '업체기업구분명': _pick(rng, COMPANY_TYPES, rows, [0.8, 0.15, 0.05]),
+        '납품요구지청명': _pick(rng, BRANCHES, rows),
+    })
+
+
+def _budget_amounts(rng, rows):
+    total = np.round(rng.lognormal(18, 1.5, rows), -3)
+    shares = rng.dirichlet([2, 2, 2, 1], rows)
+
+    return {
+        '예산현액': _with_thousands(total),
+        '국비': _with_thousands(total * shares[:, 0]),
+        '시도비': _with_thousands(total * shares[:, 1]),
+        '시군구비': _with_thousands(total * shares[:, 2]),
+        '기타': _with_thousands(total * shares[:, 3]),
+        '지출액': _with_thousands(total * rng.uniform(0, 1, rows)),
+        '편성액': _with_thousands(total),
+    }
+
+
+def _region_parts(rng, rows):
+    regions = pd.Series(_pick(rng, _regions(), rows)).str.split(' ', n=1, expand=True)
+    return regions[0].to_numpy(dtype=object), regions[1].fillna('').to_numpy(dtype=object)
+
+
+def generate_budget(rows, seed=0, days=60):
+    rng = _rng(seed + 1)
+    provinces, districts = _region_parts(rng, rows)
+
+    # load_budget_data는 오늘 수집분만 읽으므로 절반 정도는 오늘 날짜로 만듦
+    collected = _dates(rng, rows, days)
+    collected = collected.where(rng.random(rows) > 0.5, pd.Timestamp(datetime.now().date()))
+
+    return pd.DataFrame({
+        'collection_Date': collected.strftime('%Y-%m-%d'),
+        '지역명': provinces,
+        '자치단체명': provinces + ' ' + districts,
+        '세부사업명': _phrases(rng, BUDGET_WORDS, rows),
+        **_budget_amounts(rng, rows),
+    })
+
+
+def generate_edu_budget(rows, seed=0):
+    rng = _rng(seed + 2)
+    provinces, districts = _region_parts(rng, rows)
+
+    return pd.DataFrame({
+        '도광역시': provinces,
+        '시군구': districts,
+        '구분': _pick(rng, EDU_TYPES, rows),
+        '과업명': _phrases(rng, BUDGET_WORDS, rows),
+        '금액': _with_thousands(np.round(rng.lognormal(17, 1.2, rows), -3)),
+        '면적': _with_thousands(np.round(rng.lognormal(7, 1, rows))),
+        '예산집행': _pick(rng, ['집행', '미집행', '일부집행'], rows),
+    })
+
+
+def generate_bid(rows, seed=0, days=90):
+    rng = _rng(seed + 3)
+    provinces, districts = _region_parts(rng, rows)
+    entered = _dates(rng, rows, days) + pd.to_timedelta(rng.integers(0, 24 * 60, rows), unit='min')
+    estimated = np.round(rng.lognormal(18, 1.3, rows), -3)
+
+    return pd.DataFrame({
+        '입력일': entered.strftime('%Y-%m-%d %H:%M'),
+        '공고명': provinces + ' ' + _phrases(rng, BUDGET_WORDS, rows) + ' ' + _pick(rng, ['공사', '용역', '구매'], rows),
+        '발주기관': provinces + ' ' + districts + _pick(rng, AGENCY_SUFFIXES, rows),
+        '추정가격': _with_thousands(estimated),
+        '기초금액': _with_thousands(estimated * 1.1),
+        '참가마감': (entered + pd.Timedelta(days=5)).strftime('%Y-%m-%d %H:%M'),
+        '투찰마감': (entered + pd.Timedelta(days=7)).strftime('%Y-%m-%d %H:%M'),
+        '개찰일': (entered + pd.Timedelta(days=8)).strftime('%Y-%m-%d %H:%M'),
+        '업종': _pick(rng, BID_FIELDS, rows),
+        '지역': provinces,
+        '분류': _pick(rng, BID_CATEGORIES, rows),
+    })
+
+
+def generate_news(rows, seed=0, days=7):
+    rng = _rng(seed + 4)
+    published = _dates(rng, rows, days) + pd.to_timedelta(rng.integers(0, 24 * 60, rows), unit='min')
+
+    return pd.DataFrame({
+        '기사날짜': published.strftime('%Y-%m-%d %H:%M:%S'),
+        'URL': pd.Series(np.arange(rows)).map('https://news.example.com/article/{}'.format).to_numpy(dtype=object),
+        '제목': _phrases(rng, NEWS_WORDS, rows, 4),
+        '내용': _phrases(rng, NEWS_WORDS + BUDGET_WORDS, rows, 20),
+    })
+
+
+def generate_users(rows=50, seed=0):
+    rng = _rng(seed + 5)
+    names = [f"사용자{i:03d}" for i in range(rows)]
+
+    return pd.DataFrame({
+        'employeeNumber': np.arange(1, rows + 1),
+        'employeeName': names,
+        'jobTitle': _pick(rng, ['사원', '대리', '과장', '차장', '부장'], rows),
+        'password': [f"password{i:03d}" for i in range(rows)],
+    })
+
+
+def generate_budget_link(seed=0):
+    names = pd.Series(_regions()).str.split(' ', n=1, expand=True)
+
+    return pd.DataFrame({
+        '지역명': names[0],
+        '자치단체명': names[0] + ' ' + names[1].fillna(''),
+        'URL': [f"https://budget.example.com/{i}" for i in range(len(names))],
+    })
+
+
+def generate_list_up(rows=500, seed=0):
+    budget = generate_budget(rows, seed).drop(columns=['collection_Date'])
+    edu_budget = generate_edu_budget(rows, seed)
+
+    # 사업 현황 화면은 삭제 표시된 행을 숨김 (일부만 삭제된 상태)
+    rng = _rng(seed + 7)
+    budget['삭제'] = rng.random(len(budget)) < 0.05
+    edu_budget['삭제'] = rng.random(len(edu_budget)) < 0.05
+
+    return budget, edu_budget
+
+
+def generate_tables(rows, seed=0):
+    # backend.MIRROR_TABLES의 모든 테이블을 (dataset_id, table_id) -> DataFrame으로 생성
+    budget = generate_budget(rows, seed)
+    list_up_budget, list_up_edu_budget = generate_list_up(min(rows, 500), seed)
+    small = max(100, rows // 100)
+
+    return {
+        ('SERVICE_DATA', 'users'): generate_users(seed=seed),
+        ('RAW_DATA', 'budget_link'): generate_budget_link(seed),
+        ('DATA_MARTS', 'list_up_budget_data'): list_up_budget,
+        ('DATA_MARTS', 'list_up_edu_budget_data'): list_up_edu_budget,
+        ('DATA_MARTS', 'new_budget_data'): budget.head(small).drop(columns=['collection_Date']),
+        ('DATA_MARTS', 'latest_budget_data'): budget.tail(small * 10).drop(columns=['collection_Date']),
+        ('DATA_MARTS', 'bid_con_data'): generate_bid(rows, seed),
+        ('DATA_MARTS', 'bid_ser_data'): generate_bid(rows, seed + 10),
+        ('DATA_MARTS', 'bid_pur_data'): generate_bid(rows, seed + 20),
+        ('DATA_MARTS', 'news_data'): generate_news(small, seed),
+        ('DATA_WAREHOUSE', 'budget_data'): budget,
+        ('DATA_WAREHOUSE', 'edu_budget_data'): generate_edu_budget(rows, seed),
+        ('DATA_WAREHOUSE', 'g2b_data'): generate_g2b(rows, seed),
+    }
+
+
+def write_mirror(path, rows, seed=0, tables=None):
+    mirror = backend.LocalMirrorBackend(path)
+    for (dataset_id, table_id), df in generate_tables(rows, seed).items():
+        if tables and (dataset_id, table_id) not in tables:
+            continue
+        mirror.write_table(df, dataset_id, table_id)
+        print(f"Generated {dataset_id}.{table_id} ({len(df)} rows)")
+
+    return mirror
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="성능 측정용 가상 데이터를 로컬 Parquet 미러로 생성")
+    parser.add_argument('--path', default=config.get_setting('data_backend', 'local_path', 'data_mirror'))
+    parser.add_argument('--rows', type=int, default=100000, help="큰 테이블(g2b, 예산, 입찰)의 행 수 (10000 ~ 5000000)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--table', action='append', help="DATASET.TABLE (생략 시 전체)")
+    args = parser.parse_args()
+
+    tables = [tuple(table.split('.', 1)) for table in args.table] if args.table else None
+    write_mirror(args.path, args.rows, args.seed, tables)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# 앱 모듈은 저장소 최상위에 있으므로 테스트에서 바로 import할 수 있게 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backend
+import derived_index
+
+
+@pytest.fixture
+def local_backend(tmp_path, monkeypatch):
+    # BigQuery 대신 임시 디렉터리의 로컬 미러를 백엔드로 사용
+    mirror = backend.LocalMirrorBackend(str(tmp_path / 'mirror'))
+    monkeypatch.setattr(backend, '_backend', mirror)
+    return mirror
+
+
+@pytest.fixture
+def derived_indexes():
+    # 파생 색인은 프로세스 전역이므로 테스트마다 비움
+    derived_index.clear()
+    yield
+    derived_index.clear()
+
+
+@pytest.fixture
+def versioned_frame():
+    # 캐시된 로더 결과처럼 attrs['data_version']이 기록된 데이터프레임 (version=None이면 버전 없음)
+    def make(data, version='test:1'):
+        df = pd.DataFrame(data)
+        if version is not None:
+            df.attrs['data_version'] = version
+        return df
+
+    return make
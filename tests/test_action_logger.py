@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import time
+
+import pytest
+
+import action_logger
+
+
+@pytest.fixture
+def inserts(local_backend, monkeypatch):
+    # 로컬 미러에 적재하면서 insert_rows 호출(테이블, 행 수)을 기록
+    calls = []
+    insert_rows = local_backend.insert_rows
+
+    def record(dataset_id, table_id, rows):
+        calls.append((dataset_id, table_id, len(rows)))
+        return insert_rows(dataset_id, table_id, rows)
+
+    monkeypatch.setattr(local_backend, 'insert_rows', record)
+    return calls
+
+
+def _logged(local_backend, table_id='logs'):
+    path = os.path.join(local_backend.root, 'SERVICE_DATA', f'{table_id}.jsonl')
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+
+def _log(logger, action, username='사용자000', table_id='logs', coalesce=False):
+    return logger.log(username, action, 'SERVICE_DATA', table_id, '2024-01-01 00:00:00', coalesce=coalesce)
+
+
+def _wait(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_coalesce_same_user_and_action(inserts, local_backend):
+    logger = action_logger.ActionLogger(coalesce_seconds=60)
+
+    assert _log(logger, 'viewed HOME', coalesce=True)
+    assert not _log(logger, 'viewed HOME', coalesce=True)
+    assert _log(logger, 'viewed HOME', username='사용자001', coalesce=True)
+    assert _log(logger, 'viewed STAT', coalesce=True)
+    # coalesce=False인 행동은 매번 기록
+    assert _log(logger, 'viewed HOME')
+
+    logger.flush()
+
+    assert logger.snapshot()['coalesced'] == 1
+    assert [row['action'] for row in _logged(local_backend)] == ['viewed HOME'] * 2 + ['viewed STAT', 'viewed HOME']
+
+
+def test_coalesce_expires(inserts):
+    logger = action_logger.ActionLogger(coalesce_seconds=0)
+
+    assert _log(logger, 'viewed HOME', coalesce=True)
+    assert _log(logger, 'viewed HOME', coalesce=True)
+
+
+@pytest.mark.parametrize('overflow, kept', [('drop_oldest', ['2', '3']), ('drop_newest', ['1', '2'])])
+def test_overflow_policies(inserts, local_backend, overflow, kept):
+    logger = action_logger.ActionLogger(max_queue=2, overflow=overflow)
+
+    for action in ['1', '2', '3']:
+        _log(logger, action)
+
+    assert logger.snapshot()['dropped'] == 1
+    logger.flush()
+    assert [row['action'] for row in _logged(local_backend)] == kept
+
+
+def test_flush_groups_rows_by_table_in_batches(inserts):
+    logger = action_logger.ActionLogger(batch_size=2)
+
+    for i in range(3):
+        _log(logger, str(i), table_id='logs')
+    _log(logger, 'login', table_id='login_logs')
+
+    logger.flush()
+
+    assert inserts == [('SERVICE_DATA', 'logs', 2), ('SERVICE_DATA', 'logs', 1), ('SERVICE_DATA', 'login_logs', 1)]
+    assert logger.snapshot()['flushed'] == 4
+
+
+def test_worker_flushes_full_batch(inserts):
+    logger = action_logger.ActionLogger(batch_size=2, flush_interval=60)
+    logger.start()
+
+    _log(logger, '1')
+    _log(logger, '2')
+
+    # flush_interval을 기다리지 않고 배치가 차면 바로 적재
+    _wait(lambda: logger.snapshot()['flushed'] == 2)
+    logger.shutdown()
+
+
+def test_worker_flushes_after_interval(inserts):
+    logger = action_logger.ActionLogger(batch_size=50, flush_interval=0.05)
+    logger.start()
+
+    _log(logger, '1')
+
+    _wait(lambda: logger.snapshot()['flushed'] == 1)
+    logger.shutdown()
+
+
+def test_shutdown_flushes_queue(inserts, local_backend):
+    logger = action_logger.ActionLogger(batch_size=50, flush_interval=60)
+    logger.start()
+
+    for action in ['1', '2', '3']:
+        _log(logger, action)
+    logger.shutdown()
+
+    assert not logger._worker.is_alive()
+    assert logger.snapshot()['queued'] == 0
+    assert [row['action'] for row in _logged(local_backend)] == ['1', '2', '3']
+
+
+def test_failed_insert_is_counted(inserts, local_backend, monkeypatch):
+    monkeypatch.setattr(local_backend, 'insert_rows', lambda dataset_id, table_id, rows: ['quota exceeded'])
+    logger = action_logger.ActionLogger()
+
+    _log(logger, '1')
+    logger.flush()
+
+    assert logger.snapshot()['failed'] == 1
+    assert logger.snapshot()['flushed'] == 0
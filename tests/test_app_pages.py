@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import action_logger
+import benchmark
+import synthetic_data
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+PAGES = ["납품 현황", "사업 현황", "지자체 예산서", "교육청 예산서", "인포21C", "종합쇼핑몰 납품상세 내역", "뉴스", "STAT", "관리자"]
+
+
+@pytest.fixture(scope='module')
+def mirror(tmp_path_factory):
+    # 합성 데이터로 만든 로컬 미러를 쓰도록 설정하고, 끝나면 환경변수를 되돌림
+    environ = dict(os.environ)
+    path = str(tmp_path_factory.mktemp('mirror'))
+
+    synthetic_data.write_mirror(path, 2000, 0)
+    benchmark.configure(path, 'numpy')
+    os.environ['MIDO_ADMIN_USERS'] = benchmark.USERNAME
+
+    yield path
+
+    # 페이지에서 남긴 사용자 로그는 미러가 설정된 동안 적재
+    action_logger.get_logger().flush()
+
+    os.environ.clear()
+    os.environ.update(environ)
+
+    import backend
+    backend._backend = None
+
+
+@pytest.mark.parametrize('page', PAGES)
+def test_page_renders(mirror, page):
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state['logged_in'] = True
+    at.session_state['username'] = benchmark.USERNAME
+    at.session_state['jobTitle'] = ''
+    at.session_state['main_option'] = page
+    at.run()
+
+    assert [exception.value for exception in at.exception] == []
+    assert at.session_state['logged_in']
+
+
+def _news(query, at=None):
+    if at is None:
+        at = AppTest.from_file(APP, default_timeout=120)
+        at.session_state['logged_in'] = True
+        at.session_state['username'] = benchmark.USERNAME
+        at.session_state['jobTitle'] = ''
+        at.session_state['main_option'] = '뉴스'
+        at.run()
+
+    at.text_input(key='search_term').input(query).run()
+    return at
+
+
+def test_news_search_follows_each_submitted_query(mirror):
+    # 같은 세션에서 검색어를 연달아 바꿔도 새 세션에서 검색한 결과와 같아야 함
+    at = None
+    for query in ['예산', '인조잔디', '추경', '예산']:
+        at = _news(query, at)
+        expected = _news(query).dataframe[0].value
+
+        assert at.dataframe[0].value['제목'].tolist() == expected['제목'].tolist()
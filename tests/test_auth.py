@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+import pytest
+import streamlit as st
+
+import auth
+
+
+@pytest.fixture(autouse=True)
+def fast_hash(monkeypatch):
+    # 테스트에서는 반복 횟수를 줄여서 해시를 빠르게 계산
+    monkeypatch.setenv('MIDO_AUTH_ITERATIONS', '1000')
+
+
+@pytest.fixture
+def session():
+    st.session_state.clear()
+    yield st.session_state
+    st.session_state.clear()
+
+
+def _users(passwords):
+    return pd.DataFrame({
+        'employeeNumber': range(1, len(passwords) + 1),
+        'employeeName': [f'사용자{i}' for i in range(len(passwords))],
+        'jobTitle': ['사원'] * len(passwords),
+        'password': passwords,
+    })
+
+
+def test_hash_and_verify_password():
+    stored = auth.hash_password('비밀번호')
+
+    assert auth.is_hashed(stored)
+    assert stored.split('$')[1] == '1000'
+    assert stored != auth.hash_password('비밀번호')  # salt가 매번 다름
+    assert auth.verify_password('비밀번호', stored)
+    assert not auth.verify_password('틀림', stored)
+
+
+def test_verify_rejects_malformed_hashes():
+    assert not auth.verify_password('password', 'password')
+    assert not auth.verify_password('password', None)
+    assert not auth.verify_password('password', 'pbkdf2_sha256$abc$salt$digest')
+
+
+def test_directory_keeps_plaintext_without_hashing(monkeypatch):
+    calls = []
+    hash_password = auth.hash_password
+    monkeypatch.setattr(auth, 'hash_password', lambda *args, **kwargs: calls.append(1) or hash_password(*args, **kwargs))
+
+    directory = auth.UserDirectory(_users(['password0', None, 'password2']))
+
+    # 디렉터리를 만들 때는 PBKDF2를 계산하지 않음
+    assert calls == []
+    assert len(directory) == 3
+    assert directory.get('사용자1')['password'] == ''
+
+
+def test_authenticate():
+    directory = auth.UserDirectory(_users([auth.hash_password('hashed'), 'plain']))
+
+    assert directory.authenticate('사용자0', 'hashed')['jobTitle'] == '사원'
+    assert directory.authenticate('사용자1', 'plain') is not None
+    assert directory.authenticate('사용자0', 'plain') is None
+    assert directory.authenticate('사용자1', 'hashed') is None
+    assert directory.authenticate('없는사용자', 'plain') is None
+
+
+def test_duplicate_names_use_last_row():
+    users = _users(['first', 'second'])
+    users['employeeName'] = '사용자0'
+
+    directory = auth.UserDirectory(users)
+
+    assert len(directory) == 1
+    assert directory.authenticate('사용자0', 'second') is not None
+
+
+def test_login_and_check_session(monkeypatch, session):
+    directory = auth.UserDirectory(_users(['password0', 'password1']))
+    monkeypatch.setattr(auth, 'load_user_directory', lambda: directory)
+
+    assert not auth.check_session()
+    assert not auth.login('사용자0', 'wrong')
+    assert auth.login('사용자0', 'password0')
+    assert session['auth_version'] == directory.version
+    assert auth.check_session()
+
+    # 사용자 목록이 바뀌면 직책을 다시 읽고, 목록에서 빠지면 로그아웃
+    users = _users(['password0', 'password1'])
+    users['jobTitle'] = '과장'
+    directory = auth.UserDirectory(users)
+    assert auth.check_session()
+    assert session['jobTitle'] == '과장'
+    assert session['auth_version'] == directory.version
+
+    directory = auth.UserDirectory(_users(['password0']).assign(employeeName='다른사용자'))
+    assert not auth.check_session()
+    assert not session['logged_in']
+    assert session['username'] is None
+
+
+def test_migrate_passwords(local_backend):
+    stored = auth.hash_password('hashed')
+    local_backend.write_table(_users([stored, 'plain', None]), 'SERVICE_DATA', 'users')
+
+    auth.migrate_passwords()
+
+    passwords = local_backend.read_table('SERVICE_DATA', 'users')['password'].tolist()
+    assert passwords[0] == stored
+    assert all(auth.is_hashed(password) for password in passwords)
+
+    directory = auth.UserDirectory(local_backend.read_table('SERVICE_DATA', 'users'))
+    assert directory.authenticate('사용자1', 'plain') is not None
+    assert directory.authenticate('사용자2', '') is not None
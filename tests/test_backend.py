@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+import duckdb
+import pandas as pd
+import pytest
+
+import backend
+
+FILTERS = [
+    [('업체명', '=', '가')],
+    [('업체명', '!=', '가')],
+    [('금액', '>', 150)],
+    [('금액', '<=', 300)],
+    [('업체명', 'in', ['가', '다'])],
+    [('업체명', 'in', [])],
+    [('금액', 'between', (200, 400))],
+    [('납품요구접수일자', 'date>=', date(2024, 1, 2))],
+    [('납품요구접수일자', 'date<=', '2024-01-02')],
+    [('납품요구접수일자', 'date_between', ('2024-01-02', pd.Timestamp('2024-01-03 12:00')))],
+    [('업체명', 'in', ['가', '나']), ('금액', '>=', 200)],
+]
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        '업체명': ['가', '나', '가', '다', None],
+        '금액': [100.0, 200.0, 300.0, 400.0, None],
+        # 시각이 붙은 문자열도 날짜 부분만 비교
+        '납품요구접수일자': ['2024-01-01', '2024-01-02 09:30:00', '2024-01-03', None, '2024-01-04'],
+    })
+
+
+def test_build_where_parameters():
+    where, values = backend.build_where([('업체명', 'in', ['가', '나']), ('금액', 'between', (1, 2))], 'bigquery')
+
+    assert where == "`업체명` IN (?, ?) AND `금액` BETWEEN ? AND ?"
+    assert values == ['가', '나', 1, 2]
+
+
+def test_build_where_dates_use_safe_cast():
+    where, values = backend.build_where([('일자', 'date>=', date(2024, 1, 2))], 'duckdb')
+
+    assert where == 'TRY_CAST(SUBSTR(CAST("일자" AS VARCHAR), 1, 10) AS DATE) >= CAST(? AS DATE)'
+    assert values == ['2024-01-02']
+
+
+def test_unsupported_operator():
+    with pytest.raises(ValueError):
+        backend.build_where([('금액', 'like', '1%')], 'duckdb')
+    with pytest.raises(ValueError):
+        backend.filter_mask(pd.DataFrame({'금액': [1]}), [('금액', 'like', '1%')])
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+def test_filter_mask_matches_sql(df, filters):
+    # 로컬 미러(pandas)와 SQL 백엔드가 같은 행을 고르는지 duckdb로 확인
+    where, values = backend.build_where(filters, 'duckdb')
+
+    connection = duckdb.connect()
+    connection.register('data', df.reset_index())
+    rows = connection.execute(f'SELECT "index" FROM data WHERE {where} ORDER BY "index"', values).fetchall()
+
+    mask = backend.filter_mask(df, filters)
+
+    assert mask.dtype == bool
+    assert df.index[mask].tolist() == [row[0] for row in rows]
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+import pytest
+
+import date_index
+
+DATE = date_index.DATE_COLUMN
+
+RANGES = [
+    (None, None),
+    ('2024-01-03', None),
+    (None, '2024-01-03'),
+    ('2024-01-02', '2024-01-04'),
+    ('2024-01-03 15:00', '2024-01-03 09:00'),  # 같은 날짜 (시각은 무시)
+    ('2025-01-01', None),
+    ('2024-01-05', '2024-01-01'),
+]
+
+
+pytestmark = pytest.mark.usefixtures('derived_indexes')
+
+
+def _dates(order):
+    dates = pd.DatetimeIndex([pd.Timestamp(value) for value in
+                              ['2024-01-01', '2024-01-02 10:00', '2024-01-03', '2024-01-03 23:59', '2024-01-05']])
+    if order == 'descending':
+        dates = list(dates[::-1]) + [pd.NaT]
+    elif order == 'ascending':
+        dates = [pd.NaT] + list(dates)
+    else:
+        dates = [dates[2], pd.NaT, dates[0], dates[4], dates[1], dates[3]]
+
+    return {DATE: dates, '금액': range(len(dates))}
+
+
+def _expected(df, start, end):
+    dates = df[DATE].dt.normalize()
+    result = dates.notna()
+    if start is not None:
+        result &= dates >= pd.Timestamp(start).normalize()
+    if end is not None:
+        result &= dates <= pd.Timestamp(end).normalize()
+    return result.to_numpy()
+
+
+@pytest.mark.parametrize('order', ['descending', 'ascending', 'unsorted'])
+@pytest.mark.parametrize('start, end', RANGES)
+def test_mask_and_rows_match_comparison(order, start, end, versioned_frame):
+    df = versioned_frame(_dates(order), f'test:{order}')
+    expected = _expected(df, start, end)
+
+    np.testing.assert_array_equal(date_index.mask(df, start, end), expected)
+    pd.testing.assert_frame_equal(date_index.rows(df, start, end), df[expected])
+
+
+def test_sorted_frames_are_indexed(versioned_frame):
+    assert date_index.get(versioned_frame(_dates('descending'), 'test:descending')).descending
+    assert not date_index.get(versioned_frame(_dates('ascending'), 'test:ascending')).descending
+    assert date_index.get(versioned_frame(_dates('unsorted'), 'test:unsorted')) is None
+
+
+def test_rows_is_a_slice_of_the_original(versioned_frame):
+    df = versioned_frame(_dates('descending'), 'test:descending')
+    rows = date_index.rows(df, '2024-01-02', '2024-01-03')
+
+    assert rows.index.tolist() == [1, 2, 3]
+    assert np.shares_memory(rows['금액'].to_numpy(), df['금액'].to_numpy())
+
+
+@pytest.mark.parametrize('order', ['descending', 'ascending'])
+def test_bounds(order, versioned_frame):
+    df = versioned_frame(_dates(order), f'test:{order}')
+    index = date_index.get(df)
+
+    mask = _expected(df, '2024-01-02', '2024-01-03')
+    assert index.bounds(mask) == (pd.Timestamp('2024-01-02 10:00'), pd.Timestamp('2024-01-03 23:59'))
+    assert index.bounds(np.zeros(len(df), dtype=bool)) == (pd.NaT, pd.NaT)
+
+
+def test_year(versioned_frame):
+    df = versioned_frame(_dates('descending'), 'test:descending')
+    assert len(date_index.year(df, 2024)) == 5
+    assert date_index.year(df, 2023).empty
+
+
+def test_string_dates_use_comparison(versioned_frame):
+    df = versioned_frame(_dates('descending'), 'test:descending')
+    df[DATE] = df[DATE].dt.strftime('%Y-%m-%d')
+
+    assert date_index.get(df) is None
+    assert date_index.mask(df, '2024-01-03', None).tolist() == [True, True, True, False, False, False]
+
+
+@pytest.mark.parametrize('order', ['descending', 'ascending'])
+def test_arrow_timestamps_are_indexed(order, versioned_frame):
+    # Arrow 모드(user-010)의 timestamp[ns][pyarrow] 열도 색인
+    df = versioned_frame(_dates(order), f'test:{order}')
+    expected = _expected(df, '2024-01-02', '2024-01-03')
+    df[DATE] = df[DATE].astype('timestamp[ns][pyarrow]')
+
+    assert date_index.get(df) is not None
+    np.testing.assert_array_equal(date_index.mask(df, '2024-01-02', '2024-01-03'), expected)
+    pd.testing.assert_frame_equal(date_index.rows(df, '2024-01-02', '2024-01-03'), df[expected])
+    assert len(date_index.year(df, 2024)) == 5
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import disk_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('MIDO_DISK_CACHE_PATH', str(tmp_path))
+    monkeypatch.setenv('MIDO_DISK_CACHE_ENABLED', 'true')
+    return tmp_path
+
+
+def _files(path):
+    return sorted(name for _, _, names in os.walk(path) for name in names)
+
+
+def test_save_and_load_frame():
+    df = pd.DataFrame({'업체명': ['가', '나'], '금액': [1.0, 2.0]})
+
+    token = disk_cache.save('loader', 'key', df, meta={'rows': 2})
+    value, entry = disk_cache.load('loader', 'key')
+
+    pd.testing.assert_frame_equal(value, df)
+    assert entry['token'] == token
+    assert entry['meta'] == {'rows': 2}
+
+
+def test_save_and_load_tuple():
+    frames = (pd.DataFrame({'a': [1]}), pd.DataFrame({'b': [2]}))
+
+    disk_cache.save('loader', 'key', frames)
+    value, _ = disk_cache.load('loader', 'key')
+
+    assert isinstance(value, tuple) and len(value) == 2
+    pd.testing.assert_frame_equal(value[1], frames[1])
+
+
+def test_other_values_are_not_saved(cache_dir):
+    assert disk_cache.save('loader', 'key', {'a': 1}) is None
+    assert disk_cache.load('loader', 'key') is None
+    assert _files(cache_dir) == []
+
+
+def test_max_age():
+    disk_cache.save('loader', 'key', pd.DataFrame({'a': [1]}))
+
+    assert disk_cache.load('loader', 'key', max_age=60) is not None
+    assert disk_cache.load('loader', 'key', max_age=-1) is None
+
+
+def test_replacing_removes_previous_parts(cache_dir):
+    disk_cache.save('loader', 'key', pd.DataFrame({'a': [1]}))
+    token = disk_cache.save('loader', 'key', pd.DataFrame({'a': [2]}))
+
+    assert _files(cache_dir) == sorted(['key.meta.json', f'key.{token}.0.parquet'])
+    assert disk_cache.load('loader', 'key')[0]['a'].tolist() == [2]
+
+
+def test_evict_least_recently_used(monkeypatch):
+    disk_cache.save('loader', 'old', pd.DataFrame({'a': range(100)}))
+    disk_cache.save('loader', 'new', pd.DataFrame({'a': range(100)}))
+
+    old_meta = os.path.join(disk_cache.cache_root(), 'loader', 'old.meta.json')
+    os.utime(old_meta, (time.time() - 60, time.time() - 60))
+
+    size = disk_cache.load('loader', 'new')[1]['bytes']
+    monkeypatch.setenv('MIDO_DISK_CACHE_MAX_BYTES', str(size))
+    disk_cache.evict()
+
+    assert disk_cache.load('loader', 'old') is None
+    assert disk_cache.load('loader', 'new') is not None
+
+
+def test_persistent_reads_from_disk():
+    calls = []
+
+    @disk_cache.persistent(ttl=60, name='test_loader')
+    def load(year):
+        calls.append(year)
+        return pd.DataFrame({'year': [year]})
+
+    first = load(2024)
+    second = load(2024)
+    load(2023)
+
+    assert calls == [2024, 2023]
+    pd.testing.assert_frame_equal(first, second)
+    assert first.attrs['data_version'] == second.attrs['data_version']
+    assert first.attrs['data_version'].startswith('test_loader:')
+
+
+def test_persistent_disabled(monkeypatch, cache_dir):
+    monkeypatch.setenv('MIDO_DISK_CACHE_ENABLED', 'false')
+    calls = []
+
+    @disk_cache.persistent(ttl=60, name='test_loader')
+    def load():
+        calls.append(1)
+        return pd.DataFrame({'a': [1]})
+
+    # 디스크 캐시를 끄면 매번 불러오고, 버전도 매번 새로 기록
+    assert load().attrs['data_version'] != load().attrs['data_version']
+    assert calls == [1, 1]
+    assert _files(cache_dir) == []
+
+
+def test_persistent_key_depends_on_settings(monkeypatch):
+    calls = []
+
+    @disk_cache.persistent(ttl=60, name='test_loader')
+    def load():
+        calls.append(1)
+        return pd.DataFrame({'a': [1]})
+
+    load()
+    load()
+
+    # 저장되는 타입을 바꾸는 설정이 바뀌면 이전 항목을 쓰지 않음
+    monkeypatch.setenv('MIDO_MEMORY_COMPACT', 'true')
+    load()
+    monkeypatch.setenv('MIDO_DATA_BACKEND_DTYPE_BACKEND', 'pyarrow')
+    load()
+
+    assert calls == [1, 1, 1]
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+import pytest
+
+import derived_index
+import facet_index
+
+VALUES = ['나', '가', None, '다', '가', '라', '가', None, '나', '마'] * 3
+
+
+pytestmark = pytest.mark.usefixtures('derived_indexes')
+
+
+@pytest.mark.parametrize('selected', [[], ['가'], ['마'], ['가', '나'], ['가', '나', '다', '라'],
+                                      ['가', '나', '다', '라', '마'], ['없음'], ['가', '없음']])
+def test_mask_matches_isin(selected, versioned_frame):
+    df = versioned_frame({'업체명': VALUES})
+    index = facet_index.FacetIndex(df['업체명'])
+
+    np.testing.assert_array_equal(index.mask(selected), df['업체명'].isin(selected).to_numpy())
+
+
+def test_counts_and_options(versioned_frame):
+    df = versioned_frame({'업체명': VALUES})
+    index = facet_index.FacetIndex(df['업체명'])
+
+    assert index.values == ['가', '나', '다', '라', '마']
+    assert index.facet_counts().tolist() == [9, 6, 3, 3, 3]
+    assert index.options() == ['가', '나', '다', '라', '마']
+
+    mask = df.index < 4
+    assert index.facet_counts(mask).tolist() == [1, 1, 1, 0, 0]
+    assert index.options(mask) == ['가', '나', '다']
+
+
+def test_categorical_values_sorted_by_value():
+    values = pd.Series(pd.Categorical(['나', '가', '다'], categories=['다', '나', '가']))
+
+    assert facet_index.FacetIndex(values).values == ['가', '나', '다']
+
+
+def test_get_shares_index_per_version(versioned_frame):
+    df = versioned_frame({'업체명': VALUES})
+
+    index = facet_index.get(df, '업체명')
+    assert facet_index.get(df, '업체명') is index
+
+    # 파생 값(연도 등)은 이름별로 따로 색인
+    years = facet_index.get(df, '연도', values=lambda frame: pd.Series(np.arange(len(frame)) % 2))
+    assert years.values == [0, 1]
+
+
+def test_get_without_version_builds_each_time():
+    df = pd.DataFrame({'업체명': VALUES})
+
+    assert facet_index.get(df, '업체명') is not facet_index.get(df, '업체명')
+    assert derived_index.snapshot() == []
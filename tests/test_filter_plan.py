@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+import pytest
+
+import filter_plan
+import session_memo
+
+
+COLUMNS = {
+    '업체명': ['가', '나', '가', '다', None, '나'],
+    '금액': [100.0, 200.0, 300.0, None, 500.0, 600.0],
+    '품명': ['인조잔디', '탄성포장', '인조잔디 보수', '놀이시설', '인조', '탄성'],
+}
+
+pytestmark = pytest.mark.usefixtures('derived_indexes')
+
+
+def _expected(df):
+    return df[df['업체명'].isin(['가', '나']) & df['금액'].between(150, 600)]
+
+
+def test_slider_range():
+    assert filter_plan.slider_range(pd.Series([3, 1, 2])) == (1.0, 3.0, (1.0, 3.0))
+    # 값이 하나뿐이면 0부터 선택
+    assert filter_plan.slider_range(pd.Series([5.0, 5.0])) == (5.0, 5.0, (0.0, 5.0))
+    assert filter_plan.slider_range(pd.Series([None, None], dtype=float)) == (0.0, 0.0, (0.0, 0.0))
+
+
+def test_conditions_match_pandas(versioned_frame):
+    df = versioned_frame(COLUMNS)
+    plan = filter_plan.FilterPlan(df)
+    plan.select('업체명', ['나', '가']).between('금액', 150, 600)
+
+    pd.testing.assert_frame_equal(plan.result(), _expected(df))
+    assert plan.count() == len(_expected(df))
+    assert plan.options('업체명') == ['가', '나']
+
+
+def test_without_conditions_returns_original(versioned_frame):
+    df = versioned_frame(COLUMNS)
+    assert filter_plan.FilterPlan(df).result() is df
+
+
+def test_missing_values_are_excluded(versioned_frame):
+    df = versioned_frame(COLUMNS)
+    plan = filter_plan.FilterPlan(df).where(df['금액'].astype('Float64') > 0)
+
+    assert plan.count() == 5
+
+
+def test_search_and_isin(versioned_frame):
+    df = versioned_frame(COLUMNS, None)
+    plan = filter_plan.FilterPlan(df).search('품명', '인조').isin('업체명', ['가'])
+
+    assert plan.result().index.tolist() == [0, 2]
+
+
+def test_memo_reuses_masks(versioned_frame):
+    df = versioned_frame(COLUMNS)
+    memo = session_memo.SessionMemo(1024 ** 2)
+
+    first = filter_plan.FilterPlan(df, memo=memo)
+    first.select('업체명', ['가', '나']).between('금액', 150, 600)
+
+    calls = []
+
+    def mask():
+        calls.append(1)
+        return np.ones(len(df), dtype=bool)
+
+    # 선택 순서가 달라도 같은 조건으로 보고 메모에서 꺼냄
+    second = filter_plan.FilterPlan(df, memo=memo)
+    second.select('업체명', ['나', '가']).between('금액', 150, 600).where(mask, key='all')
+    second_again = filter_plan.FilterPlan(df, memo=memo)
+    second_again.select('업체명', ['가', '나']).between('금액', 150, 600).where(mask, key='all')
+
+    assert calls == [1]
+    pd.testing.assert_frame_equal(second_again.result(), _expected(df))
+    assert memo.snapshot()['hits'] >= 3
+
+
+def test_unkeyed_condition_stops_memo(versioned_frame):
+    df = versioned_frame(COLUMNS)
+    memo = session_memo.SessionMemo(1024 ** 2)
+
+    plan = filter_plan.FilterPlan(df, memo=memo).where(df['금액'] > 150).between('금액', 0, 550)
+
+    assert plan.state is None
+    assert plan.cached('total', lambda: 1) == 1
+    assert plan.result().index.tolist() == [1, 2, 4]
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import incremental_sync
+import schema
+
+DATE = '납품요구접수일자'
+KEY = ['납품요구번호', '납품요구변경차수', '물품순번']
+
+
+def _rows(*rows):
+    frame = pd.DataFrame(rows, columns=['납품요구번호', '납품요구변경차수', '물품순번', DATE, '금액'])
+    frame[DATE] = pd.to_datetime(frame[DATE])
+    return frame
+
+
+class Source:
+    # BigQuery 대신 filters(날짜 조건)를 적용해서 돌려주는 원본 테이블
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = []
+
+    def fetch(self, filters):
+        self.calls.append(filters)
+        frame = self.frame
+        for column, op, value in filters or []:
+            assert op == 'date>='
+            frame = frame[frame[column] >= pd.Timestamp(value)]
+        return frame.sort_values(by=DATE, ascending=False).reset_index(drop=True)
+
+
+def _sync(source):
+    return incremental_sync.IncrementalSync(source.fetch, DATE, KEY, lookback_days=7)
+
+
+def _sorted(frame):
+    return frame.sort_values(by=KEY).reset_index(drop=True)
+
+
+def test_delta_replaces_window_and_keeps_older_rows():
+    source = Source(_rows(
+        ('A', 0, 1, '2024-01-01', 100),
+        ('B', 0, 1, '2024-03-01', 200),
+    ))
+    sync = _sync(source)
+    sync.refresh()
+
+    source.frame = _rows(
+        ('A', 0, 1, '2024-01-01', 100),
+        ('B', 0, 1, '2024-03-01', 250),  # 워터마크 구간 안의 행이 바뀜
+        ('C', 0, 1, '2024-03-05', 300),  # 새 행
+    )
+    frame = sync.refresh()
+
+    assert source.calls[-1] == [(DATE, 'date>=', datetime(2024, 2, 23).date())]
+    assert sync.last_delta_rows == 2
+    pd.testing.assert_frame_equal(_sorted(frame), _sorted(source.fetch(None)))
+    assert frame[DATE].is_monotonic_decreasing
+
+
+def test_revision_inside_window_keeps_previous_revision():
+    # 변경차수가 키에 포함되므로 이전 차수의 행은 전체 조회와 마찬가지로 남음
+    source = Source(_rows(
+        ('A', 0, 1, '2024-01-01', 100),
+        ('B', 0, 1, '2024-03-01', 200),
+    ))
+    sync = _sync(source)
+    sync.refresh()
+
+    source.frame = _rows(
+        ('A', 0, 1, '2024-01-01', 100),
+        ('A', 1, 1, '2024-03-02', -30),
+        ('B', 0, 1, '2024-03-01', 200),
+    )
+    frame = sync.refresh()
+
+    pd.testing.assert_frame_equal(_sorted(frame), _sorted(source.fetch(None)))
+
+
+def test_row_moved_into_window_replaces_old_copy():
+    source = Source(_rows(
+        ('A', 0, 1, '2024-01-01', 100),
+        ('B', 0, 1, '2024-03-01', 200),
+    ))
+    sync = _sync(source)
+    sync.refresh()
+
+    # 같은 키의 행이 워터마크 구간 안의 날짜로 다시 들어오면 이전 사본은 지워짐
+    source.frame = _rows(
+        ('A', 0, 1, '2024-03-02', 100),
+        ('B', 0, 1, '2024-03-01', 200),
+    )
+    frame = sync.refresh()
+
+    assert len(frame) == 2
+    pd.testing.assert_frame_equal(_sorted(frame), _sorted(source.fetch(None)))
+
+
+def test_late_revision_outside_lookback_waits_for_full_refresh():
+    source = Source(_rows(
+        ('A', 0, 1, '2024-01-01', 100),
+        ('B', 0, 1, '2024-03-01', 200),
+    ))
+    sync = _sync(source)
+    sync.refresh()
+
+    # 접수일자가 lookback 구간보다 이전인 차수가 늦게 추가되면 delta로는 받지 못함
+    source.frame = _rows(
+        ('A', 0, 1, '2024-01-01', 100),
+        ('A', 1, 1, '2024-01-10', -30),
+        ('B', 0, 1, '2024-03-01', 200),
+    )
+    frame = sync.refresh()
+    assert len(frame) == 2
+    assert not ((frame['납품요구번호'] == 'A') & (frame['납품요구변경차수'] == 1)).any()
+
+    # 다음 전체 조회에서 반영됨
+    sync.last_full_refresh = datetime.now() - timedelta(hours=sync.full_refresh_hours)
+    frame = sync.refresh()
+    assert source.calls[-1] is None
+    pd.testing.assert_frame_equal(_sorted(frame), _sorted(source.fetch(None)))
+
+
+def test_concat_keeps_categories():
+    first = pd.DataFrame({'업체명': pd.Categorical(['가', '나'])})
+    second = pd.DataFrame({'업체명': pd.Categorical(['다'])})
+
+    frame = incremental_sync._concat([first, second])
+
+    assert isinstance(frame['업체명'].dtype, pd.CategoricalDtype)
+    assert frame['업체명'].tolist() == ['가', '나', '다']
+
+
+def test_concat_keeps_categories_when_delta_is_not_compacted():
+    # 메모리 절약 모드에서 작은 delta는 category로 바뀌지 않을 수 있음
+    kept = pd.DataFrame({'업체명': pd.Categorical(['가', '나', '가'])})
+    delta = pd.DataFrame({'업체명': ['다', None]})
+    arrow_delta = pd.DataFrame({'업체명': pd.Series(['나'], dtype='string[pyarrow]')})
+
+    frame = incremental_sync._concat([delta, arrow_delta, kept])
+
+    assert isinstance(frame['업체명'].dtype, pd.CategoricalDtype)
+    assert frame['업체명'].cat.categories.dtype == object
+    assert frame['업체명'].astype(object).fillna('').tolist() == ['다', '', '나', '가', '나', '가']
+
+
+def test_compacted_frame_stays_categorical_after_delta():
+    # 전체 조회는 category로 바뀌지만 고유값 비율이 높은 작은 delta는 그대로인 경우
+    companies = ['가', '나'] * 10
+    source = Source(_rows(*[(f'A{i}', 0, 1, f'2024-01-{i + 1:02d}', i) for i in range(20)]).assign(업체명=companies))
+
+    def fetch(filters):
+        return schema.compact(source.fetch(filters), 'g2b', 'test_g2b')
+
+    sync = incremental_sync.IncrementalSync(fetch, DATE, KEY, lookback_days=1)
+    assert isinstance(sync.refresh()['업체명'].dtype, pd.CategoricalDtype)
+
+    source.frame = pd.concat([source.frame, _rows(('B', 0, 1, '2024-01-21', 0)).assign(업체명='다')])
+    frame = sync.refresh()
+
+    assert isinstance(frame['업체명'].dtype, pd.CategoricalDtype)
+    assert sorted(frame['업체명'].cat.categories) == ['가', '나', '다']
+    assert len(frame) == 21
+
+
+def _normalize_v1(frame):
+    return frame
+
+
+def _normalize_v2(frame):
+    return frame.assign(금액=frame['금액'] * 2)
+
+
+def _snapshot_sync(source, normalize=_normalize_v1):
+    return incremental_sync.IncrementalSync(source.fetch, DATE, KEY, lookback_days=7, snapshot_name='test_g2b',
+                                            snapshot_sources=(normalize,))
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('MIDO_DISK_CACHE_PATH', str(tmp_path))
+    monkeypatch.setenv('MIDO_DISK_CACHE_ENABLED', 'true')
+    return tmp_path
+
+
+def test_snapshot_restored_after_restart(snapshot_dir):
+    source = Source(_rows(('A', 0, 1, '2024-01-01', 100)))
+    _snapshot_sync(source).refresh()
+
+    restarted = _snapshot_sync(source)
+    frame = restarted.refresh()
+
+    assert source.calls == [None]
+    assert restarted.watermark == pd.Timestamp('2024-01-01')
+    pd.testing.assert_frame_equal(_sorted(frame), _sorted(source.fetch(None)))
+
+
+def test_snapshot_discarded_when_settings_change(snapshot_dir, monkeypatch):
+    source = Source(_rows(('A', 0, 1, '2024-01-01', 100)))
+    _snapshot_sync(source).refresh()
+
+    # 메모리 절약 모드를 켜고 재시작하면 이전 형태의 스냅샷 대신 전체 조회
+    monkeypatch.setenv('MIDO_MEMORY_COMPACT', 'true')
+    _snapshot_sync(source).refresh()
+
+    assert source.calls == [None, None]
+
+
+def test_snapshot_discarded_when_code_changes(snapshot_dir):
+    source = Source(_rows(('A', 0, 1, '2024-01-01', 100)))
+    _snapshot_sync(source).refresh()
+
+    _snapshot_sync(source, normalize=_normalize_v2).refresh()
+
+    assert source.calls == [None, None]
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import parallel_loader
+
+
+def test_loaders_run_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def loader(value):
+        def load():
+            # 세 로더가 동시에 실행되어야 모두 통과
+            barrier.wait()
+            return value
+        return load
+
+    results, errors = parallel_loader.load_concurrently({name: loader(name) for name in ['a', 'b', 'c']}, timeout=10)
+
+    assert results == {'a': 'a', 'b': 'b', 'c': 'c'}
+    assert errors == {}
+
+
+def test_failing_and_slow_loaders_are_isolated():
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return 'slow'
+
+    def failing():
+        raise ValueError('query failed')
+
+    started = time.monotonic()
+    results, errors = parallel_loader.load_concurrently(
+        {'fast': lambda: 'fast', 'slow': slow, 'failing': failing, 'other': lambda: 'other'},
+        timeout=0.2,
+    )
+    elapsed = time.monotonic() - started
+    release.set()
+
+    # 느린 로더를 끝까지 기다리지 않고, 나머지 결과는 그대로 반환
+    assert elapsed < 2
+    assert results == {'fast': 'fast', 'other': 'other'}
+    assert sorted(errors) == ['failing', 'slow']
+    assert isinstance(errors['slow'], TimeoutError)
+    assert isinstance(errors['failing'], ValueError)
+    assert str(errors['failing']) == 'query failed'
+
+
+def test_per_loader_timeouts():
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return 'slow'
+
+    def patient():
+        time.sleep(0.3)
+        return 'patient'
+
+    results, errors = parallel_loader.load_concurrently(
+        {'slow': slow, 'patient': patient},
+        timeout=0.1,
+        timeouts={'patient': 3},
+    )
+    release.set()
+
+    assert results == {'patient': 'patient'}
+    assert list(errors) == ['slow']
+    assert '0.1 seconds' in str(errors['slow'])
+
+
+def test_timed_out_loader_keeps_running():
+    # 시간을 넘긴 로더도 중단되지 않고 끝까지 실행되어 캐시를 채움
+    finished = threading.Event()
+
+    def slow():
+        time.sleep(0.3)
+        finished.set()
+        return 'slow'
+
+    results, errors = parallel_loader.load_concurrently({'slow': slow}, timeout=0.05)
+
+    assert results == {}
+    assert list(errors) == ['slow']
+    assert finished.wait(5)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+import pytest
+
+import derived_index
+import search_index
+import session_memo
+
+NAMES = ['인조잔디 운동장', '탄성포장', '인조잔디 보수', None, '놀이시설 탄성', 'ABC 인조', '인조잔디']
+PRODUCTS = {'품명': NAMES, '금액': range(len(NAMES))}
+
+pytestmark = pytest.mark.usefixtures('derived_indexes')
+
+
+@pytest.fixture(autouse=True)
+def memo(monkeypatch):
+    # 테스트마다 새 세션 메모를 사용
+    memo = session_memo.SessionMemo(1024 ** 2)
+    monkeypatch.setattr(session_memo, 'get_memo', lambda: memo)
+    return memo
+
+
+def _scan(df, query):
+    return search_index._scan(df, '품명', search_index._terms(query))
+
+
+@pytest.mark.parametrize('query', ['인조', '인조잔디', '잔디 인조', 'abc', '탄', '포장 탄성', '없는말', '  '])
+def test_index_matches_scan(query, versioned_frame):
+    df = versioned_frame(PRODUCTS)
+    np.testing.assert_array_equal(search_index.mask(df, '품명', query), _scan(df, query))
+
+
+def test_index_is_built_once_per_version(versioned_frame):
+    df = versioned_frame(PRODUCTS)
+    search_index.mask(df, '품명', '인조')
+    index = search_index.get_index(df, '품명')
+
+    assert search_index.get_index(df, '품명') is index
+    assert search_index.get_index(versioned_frame(PRODUCTS, 'test:2'), '품명') is not index
+    assert [entry['data_version'] for entry in derived_index.snapshot()] == ['test:2']
+
+
+def test_slice_uses_base_index(versioned_frame):
+    df = versioned_frame(PRODUCTS)
+    part = df.iloc[[4, 0, 6]]
+
+    mask = search_index.mask(part, '품명', '인조', base=df)
+
+    assert mask.tolist() == [False, True, True]
+
+
+def test_regex_and_unversioned_frames_use_scan(versioned_frame):
+    df = versioned_frame(PRODUCTS)
+    assert search_index.mask(df, '품명', '인조.').tolist() == _scan(df, '인조.').tolist()
+
+    unversioned = pd.DataFrame({'품명': NAMES})
+    assert search_index.mask(unversioned, '품명', '인조').tolist() == _scan(unversioned, '인조').tolist()
+    assert derived_index.snapshot() == []
+
+
+def test_subsets_with_same_ends_get_separate_indexes(versioned_frame):
+    # 행 수와 첫/마지막 행 이름이 같아도 중간 행이 다르면 다른 색인
+    df = versioned_frame(PRODUCTS)
+    first = df.loc[[0, 1, 6]]
+    second = df.loc[[0, 2, 6]]
+
+    assert search_index.mask(first, '품명', '보수').tolist() == [False, False, False]
+    assert search_index.mask(second, '품명', '보수').tolist() == [False, True, False]
+    assert len(derived_index.snapshot()) == 2
+
+
+def test_refinement_searches_within_previous_result(memo, monkeypatch, versioned_frame):
+    df = versioned_frame(PRODUCTS)
+    search_index.mask(df, '품명', '인조')
+
+    calls = []
+    match_values = search_index.SubstringIndex.match_values
+
+    def spy(self, terms, within=None):
+        calls.append(within)
+        return match_values(self, terms, within)
+
+    monkeypatch.setattr(search_index.SubstringIndex, 'match_values', spy)
+
+    # 이전 검색어를 포함하는 검색어는 이전 결과 안에서만 찾음
+    np.testing.assert_array_equal(search_index.mask(df, '품명', '인조잔디'), _scan(df, '인조잔디'))
+    assert calls[-1] is not None
+
+    np.testing.assert_array_equal(search_index.mask(df, '품명', '탄성'), _scan(df, '탄성'))
+    assert calls[-1] is None
+
+
+def test_each_submitted_query_gets_its_own_result(versioned_frame):
+    # 검색어를 연달아 바꿔도 매번 해당 검색어의 결과를 반환 (이전 결과를 재사용하지 않음)
+    df = versioned_frame(PRODUCTS)
+
+    for query in ['인조', '탄성', '인조잔디', '놀이', '탄성 놀이', '인조']:
+        np.testing.assert_array_equal(search_index.mask(df, '품명', query), _scan(df, query))
+
+
+def test_memo_does_not_keep_the_index(memo, versioned_frame):
+    # 세션 메모에는 색인 객체 대신 번호만 저장
+    df = versioned_frame(PRODUCTS)
+    search_index.mask(df, '품명', '인조')
+
+    entries = [value for value, _ in memo._entries.values()]
+    assert entries and not any(isinstance(item, search_index.SubstringIndex)
+                               for entry in entries for item in entry.values())
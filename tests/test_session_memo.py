@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import session_memo
+
+
+def test_normalize():
+    assert session_memo.normalize(['나', '가']) == session_memo.normalize(['가', '나'])
+    assert session_memo.normalize((2, 1)) == (2, 1)
+    assert session_memo.normalize(np.int64(3)) == 3
+    assert session_memo.normalize((date(2024, 1, 2), pd.Timestamp('2024-01-03'))) == ('2024-01-02', '2024-01-03T00:00:00')
+    assert hash(session_memo.normalize({'가', '나'}))
+
+
+def test_get_put_and_stats():
+    memo = session_memo.SessionMemo(1024)
+
+    assert memo.get('a') is None
+    memo.put('a', 1)
+    assert memo.get('a') == 1
+    assert memo.get_or_compute('b', lambda: 2) == 2
+    assert memo.get_or_compute('b', lambda: 3) == 2
+
+    snapshot = memo.snapshot()
+    assert (snapshot['entries'], snapshot['hits'], snapshot['misses']) == (2, 2, 2)
+
+
+def test_evicts_least_recently_used_by_bytes():
+    size = session_memo._sizeof('a') + np.zeros(100, dtype=np.uint8).nbytes
+    memo = session_memo.SessionMemo(size * 2)
+
+    memo.put('a', np.zeros(100, dtype=np.uint8))
+    memo.put('b', np.zeros(100, dtype=np.uint8))
+    memo.get('a')
+    memo.put('c', np.zeros(100, dtype=np.uint8))
+
+    assert memo.get('b') is None
+    assert memo.get('a') is not None and memo.get('c') is not None
+    assert memo.bytes == size * 2
+
+    # 한도보다 큰 값은 저장하지 않음
+    memo.put('d', np.zeros(1000, dtype=np.uint8))
+    assert memo.get('d') is None
+
+
+def test_key_size_is_counted():
+    # 키에 들어 있는 필터 상태(선택한 업체명 목록)도 크기에 포함
+    companies = session_memo.normalize([f'업체{i}' for i in range(1000)])
+    key = ('g2b:1', (('select', '업체명', companies),), 'mask')
+    memo = session_memo.SessionMemo(1024 ** 2)
+
+    memo.put(key, np.zeros(10, dtype=np.uint8))
+
+    assert memo.bytes > session_memo._sizeof(companies) > 1000 * 50
+    assert memo.bytes == session_memo._sizeof(key) + 10
+
+    # 키만으로 한도를 넘으면 저장하지 않음
+    small = session_memo.SessionMemo(1024)
+    small.put(key, 1)
+    assert small.get(key) is None
+    assert small.bytes == 0
+
+
+def test_new_version_drops_previous_entries():
+    memo = session_memo.SessionMemo(1024 ** 2)
+
+    memo.use_version('g2b:1')
+    memo.put(('g2b:1', (), 'mask'), 1)
+    memo.use_version('budget:1')
+    memo.put(('budget:1', (), 'mask'), 2)
+
+    memo.use_version('g2b:2')
+
+    assert memo.get(('g2b:1', (), 'mask')) is None
+    assert memo.get(('budget:1', (), 'mask')) == 2
+
+
+def test_clear():
+    memo = session_memo.SessionMemo(1024)
+    memo.put('a', 1)
+    memo.clear()
+
+    assert memo.snapshot()['entries'] == 0
+    assert memo.bytes == 0
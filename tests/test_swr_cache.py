@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pandas as pd
+
+import swr_cache
+
+
+def _wait(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_returns_cached_value_within_ttl():
+    calls = []
+
+    @swr_cache.stale_while_revalidate(ttl=60)
+    def load(year):
+        calls.append(year)
+        return year * 10
+
+    assert load(1) == 10
+    assert load(1) == 10
+    assert load(2) == 20
+    assert calls == [1, 2]
+    assert load.age(1) < 60
+    assert load.age(3) is None
+
+
+def test_stale_value_served_while_one_refresh_runs():
+    release = threading.Event()
+    calls = []
+
+    @swr_cache.stale_while_revalidate(ttl=0)
+    def load():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return len(calls)
+
+    assert load() == 1
+
+    # 만료된 값을 바로 반환하고 갱신은 백그라운드에서 한 번만 실행
+    assert load() == 1
+    assert load() == 1
+    assert load.is_refreshing()
+    assert len(calls) == 2
+
+    release.set()
+    _wait(lambda: not load.is_refreshing())
+    assert load() == 2
+
+
+def test_concurrent_first_load_runs_once():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    @swr_cache.stale_while_revalidate(ttl=60)
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(load())) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ['value'] * 4
+
+
+def test_failed_refresh_keeps_previous_value():
+    calls = []
+
+    @swr_cache.stale_while_revalidate(ttl=0)
+    def load():
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError('fetch failed')
+        return 'old'
+
+    assert load() == 'old'
+    assert load() == 'old'
+    _wait(lambda: not load.is_refreshing())
+    assert load() == 'old'
+
+
+def test_copy_and_clear():
+    calls = []
+
+    @swr_cache.stale_while_revalidate(ttl=60, copy=True)
+    def load():
+        calls.append(1)
+        return pd.DataFrame({'a': [1]})
+
+    first = load()
+    first.loc[0, 'a'] = 2
+    assert load()['a'].tolist() == [1]
+
+    load.clear()
+    load()
+    assert calls == [1, 1]
+
+
+def test_format_age():
+    assert swr_cache.format_age(None) is None
+    assert swr_cache.format_age(30) == '방금 업데이트됨'
+    assert swr_cache.format_age(5 * 60) == '5분 전 업데이트'
+    assert swr_cache.format_age(125 * 60) == '2시간 5분 전 업데이트'
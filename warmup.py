@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import time
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import config
+import utils
+
+# 미리 불러올 로더 (우선순위 순서, 'auth.' 처럼 모듈을 붙이지 않은 이름은 utils의 로더)
+# 첫 번째 그룹은 로그인 화면과 로그인 직후 기본 화면인 home_app용으로, 끝난 뒤에 나머지를 순서대로 불러옴
+WARMUP_PLAN = [
+    ('home', ['auth.load_user_directory', 'load_g2b_data']),
+    ('list_up', ['load_list_up_data']),
+    ('budget', ['load_budget_data', 'load_budget_link_data']),
+    ('edu_budget', ['load_edu_budget_data']),
+    ('info21C', ['load_info_con_data', 'load_info_ser_data', 'load_info_pur_data']),
+    ('news', ['load_news_data']),
+]
+
+
+class Warmer:
+    # 백그라운드 스레드에서 로더를 호출해 st.cache_data / st.cache_resource 캐시를 미리 채움
+
+    def __init__(self, plan, concurrency=2, min_interval=60):
+        self.plan = plan
+        self.concurrency = concurrency
+        self.min_interval = min_interval  # 이 시간(초) 안에 다시 요청되면 건너뜀
+
+        self._lock = threading.Lock()
+        self._running = False
+        self._last_started = None
+
+        self.stats = {
+            'runs': 0,
+            'skipped': 0,
+            'loaded': 0,
+            'failed': 0,
+        }
+        self.last_run = {}  # 로더 이름 -> {'seconds', 'error', 'finished'}
+
+    def start(self, reason):
+        # 이미 실행 중이거나 최근에 실행했으면 건너뛰고 바로 반환
+        now = time.monotonic()
+
+        with self._lock:
+            if self._running or (self._last_started is not None and now - self._last_started < self.min_interval):
+                self.stats['skipped'] += 1
+                return False
+
+            self._running = True
+            self._last_started = now
+            self.stats['runs'] += 1
+
+        thread = threading.Thread(target=self._run, args=(reason,), name=f'warmup-{reason}', daemon=True)
+        thread.start()
+
+        return True
+
+    def _run(self, reason):
+        started = time.monotonic()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='warmup') as executor:
+                (_, first_group), rest = self.plan[0], self.plan[1:]
+
+                # 기본 화면용 로더를 먼저 끝내고, 나머지는 우선순위 순서대로 제출 (동시 실행 수는 concurrency로 제한)
+                wait([executor.submit(self._load, name) for name in first_group])
+
+                for _, names in rest:
+                    for name in names:
+                        executor.submit(self._load, name)
+        finally:
+            with self._lock:
+                self._running = False
+
+        print(f"Cache warm-up ({reason}) finished in {time.monotonic() - started:.1f}s")
+
+    def _load(self, name):
+        started = time.monotonic()
+        error = None
+
+        try:
+            module_name, _, function_name = name.rpartition('.')
+            module = importlib.import_module(module_name) if module_name else utils
+            getattr(module, function_name)()
+        except Exception as e:
+            # 미리 불러오기에 실패해도 페이지에서 다시 시도하므로 기록만 남김
+            error = str(e)
+            print(f"Failed to warm up {name}: {e}")
+
+        with self._lock:
+            self.stats['failed' if error else 'loaded'] += 1
+            self.last_run[name] = {
+                'seconds': round(time.monotonic() - started, 3),
+                'error': error,
+                'finished': time.time(),
+            }
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'running': self._running,
+                'stats': dict(self.stats),
+                'loaders': {name: dict(run) for name, run in self.last_run.items()},
+            }
+
+
+_warmer = None
+_warmer_lock = threading.Lock()
+_startup_started = False
+
+
+def get_warmer():
+    global _warmer
+
+    with _warmer_lock:
+        if _warmer is None:
+            _warmer = Warmer(
+                WARMUP_PLAN,
+                concurrency=config.get_setting('warmup', 'concurrency', 2),
+                min_interval=config.get_setting('warmup', 'min_interval', 60),
+            )
+
+    return _warmer
+
+
+def warm_up(reason):
+    if not config.get_setting('warmup', 'enabled', True):
+        return False
+    return get_warmer().start(reason)
+
+
+def warm_up_on_startup():
+    # 스크립트는 매 rerun마다 다시 실행되므로 프로세스당 한 번만 시작
+    global _startup_started
+
+    with _warmer_lock:
+        if _startup_started:
+            return False
+        _startup_started = True
+
+    return warm_up('startup')